@@ -0,0 +1,131 @@
+import asyncio
+import time
+import aiosqlite
+from concurrent.futures import Executor
+import pandas as pd
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+CANDLE_COLUMNS = ['timestamp', 'open', 'high', 'low', 'close', 'volume', 'oi']
+
+# Length of a candle for each Upstox interval, in seconds
+INTERVAL_SECONDS = {'1minute': 60, '30minute': 1800, 'day': 86400, 'week': 604800, 'month': 2592000}
+
+class CandleCache:
+    """
+    Persistent, append-only OHLCV cache keyed by instrument and interval.
+    Only the missing tail since the last stored candle is fetched from the broker;
+    the merged history is served from memory and persisted to SQLite. A series is
+    fetched at most once per candle interval (or `refresh_interval` seconds), since
+    no new candle can close sooner, so frequent callers are served from memory.
+    """
+
+    def __init__(self, db_path: str = "candle_cache.db", lookback_days: int = 7, refresh_interval: Optional[float] = None):
+        self.db_path = db_path
+        self.lookback_days = lookback_days
+        self.refresh_interval = refresh_interval
+        self.frames: Dict[Tuple[str, str], pd.DataFrame] = {}
+        self.fetched_at: Dict[Tuple[str, str], float] = {}
+        self.locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+        self._initialized = False
+
+    def _refresh_seconds(self, interval: str) -> float:
+        if self.refresh_interval is not None:
+            return self.refresh_interval
+        return INTERVAL_SECONDS.get(interval, 60)
+
+    async def init_db(self):
+        async with aiosqlite.connect(self.db_path) as db:
+            await db.execute("""
+                CREATE TABLE IF NOT EXISTS candles (
+                    instrument_key TEXT NOT NULL,
+                    interval TEXT NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    open REAL NOT NULL,
+                    high REAL NOT NULL,
+                    low REAL NOT NULL,
+                    close REAL NOT NULL,
+                    volume REAL NOT NULL,
+                    oi REAL,
+                    PRIMARY KEY (instrument_key, interval, timestamp)
+                ) WITHOUT ROWID
+            """)
+            await db.commit()
+        self._initialized = True
+
+    async def get_candles(self, instrument_key: str, interval: str, fetch: Callable[[str, str, str, str], List[list]],
+                          executor: Optional[Executor] = None) -> pd.DataFrame:
+        """
+        Returns the cached candles for the lookback window, indexed by timestamp.
+        `fetch(instrument_key, interval, from_date, to_date)` is called on `executor`
+        (the loop's default when None) for the missing tail, unless the series was
+        fetched within the last interval, and must return raw candle rows in broker order.
+        """
+        key = (instrument_key, interval)
+        lock = self.locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            if not self._initialized:
+                await self.init_db()
+
+            if key not in self.frames:
+                self.frames[key] = await self._load(instrument_key, interval)
+            df = self.frames[key]
+
+            fetched_at = self.fetched_at.get(key)
+            if fetched_at is not None and time.monotonic() - fetched_at < self._refresh_seconds(interval):
+                return df
+
+            today = date.today()
+            from_date = df.index[-1].date() if not df.empty else today - timedelta(days=self.lookback_days)
+            rows = await asyncio.get_running_loop().run_in_executor(
+                executor, fetch, instrument_key, interval, from_date.strftime('%Y-%m-%d'), today.strftime('%Y-%m-%d')
+            )
+            self.fetched_at[key] = time.monotonic()
+
+            if rows:
+                tail = self._to_frame(rows)
+                if not df.empty:
+                    tail = tail[tail.index > df.index[-1]]
+                if not tail.empty:
+                    await self._store(instrument_key, interval, tail)
+                    df = tail if df.empty else pd.concat([df, tail])
+
+            cutoff = pd.Timestamp(today - timedelta(days=self.lookback_days))
+            if not df.empty and df.index[0].tz_localize(None) < cutoff:
+                df = df[df.index.tz_localize(None) >= cutoff]
+            self.frames[key] = df
+            return df
+
+    def _to_frame(self, rows: List[list]) -> pd.DataFrame:
+        df = pd.DataFrame(rows, columns=CANDLE_COLUMNS)
+        df['timestamp'] = pd.to_datetime(df['timestamp'])
+        df.set_index('timestamp', inplace=True)
+        return df[~df.index.duplicated(keep='last')].sort_index()
+
+    async def _load(self, instrument_key: str, interval: str) -> pd.DataFrame:
+        cutoff = (date.today() - timedelta(days=self.lookback_days)).isoformat()
+        async with aiosqlite.connect(self.db_path) as db:
+            async with db.execute(
+                "SELECT timestamp, open, high, low, close, volume, oi FROM candles "
+                "WHERE instrument_key = ? AND interval = ? AND timestamp >= ? ORDER BY timestamp",
+                (instrument_key, interval, cutoff)
+            ) as cursor:
+                rows = await cursor.fetchall()
+        if not rows:
+            return pd.DataFrame(columns=CANDLE_COLUMNS[1:], index=pd.DatetimeIndex([], name='timestamp'))
+        return self._to_frame([list(row) for row in rows])
+
+    async def _store(self, instrument_key: str, interval: str, tail: pd.DataFrame):
+        records = [
+            (instrument_key, interval, ts.isoformat(), row.open, row.high, row.low, row.close, row.volume, row.oi)
+            for ts, row in zip(tail.index, tail.itertuples(index=False))
+        ]
+        async with aiosqlite.connect(self.db_path) as db:
+            await db.executemany(
+                "INSERT OR IGNORE INTO candles (instrument_key, interval, timestamp, open, high, low, close, volume, oi) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                records
+            )
+            await db.commit()
+
+candle_cache = CandleCache()
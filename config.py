@@ -20,6 +20,9 @@ class TradingConfig(BaseSettings):
     take_profit_ratio: float = 2.0
     
     simulation_mode: bool = True
+    max_concurrent_analyses: int = 16
+    analysis_timeout: float = 10.0
+    quote_ttl: float = 1.0
     auto_square_off_time: str = "15:15"
 
     class Config:
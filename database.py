@@ -1,138 +1,397 @@
 import aiosqlite
+import asyncio
 import json
+import logging
+from collections import deque
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 
 class Database:
-    def __init__(self, db_path: str = "trading_bot.db"):
+    """
+    SQLite storage for trades, positions, logs and performance.
+    Uses one long-lived WAL-mode connection. Writes are queued and a background
+    writer flushes them in a single transaction when `max_batch` rows are pending
+    or every `flush_interval` seconds. Repeated position upserts for a symbol
+    are coalesced so only the latest one is written. A row that fails to write
+    `max_attempts` times is dropped to `dead_letters` so it cannot block the queue.
+    """
+
+    def __init__(self, db_path: str = "trading_bot.db", flush_interval: float = 0.5, max_batch: int = 500, max_attempts: int = 3):
         self.db_path = db_path
-    
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.max_attempts = max_attempts
+        self._conn: Optional[aiosqlite.Connection] = None
+        self._connect_lock = asyncio.Lock()
+        self._flush_lock = asyncio.Lock()
+        self._flush_event = asyncio.Event()
+        self._writer_task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._pending_trades: List[Tuple] = []
+        self._pending_logs: List[Tuple] = []
+        self._pending_positions: Dict[str, Optional[Tuple]] = {}
+        self._pending_closes: List[Tuple] = []
+        self._attempts: Dict[Tuple, int] = {}
+        self.dead_letters: deque = deque(maxlen=1000)
+
+    async def _connection(self) -> aiosqlite.Connection:
+        if self._conn is None:
+            async with self._connect_lock:
+                if self._conn is None:
+                    conn = await aiosqlite.connect(self.db_path)
+                    conn.row_factory = aiosqlite.Row
+                    await conn.execute("PRAGMA journal_mode=WAL")
+                    await conn.execute("PRAGMA synchronous=NORMAL")
+                    self._conn = conn
+        return self._conn
+
     async def init_db(self):
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS trades (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp TEXT NOT NULL,
-                    symbol TEXT NOT NULL,
-                    action TEXT NOT NULL,
-                    quantity INTEGER NOT NULL,
-                    price REAL NOT NULL,
-                    pnl REAL DEFAULT 0,
-                    signals TEXT,
-                    status TEXT DEFAULT 'open'
-                )
-            """)
-            
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS positions (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    symbol TEXT UNIQUE NOT NULL,
-                    quantity INTEGER NOT NULL,
-                    entry_price REAL NOT NULL,
-                    current_price REAL NOT NULL,
-                    pnl REAL NOT NULL,
-                    stop_loss REAL,
-                    take_profit REAL,
-                    timestamp TEXT NOT NULL
-                )
-            """)
-            
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS logs (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp TEXT NOT NULL,
-                    level TEXT NOT NULL,
-                    message TEXT NOT NULL,
-                    data TEXT
-                )
-            """)
-            
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS performance (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    date TEXT NOT NULL,
-                    total_trades INTEGER,
-                    winning_trades INTEGER,
-                    total_pnl REAL,
-                    win_rate REAL,
-                    sharpe_ratio REAL
-                )
-            """)
-            
-            await db.commit()
-    
-    async def add_trade(self, symbol: str, action: str, quantity: int, price: float, signals: Dict[str, Any]):
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute(
+        db = await self._connection()
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS trades (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp TEXT NOT NULL,
+                symbol TEXT NOT NULL,
+                action TEXT NOT NULL,
+                quantity INTEGER NOT NULL,
+                price REAL NOT NULL,
+                pnl REAL DEFAULT 0,
+                signals TEXT,
+                status TEXT DEFAULT 'open',
+                closed_at TEXT
+            )
+        """)
+
+        async with db.execute("PRAGMA table_info(trades)") as cursor:
+            trade_columns = [row['name'] for row in await cursor.fetchall()]
+        if 'closed_at' not in trade_columns:
+            await db.execute("ALTER TABLE trades ADD COLUMN closed_at TEXT")
+
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS positions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                symbol TEXT UNIQUE NOT NULL,
+                quantity INTEGER NOT NULL,
+                entry_price REAL NOT NULL,
+                current_price REAL NOT NULL,
+                pnl REAL NOT NULL,
+                stop_loss REAL,
+                take_profit REAL,
+                timestamp TEXT NOT NULL
+            )
+        """)
+
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS logs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp TEXT NOT NULL,
+                level TEXT NOT NULL,
+                message TEXT NOT NULL,
+                data TEXT
+            )
+        """)
+
+        async with db.execute("PRAGMA table_info(performance)") as cursor:
+            performance_columns = [row['name'] for row in await cursor.fetchall()]
+        migrate_performance = bool(performance_columns) and 'symbol' not in performance_columns
+        if migrate_performance:
+            # Existing rows are daily totals, i.e. the (date, '*') aggregates
+            await db.execute("ALTER TABLE performance ADD COLUMN symbol TEXT NOT NULL DEFAULT '*'")
+
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS performance (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                date TEXT NOT NULL,
+                symbol TEXT NOT NULL DEFAULT '*',
+                total_trades INTEGER,
+                winning_trades INTEGER,
+                total_pnl REAL,
+                win_rate REAL,
+                sharpe_ratio REAL
+            )
+        """)
+
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_trades_status ON trades (status)")
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_trades_symbol_status ON trades (symbol, status)")
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_trades_timestamp ON trades (timestamp)")
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_logs_level ON logs (level)")
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_logs_timestamp ON logs (timestamp)")
+        await db.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_performance_date_symbol ON performance (date, symbol)")
+
+        async with db.execute("SELECT COUNT(*) AS total FROM performance") as cursor:
+            row = await cursor.fetchone()
+        if migrate_performance or row['total'] == 0:
+            await self._rebuild_performance(db)
+
+        await db.commit()
+
+        if self._writer_task is None:
+            self._stopping = False
+            self._writer_task = asyncio.create_task(self._writer())
+
+    # Trades are bucketed by the date they closed; trades closed before `closed_at`
+    # was recorded fall back to their open time.
+    CLOSE_DATE = "substr(COALESCE(closed_at, timestamp), 1, 10)"
+
+    async def _rebuild_performance(self, db: aiosqlite.Connection):
+        """
+        Recomputes the running aggregates from the closed trades, e.g. after a migration.
+        Rows are overwritten in place, so other columns and days without closed trades are kept.
+        """
+        groups = [(self.CLOSE_DATE, "symbol"), (self.CLOSE_DATE, "'*'"), ("'*'", "symbol"), ("'*'", "'*'")]
+        selects = " UNION ALL ".join(
+            f"""SELECT {date} AS date, {symbol} AS symbol, COUNT(*) AS total_trades,
+                       SUM(pnl > 0) AS winning_trades, SUM(pnl) AS total_pnl
+                FROM trades WHERE status = 'closed' GROUP BY 1, 2"""
+            for date, symbol in groups
+        )
+        await db.execute(f"""
+            INSERT INTO performance (date, symbol, total_trades, winning_trades, total_pnl, win_rate)
+            SELECT date, symbol, total_trades, winning_trades, total_pnl, 100.0 * winning_trades / total_trades
+            FROM ({selects}) WHERE true
+            ON CONFLICT (date, symbol) DO UPDATE SET
+                total_trades = excluded.total_trades,
+                winning_trades = excluded.winning_trades,
+                total_pnl = excluded.total_pnl,
+                win_rate = excluded.win_rate
+        """)
+
+    # Running aggregates are kept per (date, symbol) with '*' rows for the
+    # per-day, per-symbol and all-time totals, so every stat is a single row lookup.
+    PERFORMANCE_UPSERT = """
+        INSERT INTO performance (date, symbol, total_trades, winning_trades, total_pnl, win_rate)
+        VALUES (?, ?, 1, ?, ?, ?)
+        ON CONFLICT (date, symbol) DO UPDATE SET
+            total_trades = total_trades + 1,
+            winning_trades = winning_trades + excluded.winning_trades,
+            total_pnl = total_pnl + excluded.total_pnl,
+            win_rate = 100.0 * (winning_trades + excluded.winning_trades) / (total_trades + 1)
+    """
+
+    @staticmethod
+    def _performance_rows(date: str, symbol: str, pnl: float) -> List[Tuple]:
+        winning = 1 if pnl > 0 else 0
+        return [
+            (key_date, key_symbol, winning, pnl, 100.0 * winning)
+            for key_date, key_symbol in ((date, symbol), (date, '*'), ('*', symbol), ('*', '*'))
+        ]
+
+    async def close(self):
+        """
+        Stops the background writer, flushes pending writes and closes the connection.
+        """
+        if self._writer_task is not None:
+            # The writer exits after the flush it is running, so no batch is cut short
+            self._stopping = True
+            self._flush_event.set()
+            await self._writer_task
+            self._writer_task = None
+        try:
+            await self.flush()
+            if self._pending_count():
+                logging.error(f"Closing the database with {self._pending_count()} unwritten rows")
+        finally:
+            if self._conn is not None:
+                await self._conn.close()
+                self._conn = None
+
+    async def _writer(self):
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._flush_event.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_event.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logging.error(f"Failed to flush database writes: {e}")
+
+    def _pending_count(self) -> int:
+        return len(self._pending_trades) + len(self._pending_logs) + len(self._pending_positions) + len(self._pending_closes)
+
+    def _queued(self):
+        if self._pending_count() >= self.max_batch:
+            self._flush_event.set()
+
+    def _requeue(self, trades: List[Tuple], logs: List[Tuple], positions: Dict[str, Optional[Tuple]], closes: List[Tuple]):
+        # Put back in front of anything queued since; newer position updates win
+        self._pending_trades = trades + self._pending_trades
+        self._pending_logs = logs + self._pending_logs
+        self._pending_positions = {**positions, **self._pending_positions}
+        self._pending_closes = closes + self._pending_closes
+
+    async def flush(self):
+        """
+        Writes every queued row in one transaction. If the write fails, the rows are
+        written one at a time so a bad row cannot hold back the rest; rows that still
+        fail are retried on later flushes, up to `max_attempts` times.
+        """
+        async with self._flush_lock:
+            if not self._pending_count():
+                return
+            trades, self._pending_trades = self._pending_trades, []
+            logs, self._pending_logs = self._pending_logs, []
+            positions, self._pending_positions = self._pending_positions, {}
+            closes, self._pending_closes = self._pending_closes, []
+
+            try:
+                db = await self._connection()
+                await self._write_batch(db, trades, logs, positions, closes)
+            except Exception as e:
+                logging.warning(f"Batched database write failed, writing rows one at a time: {e}")
+                if self._conn is None:
+                    self._requeue(trades, logs, positions, closes)
+                    raise
+                await self._conn.rollback()
+                await self._write_rows(self._conn, trades, logs, positions, closes)
+            except BaseException:
+                # Cancelled mid-write: nothing was committed, so the whole batch goes back
+                self._requeue(trades, logs, positions, closes)
+                if self._conn is not None:
+                    await self._conn.rollback()
+                raise
+
+    async def _write_rows(self, db: aiosqlite.Connection, trades: List[Tuple], logs: List[Tuple], positions: Dict[str, Optional[Tuple]], closes: List[Tuple]):
+        rows = (
+            [(("trade", row), ([row], [], {}, [])) for row in trades]
+            + [(("close", row), ([], [], {}, [row])) for row in closes]
+            + [(("log", row), ([], [row], {}, [])) for row in logs]
+            + [(("position", symbol), ([], [], {symbol: row}, [])) for symbol, row in positions.items()]
+        )
+        failed = ([], [], {}, [])
+        for key, (trade, log, position, close) in rows:
+            try:
+                await self._write_batch(db, trade, log, position, close)
+                self._attempts.pop(key, None)
+            except Exception as e:
+                await db.rollback()
+                attempts = self._attempts.pop(key, 0) + 1
+                if attempts < self.max_attempts:
+                    self._attempts[key] = attempts
+                    failed[0].extend(trade)
+                    failed[1].extend(log)
+                    failed[2].update(position)
+                    failed[3].extend(close)
+                else:
+                    row = (trade or log or close or [position])[0]
+                    self.dead_letters.append((key[0], row, str(e)))
+                    logging.error(f"Dropping {key[0]} row after {attempts} failed writes: {e}: {row}")
+        self._requeue(*failed)
+
+    async def _write_batch(self, db: aiosqlite.Connection, trades: List[Tuple], logs: List[Tuple], positions: Dict[str, Optional[Tuple]], closes: List[Tuple]):
+        if trades:
+            await db.executemany(
                 "INSERT INTO trades (timestamp, symbol, action, quantity, price, signals) VALUES (?, ?, ?, ?, ?, ?)",
-                (datetime.now().isoformat(), symbol, action, quantity, price, json.dumps(signals))
+                trades
             )
-            await db.commit()
-    
-    async def update_position(self, symbol: str, quantity: int, entry_price: float, current_price: float, pnl: float, stop_loss: float, take_profit: float):
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute(
-                """INSERT OR REPLACE INTO positions 
-                   (symbol, quantity, entry_price, current_price, pnl, stop_loss, take_profit, timestamp) 
+        for closed_at, symbol, pnl in closes:
+            cursor = await db.execute(
+                """UPDATE trades SET status = 'closed', pnl = ?, closed_at = ?
+                   WHERE id = (SELECT id FROM trades WHERE symbol = ? AND status = 'open' ORDER BY id DESC LIMIT 1)""",
+                (pnl, closed_at, symbol)
+            )
+            if cursor.rowcount:
+                await db.executemany(self.PERFORMANCE_UPSERT, self._performance_rows(closed_at[:10], symbol, pnl))
+        if logs:
+            await db.executemany(
+                "INSERT INTO logs (timestamp, level, message, data) VALUES (?, ?, ?, ?)",
+                logs
+            )
+        upserts = [row for row in positions.values() if row is not None]
+        removals = [(symbol,) for symbol, row in positions.items() if row is None]
+        if upserts:
+            await db.executemany(
+                """INSERT OR REPLACE INTO positions
+                   (symbol, quantity, entry_price, current_price, pnl, stop_loss, take_profit, timestamp)
                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-                (symbol, quantity, entry_price, current_price, pnl, stop_loss, take_profit, datetime.now().isoformat())
+                upserts
             )
-            await db.commit()
-    
+        if removals:
+            await db.executemany("DELETE FROM positions WHERE symbol = ?", removals)
+        await db.commit()
+
+    async def add_trade(self, symbol: str, action: str, quantity: int, price: float, signals: Dict[str, Any]):
+        self._pending_trades.append(
+            (datetime.now().isoformat(), symbol, action, quantity, price, json.dumps(signals))
+        )
+        self._queued()
+
+    async def close_trade(self, symbol: str, pnl: float):
+        """
+        Marks the latest open trade for a symbol as closed with its realised PnL
+        and folds it into the running performance aggregates.
+        """
+        self._pending_closes.append((datetime.now().isoformat(), symbol, pnl))
+        self._queued()
+
+    async def update_position(self, symbol: str, quantity: int, entry_price: float, current_price: float, pnl: float, stop_loss: float, take_profit: float):
+        self._pending_positions[symbol] = (
+            symbol, quantity, entry_price, current_price, pnl, stop_loss, take_profit, datetime.now().isoformat()
+        )
+        self._queued()
+
     async def remove_position(self, symbol: str):
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("DELETE FROM positions WHERE symbol = ?", (symbol,))
-            await db.commit()
-    
+        self._pending_positions[symbol] = None
+        self._queued()
+
+    async def _flush_for_read(self):
+        # Reads serve the committed data even when pending writes cannot be flushed
+        try:
+            await self.flush()
+        except Exception as e:
+            logging.error(f"Failed to flush database writes before a read: {e}")
+
     async def get_positions(self) -> List[Dict[str, Any]]:
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
-            async with db.execute("SELECT * FROM positions") as cursor:
-                rows = await cursor.fetchall()
-                return [dict(row) for row in rows]
-    
+        await self._flush_for_read()
+        db = await self._connection()
+        async with db.execute("SELECT * FROM positions") as cursor:
+            rows = await cursor.fetchall()
+            return [dict(row) for row in rows]
+
     async def add_log(self, level: str, message: str, data: Dict[str, Any] = None):
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute(
-                "INSERT INTO logs (timestamp, level, message, data) VALUES (?, ?, ?, ?)",
-                (datetime.now().isoformat(), level, message, json.dumps(data) if data else None)
-            )
-            await db.commit()
-    
+        self._pending_logs.append(
+            (datetime.now().isoformat(), level, message, json.dumps(data) if data else None)
+        )
+        self._queued()
+
     async def get_recent_logs(self, limit: int = 100) -> List[Dict[str, Any]]:
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
-            async with db.execute("SELECT * FROM logs ORDER BY id DESC LIMIT ?", (limit,)) as cursor:
-                rows = await cursor.fetchall()
-                return [dict(row) for row in rows]
-    
+        await self._flush_for_read()
+        db = await self._connection()
+        async with db.execute("SELECT * FROM logs ORDER BY id DESC LIMIT ?", (limit,)) as cursor:
+            rows = await cursor.fetchall()
+            return [dict(row) for row in rows]
+
     async def get_trades(self, limit: int = 100) -> List[Dict[str, Any]]:
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
-            async with db.execute("SELECT * FROM trades ORDER BY id DESC LIMIT ?", (limit,)) as cursor:
-                rows = await cursor.fetchall()
-                return [dict(row) for row in rows]
-    
+        await self._flush_for_read()
+        db = await self._connection()
+        async with db.execute("SELECT * FROM trades ORDER BY id DESC LIMIT ?", (limit,)) as cursor:
+            rows = await cursor.fetchall()
+            return [dict(row) for row in rows]
+
+    async def _get_performance_row(self, date: str, symbol: str) -> Dict[str, Any]:
+        await self._flush_for_read()
+        db = await self._connection()
+        async with db.execute(
+            "SELECT total_trades, winning_trades, total_pnl, win_rate FROM performance WHERE date = ? AND symbol = ?",
+            (date, symbol)
+        ) as cursor:
+            row = await cursor.fetchone()
+
+        return {
+            "total_trades": row['total_trades'] if row else 0,
+            "winning_trades": row['winning_trades'] if row else 0,
+            "total_pnl": row['total_pnl'] if row else 0.0,
+            "win_rate": row['win_rate'] if row else 0.0
+        }
+
     async def get_performance_stats(self) -> Dict[str, Any]:
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
-            
-            async with db.execute("SELECT COUNT(*) as total, SUM(pnl) as total_pnl FROM trades WHERE status = 'closed'") as cursor:
-                row = await cursor.fetchone()
-                total_trades = row['total'] if row else 0
-                total_pnl = row['total_pnl'] if row and row['total_pnl'] else 0.0
-            
-            async with db.execute("SELECT COUNT(*) as winning FROM trades WHERE status = 'closed' AND pnl > 0") as cursor:
-                row = await cursor.fetchone()
-                winning_trades = row['winning'] if row else 0
-            
-            win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0.0
-            
-            return {
-                "total_trades": total_trades,
-                "winning_trades": winning_trades,
-                "total_pnl": total_pnl,
-                "win_rate": win_rate
-            }
+        return await self._get_performance_row('*', '*')
+
+    async def get_daily_performance(self, date: str) -> Dict[str, Any]:
+        return await self._get_performance_row(date, '*')
+
+    async def get_symbol_performance(self, symbol: str) -> Dict[str, Any]:
+        return await self._get_performance_row('*', symbol)
 
 db = Database()
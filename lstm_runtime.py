@@ -0,0 +1,90 @@
+import numpy as np
+from typing import Any, List, Tuple
+
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-x))
+
+def export_weights(model: Any, path: str):
+    """
+    Exports a trained Keras Sequential LSTM/Dense model to a NumPy `.npz` archive
+    that `NumpyLSTMPredictor` can run without TensorFlow. Dropout layers are
+    skipped because they are inactive at inference.
+    """
+    arrays = {}
+    layers = []
+    for layer in model.layers:
+        kind = type(layer).__name__
+        weights = layer.get_weights()
+        index = len(layers)
+        if kind == "LSTM":
+            layers.append(f"lstm:{int(layer.return_sequences)}")
+            arrays[f"kernel_{index}"], arrays[f"recurrent_kernel_{index}"], arrays[f"bias_{index}"] = weights
+        elif kind == "Dense":
+            layers.append(f"dense:{layer.activation.__name__}")
+            arrays[f"kernel_{index}"], arrays[f"bias_{index}"] = weights
+        elif kind != "Dropout":
+            raise ValueError(f"Unsupported layer type for export: {kind}")
+    np.savez(path, layers=np.array(layers), **arrays)
+
+class NumpyLSTMPredictor:
+    """
+    A CPU inference runtime for the exported LSTM model implemented in NumPy.
+    Mirrors the `predict(X, verbose=0)` call used on Keras models so it can be
+    used in place of one.
+    """
+
+    def __init__(self, path: str):
+        archive = np.load(path)
+        self.layers: List[Tuple[str, str, Tuple[np.ndarray, ...]]] = []
+        for index, spec in enumerate(archive["layers"].tolist()):
+            kind, option = spec.split(":")
+            if kind == "lstm":
+                weights = (archive[f"kernel_{index}"], archive[f"recurrent_kernel_{index}"], archive[f"bias_{index}"])
+            else:
+                weights = (archive[f"kernel_{index}"], archive[f"bias_{index}"])
+            self.layers.append((kind, option, weights))
+
+    def predict(self, X: np.ndarray, verbose: int = 0) -> np.ndarray:
+        output = np.asarray(X, dtype=np.float32)
+        for kind, option, weights in self.layers:
+            if kind == "lstm":
+                output = self._lstm(output, *weights, return_sequences=option == "1")
+            else:
+                output = self._dense(output, *weights, activation=option)
+        return output
+
+    @staticmethod
+    def _lstm(x: np.ndarray, kernel: np.ndarray, recurrent_kernel: np.ndarray, bias: np.ndarray, return_sequences: bool) -> np.ndarray:
+        # Keras packs the gates as [input, forget, cell, output]
+        batch, steps, _ = x.shape
+        units = recurrent_kernel.shape[0]
+        projected = x @ kernel + bias
+        h = np.zeros((batch, units), dtype=x.dtype)
+        c = np.zeros((batch, units), dtype=x.dtype)
+        sequence = np.empty((batch, steps, units), dtype=x.dtype) if return_sequences else None
+
+        for t in range(steps):
+            z = projected[:, t] + h @ recurrent_kernel
+            i = _sigmoid(z[:, :units])
+            f = _sigmoid(z[:, units:2 * units])
+            g = np.tanh(z[:, 2 * units:3 * units])
+            o = _sigmoid(z[:, 3 * units:])
+            c = f * c + i * g
+            h = o * np.tanh(c)
+            if return_sequences:
+                sequence[:, t] = h
+
+        return sequence if return_sequences else h
+
+    @staticmethod
+    def _dense(x: np.ndarray, kernel: np.ndarray, bias: np.ndarray, activation: str) -> np.ndarray:
+        output = x @ kernel + bias
+        if activation == "relu":
+            return np.maximum(output, 0)
+        if activation == "tanh":
+            return np.tanh(output)
+        if activation == "sigmoid":
+            return _sigmoid(output)
+        if activation != "linear":
+            raise ValueError(f"Unsupported activation: {activation}")
+        return output
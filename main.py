@@ -11,6 +11,7 @@ from fastapi.security import OAuth2PasswordRequestForm
 
 from config import config, TradingConfig
 from database import db
+from candle_cache import candle_cache
 from trading_engine import trading_engine
 from upstox_api_client import upstox_client_instance
 from ml_model import lstm_model
@@ -26,12 +27,20 @@ active_connections: List[WebSocket] = []
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await db.init_db()
+    await candle_cache.init_db()
     log.info("Database initialized.")
     
-    asyncio.create_task(initialize_model())
-    asyncio.create_task(trading_loop())
+    model_task = asyncio.create_task(initialize_model())
+    loop_task = asyncio.create_task(trading_loop())
     
     yield
+    
+    # Stop the loop before its executor and database go away under it
+    for task in (loop_task, model_task):
+        task.cancel()
+    await asyncio.gather(loop_task, model_task, return_exceptions=True)
+    trading_engine.executor.shutdown(wait=False, cancel_futures=True)
+    await db.close()
 
 async def initialize_model():
     log.info("Initializing LSTM model...")
@@ -70,43 +79,64 @@ async def broadcast_message(message: Dict[str, Any]):
             except:
                 pass
 
+async def execute_signal(symbol_info: Dict[str, str], analysis: Dict[str, Any], semaphore: asyncio.Semaphore):
+    symbol = symbol_info['symbol']
+    instrument_key = symbol_info['instrument_key']
+
+    if analysis['action'] not in ['BUY', 'SELL']:
+        return
+
+    async with semaphore:
+        try:
+            result = await trading_engine.execute_trade(
+                symbol,
+                instrument_key,
+                analysis['action'],
+                analysis['signals']
+            )
+
+            if result['status'] == 'executed':
+                await broadcast_message({
+                    "type": "trade_executed",
+                    "data": result
+                })
+
+                await db.add_log(
+                    "TRADE",
+                    f"{result['action']} {result['quantity']} {result['symbol']}",
+                    result
+                )
+        except Exception as e:
+            log.error("Error executing trade", symbol=symbol, error=e, exc_info=True)
+            await db.add_log("ERROR", f"Error executing trade for {symbol}: {str(e)}")
+
 async def trading_loop():
+    # Symbols are analyzed concurrently; the semaphore bounds how many are in flight
+    # and the blocking candle/model calls run on the engine's bounded analysis executor.
+    semaphore = asyncio.Semaphore(config.max_concurrent_analyses)
     while True:
         if trading_engine.is_running:
             log.info("Trading loop is running...")
             # This will need to be updated with a list of instruments from Upstox
             symbols = []
-            
-            for symbol_info in symbols:
-                symbol = symbol_info['symbol']
-                instrument_key = symbol_info['instrument_key']
-                
-                try:
-                    analysis = await trading_engine.analyze_signals(symbol, instrument_key)
-                    
-                    if analysis['action'] in ['BUY', 'SELL']:
-                        result = await trading_engine.execute_trade(
-                            symbol,
-                            instrument_key,
-                            analysis['action'],
-                            analysis['signals']
-                        )
-                        
-                        if result['status'] == 'executed':
-                            await broadcast_message({
-                                "type": "trade_executed",
-                                "data": result
-                            })
-                            
-                            await db.add_log(
-                                "TRADE",
-                                f"{result['action']} {result['quantity']} {result['symbol']}",
-                                result
-                            )
-                except Exception as e:
-                    log.error("Error analyzing symbol", symbol=symbol, error=e, exc_info=True)
-                    await db.add_log("ERROR", f"Error analyzing {symbol}: {str(e)}")
-        
+
+            try:
+                analyses = await trading_engine.analyze_cycle(symbols, semaphore, config.analysis_timeout)
+                # Warm the quote cache for every order in the cycle with one batched request
+                actionable = [
+                    symbol_info['instrument_key'] for symbol_info in symbols
+                    if analyses[symbol_info['symbol']]['action'] in ['BUY', 'SELL']
+                ]
+                if actionable:
+                    await trading_engine.get_quotes(actionable)
+                await asyncio.gather(*(
+                    execute_signal(symbol_info, analyses[symbol_info['symbol']], semaphore)
+                    for symbol_info in symbols
+                ))
+            except Exception as e:
+                log.error("Error in trading cycle", error=e, exc_info=True)
+                await db.add_log("ERROR", f"Error in trading cycle: {str(e)}")
+
         await asyncio.sleep(5)
 
 @app.post("/token")
@@ -1,136 +1,170 @@
+import logging
 import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
-from typing import Dict, List
-import random
+from typing import Dict, List, Optional
+
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+SESSION_MINUTES = 375
+
+DEFAULT_SYMBOLS = {
+    "INFY": {"name": "Infosys", "base_price": 1450.0},
+    "RELIANCE": {"name": "Reliance Industries", "base_price": 2450.0},
+    "TCS": {"name": "Tata Consultancy Services", "base_price": 3550.0},
+    "HDFCBANK": {"name": "HDFC Bank", "base_price": 1650.0},
+    "ICICIBANK": {"name": "ICICI Bank", "base_price": 950.0}
+}
 
 class MarketSimulator:
-    def __init__(self):
-        self.symbols = {
-            "INFY": {"name": "Infosys", "base_price": 1450.0},
-            "RELIANCE": {"name": "Reliance Industries", "base_price": 2450.0},
-            "TCS": {"name": "Tata Consultancy Services", "base_price": 3550.0},
-            "HDFCBANK": {"name": "HDFC Bank", "base_price": 1650.0},
-            "ICICIBANK": {"name": "ICICI Bank", "base_price": 950.0}
-        }
-        self.historical_data: Dict[str, pd.DataFrame] = {}
-        self.current_prices: Dict[str, float] = {}
-        self._initialize_historical_data()
-    
-    def _initialize_historical_data(self):
-        for symbol, info in self.symbols.items():
-            df = self._generate_historical_data(info["base_price"], days=30)
-            self.historical_data[symbol] = df
-            self.current_prices[symbol] = df['close'].iloc[-1]
-    
-    def _generate_historical_data(self, base_price: float, days: int = 30, interval_minutes: int = 1) -> pd.DataFrame:
-        periods = days * 375
-        
-        dates = []
-        current_date = datetime.now() - timedelta(days=days)
-        
-        for day in range(days):
-            day_start = current_date.replace(hour=9, minute=15, second=0, microsecond=0)
-            for minute in range(375):
-                dates.append(day_start + timedelta(minutes=minute))
-            current_date += timedelta(days=1)
-        
-        prices = [base_price]
-        volatility = 0.02
-        
-        for _ in range(periods - 1):
-            change = np.random.normal(0, volatility)
-            trend = np.random.choice([-0.0005, 0.0005], p=[0.48, 0.52])
-            new_price = prices[-1] * (1 + change + trend)
-            prices.append(max(new_price, base_price * 0.8))
-        
-        opens = []
-        highs = []
-        lows = []
-        closes = prices
-        volumes = []
-        
-        for i, close_price in enumerate(closes):
-            open_price = prices[i-1] if i > 0 else close_price
-            high_price = max(open_price, close_price) * random.uniform(1.0, 1.01)
-            low_price = min(open_price, close_price) * random.uniform(0.99, 1.0)
-            volume = int(random.uniform(100000, 1000000))
-            
-            opens.append(open_price)
-            highs.append(high_price)
-            lows.append(low_price)
-            volumes.append(volume)
-        
-        df = pd.DataFrame({
-            'timestamp': dates[:len(prices)],
-            'open': opens,
-            'high': highs,
-            'low': lows,
-            'close': closes,
-            'volume': volumes
-        })
-        
-        return df
-    
+    """
+    Simulates minute bars for a set of symbols. History for every symbol is generated
+    at once with array operations from a seeded `np.random.Generator`, and the bars
+    live in a preallocated (capacity x symbols x OHLCV) ring, so `update_prices`
+    writes one row for the whole universe without copying history. By default the
+    ring holds the `days` of seeded history plus one session of live bars.
+    """
+
+    def __init__(self, symbols: Optional[Dict[str, Dict]] = None, days: int = 30, capacity: Optional[int] = None,
+                 volatility: float = 0.02, seed: Optional[int] = None):
+        self.symbols = symbols or DEFAULT_SYMBOLS
+        self.symbol_names = list(self.symbols)
+        self.symbol_index = {symbol: i for i, symbol in enumerate(self.symbol_names)}
+        self.base_prices = np.array([info["base_price"] for info in self.symbols.values()], dtype=float)
+        self.floor_prices = self.base_prices * 0.8
+        self.volatility = volatility
+        self.rng = np.random.default_rng(seed)
+
+        periods = days * SESSION_MINUTES
+        if capacity is None:
+            capacity = periods + SESSION_MINUTES
+        elif capacity < periods:
+            logging.warning(f"Simulator capacity {capacity} is below the {periods} seeded bars; only the latest {capacity} are kept.")
+        self.capacity = capacity
+        self.ts = np.zeros(capacity, dtype='datetime64[ns]')
+        self.data = np.zeros((capacity, len(self.symbol_names), len(OHLCV_COLUMNS)))
+        self.head = 0
+        self.size = 0
+        self._initialize_historical_data(days)
+
+    @classmethod
+    def synthetic(cls, count: int, days: int = 1, capacity: Optional[int] = None, seed: Optional[int] = None) -> 'MarketSimulator':
+        """
+        Builds a simulator over `count` generated symbols, e.g. for load tests.
+        """
+        rng = np.random.default_rng(seed)
+        base_prices = rng.uniform(100.0, 5000.0, count).round(2)
+        symbols = {f"SYM{i:05d}": {"name": f"Synthetic {i}", "base_price": float(price)} for i, price in enumerate(base_prices)}
+        return cls(symbols, days=days, capacity=capacity, seed=seed)
+
+    def _price_paths(self, start: np.ndarray, periods: int, trend: float = 0.0005) -> np.ndarray:
+        """
+        Returns (periods x symbols) prices from `start`, each step multiplying by
+        1 + N(0, volatility) ± trend. Prices are held at or above the floor: in log
+        space that is a random walk reflected at the floor, computed with a running max.
+        """
+        steps = 1 + self.rng.normal(0, self.volatility, (periods - 1, len(start)))
+        steps += self.rng.choice([-trend, trend], size=steps.shape, p=[0.48, 0.52])
+        log_floor = np.log(self.floor_prices)
+        walk = np.log(np.maximum(start, self.floor_prices)) + np.vstack([
+            np.zeros((1, len(start))),
+            np.cumsum(np.log(np.maximum(steps, 1e-6)), axis=0)
+        ])
+        correction = np.maximum.accumulate(np.maximum(log_floor - walk, 0.0), axis=0)
+        return np.exp(walk + correction)
+
+    def _bars(self, previous: np.ndarray, closes: np.ndarray, wick: float) -> np.ndarray:
+        """
+        Builds (periods x symbols x OHLCV) bars from closes, opening at the previous close.
+        """
+        opens = np.vstack([previous[None, :], closes[:-1]])
+        bars = np.empty(closes.shape + (len(OHLCV_COLUMNS),))
+        bars[..., 0] = opens
+        bars[..., 1] = np.maximum(opens, closes) * self.rng.uniform(1.0, 1.0 + wick, closes.shape)
+        bars[..., 2] = np.minimum(opens, closes) * self.rng.uniform(1.0 - wick, 1.0, closes.shape)
+        bars[..., 3] = closes
+        bars[..., 4] = self.rng.integers(100000, 1000000, closes.shape)
+        return bars
+
+    def _initialize_historical_data(self, days: int):
+        periods = days * SESSION_MINUTES
+        session_start = pd.Timestamp(datetime.now() - timedelta(days=days)).normalize() + pd.Timedelta(hours=9, minutes=15)
+        day_starts = session_start + pd.to_timedelta(np.arange(days), unit='D')
+        dates = (day_starts.values[:, None] + np.arange(SESSION_MINUTES) * np.timedelta64(1, 'm')).ravel()
+
+        closes = self._price_paths(self.base_prices, periods)
+        bars = self._bars(closes[0], closes, wick=0.01)
+
+        keep = min(periods, self.capacity)
+        self.ts[:keep] = dates[-keep:]
+        self.data[:keep] = bars[-keep:]
+        self.size = keep
+        self.head = keep % self.capacity
+
+    def _window(self, count: Optional[int] = None) -> np.ndarray:
+        """
+        Ring positions of the last `count` rows (all retained rows by default), oldest first.
+        """
+        count = self.size if count is None else min(count, self.size)
+        return (self.head - count + np.arange(count)) % self.capacity
+
+    def _row(self, offset: int) -> int:
+        return (self.head - offset) % self.capacity
+
+    @property
+    def current_prices(self) -> Dict[str, float]:
+        closes = self.data[self._row(1), :, 3]
+        return dict(zip(self.symbol_names, closes.tolist()))
+
     def get_historical_data(self, symbol: str, days: int = 7) -> pd.DataFrame:
-        if symbol not in self.historical_data:
+        if symbol not in self.symbol_index:
             return pd.DataFrame()
-        
-        df = self.historical_data[symbol].copy()
-        cutoff_date = datetime.now() - timedelta(days=days)
-        df = df[df['timestamp'] >= cutoff_date]
+
+        window = self._window()
+        timestamps = self.ts[window]
+        cutoff = np.datetime64(datetime.now() - timedelta(days=days), 'ns')
+        window = window[np.searchsorted(timestamps, cutoff):]
+
+        df = pd.DataFrame(self.data[window, self.symbol_index[symbol]], columns=OHLCV_COLUMNS)
+        df.insert(0, 'timestamp', self.ts[window])
+        df['volume'] = df['volume'].astype(np.int64)
         return df
-    
+
     def get_current_price(self, symbol: str) -> Dict[str, float]:
-        if symbol not in self.current_prices:
+        if symbol not in self.symbol_index:
             return {"price": 0.0, "change": 0.0, "change_percent": 0.0}
-        
-        current = self.current_prices[symbol]
-        df = self.historical_data[symbol]
-        previous = df['close'].iloc[-2] if len(df) > 1 else current
-        
+
+        j = self.symbol_index[symbol]
+        last = self.data[self._row(1), j].tolist()
+        current = last[3]
+        previous = float(self.data[self._row(2), j, 3]) if self.size > 1 else current
+
         change = current - previous
         change_percent = (change / previous) * 100
-        
+
         return {
             "symbol": symbol,
             "name": self.symbols[symbol]["name"],
             "price": round(current, 2),
             "change": round(change, 2),
             "change_percent": round(change_percent, 2),
-            "open": round(df['open'].iloc[-1], 2),
-            "high": round(df['high'].iloc[-1], 2),
-            "low": round(df['low'].iloc[-1], 2),
-            "volume": int(df['volume'].iloc[-1])
+            "open": round(last[0], 2),
+            "high": round(last[1], 2),
+            "low": round(last[2], 2),
+            "volume": int(last[4])
         }
-    
+
     def update_prices(self):
-        for symbol in self.symbols.keys():
-            df = self.historical_data[symbol]
-            last_price = df['close'].iloc[-1]
-            
-            volatility = 0.02
-            change = np.random.normal(0, volatility)
-            trend = np.random.choice([-0.0005, 0.0005], p=[0.48, 0.52])
-            new_price = last_price * (1 + change + trend)
-            new_price = max(new_price, self.symbols[symbol]["base_price"] * 0.8)
-            
-            new_row = {
-                'timestamp': datetime.now(),
-                'open': last_price,
-                'high': max(last_price, new_price) * random.uniform(1.0, 1.005),
-                'low': min(last_price, new_price) * random.uniform(0.995, 1.0),
-                'close': new_price,
-                'volume': int(random.uniform(100000, 1000000))
-            }
-            
-            self.historical_data[symbol] = pd.concat([
-                df,
-                pd.DataFrame([new_row])
-            ], ignore_index=True).tail(10000)
-            
-            self.current_prices[symbol] = new_price
-    
+        """
+        Advances every symbol by one bar, written in place over the oldest ring row.
+        """
+        previous = self.data[self._row(1), :, 3]
+        closes = self._price_paths(previous, 2)[1:]
+        self.data[self.head] = self._bars(previous, closes, wick=0.005)[0]
+        self.ts[self.head] = np.datetime64(datetime.now(), 'ns')
+        self.head = (self.head + 1) % self.capacity
+        if self.size < self.capacity:
+            self.size += 1
+
     def get_all_symbols(self) -> List[Dict[str, str]]:
         return [
             {"symbol": symbol, "name": info["name"]}
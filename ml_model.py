@@ -1,22 +1,28 @@
 import numpy as np
 import pandas as pd
-from tensorflow import keras
+from numpy.lib.stride_tricks import sliding_window_view
 from sklearn.preprocessing import MinMaxScaler
 import joblib
 import os
-from typing import Tuple, Optional
+from typing import Any, Dict, Iterator, Tuple, Optional
+from lstm_runtime import NumpyLSTMPredictor, export_weights
 
 class LSTMModel:
     def __init__(self, sequence_length: int = 60, lstm_units: list = [100, 50], dropout_rate: float = 0.3):
         self.sequence_length = sequence_length
         self.lstm_units = lstm_units
         self.dropout_rate = dropout_rate
-        self.model: Optional[keras.Model] = None
+        self.model: Optional[Any] = None
+        self.predictor: Optional[NumpyLSTMPredictor] = None
         self.scaler = MinMaxScaler(feature_range=(0, 1))
         self.model_path = "lstm_model.h5"
+        self.inference_path = "lstm_model.npz"
         self.scaler_path = "scaler.pkl"
     
     def create_model(self, input_shape: Tuple[int, int]):
+        # TensorFlow is only imported for training so inference-only processes stay lean
+        from tensorflow import keras
+        
         model = keras.Sequential()
         
         model.add(keras.layers.LSTM(
@@ -39,62 +45,131 @@ class LSTMModel:
         return model
     
     def prepare_data(self, df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Scales the OHLCV data and returns (windows, targets). The windows are a
+        strided view over the scaled data, so no sample is copied until it is read.
+        """
         data = df[['open', 'high', 'low', 'close', 'volume']].values
         scaled_data = self.scaler.fit_transform(data)
         
-        X, y = [], []
-        for i in range(self.sequence_length, len(scaled_data)):
-            X.append(scaled_data[i-self.sequence_length:i])
-            y.append(scaled_data[i, 3])
+        windows = sliding_window_view(scaled_data, (self.sequence_length, scaled_data.shape[1]))[:-1, 0]
+        targets = scaled_data[self.sequence_length:, 3]
         
-        return np.array(X), np.array(y)
+        return windows, targets
+    
+    def batch_generator(self, X: np.ndarray, y: np.ndarray, batch_size: int, start: int = 0, stop: Optional[int] = None, shuffle: bool = False) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Yields (X, y) batches for samples in [start, stop), materialising one batch at a time.
+        """
+        indices = np.arange(start, len(X) if stop is None else stop)
+        if shuffle:
+            np.random.shuffle(indices)
+        for i in range(0, len(indices), batch_size):
+            batch = indices[i:i + batch_size]
+            yield X[batch].astype(np.float32), y[batch].astype(np.float32)
     
     def train(self, df: pd.DataFrame, epochs: int = 50, batch_size: int = 32):
         if len(df) < self.sequence_length + 100:
             print(f"Insufficient data for training. Need at least {self.sequence_length + 100} rows, got {len(df)}")
             return
         
+        import tensorflow as tf
+        
         X, y = self.prepare_data(df)
         
         if self.model is None:
             self.create_model(input_shape=(X.shape[1], X.shape[2]))
         
-        self.model.fit(X, y, batch_size=batch_size, epochs=epochs, validation_split=0.2, verbose=0)
+        # Hold out the last 20% for validation, as validation_split did
+        split = int(len(X) * 0.8)
+        signature = (
+            tf.TensorSpec(shape=(None, X.shape[1], X.shape[2]), dtype=tf.float32),
+            tf.TensorSpec(shape=(None,), dtype=tf.float32)
+        )
+        train_data = tf.data.Dataset.from_generator(
+            lambda: self.batch_generator(X, y, batch_size, stop=split, shuffle=True),
+            output_signature=signature
+        ).prefetch(tf.data.AUTOTUNE)
+        validation_data = tf.data.Dataset.from_generator(
+            lambda: self.batch_generator(X, y, batch_size, start=split),
+            output_signature=signature
+        )
+        
+        self.model.fit(train_data, epochs=epochs, validation_data=validation_data, verbose=0)
         
         self.model.save(self.model_path)
         joblib.dump(self.scaler, self.scaler_path)
+        export_weights(self.model, self.inference_path)
+        self.predictor = NumpyLSTMPredictor(self.inference_path)
         print("Model trained and saved successfully")
     
+    def export_inference_model(self):
+        """
+        Converts the saved Keras model into the NumPy inference format.
+        """
+        from tensorflow import keras
+        
+        model = keras.models.load_model(self.model_path, compile=False)
+        export_weights(model, self.inference_path)
+    
     def load_model(self):
-        if os.path.exists(self.model_path) and os.path.exists(self.scaler_path):
-            self.model = keras.models.load_model(self.model_path)
-            self.scaler = joblib.load(self.scaler_path)
-            return True
-        return False
+        """
+        Loads the NumPy inference runtime and scaler. TensorFlow is only imported
+        when a Keras model exists that has not been exported yet.
+        """
+        if not os.path.exists(self.scaler_path):
+            return False
+        if not os.path.exists(self.inference_path):
+            if not os.path.exists(self.model_path):
+                return False
+            self.export_inference_model()
+        self.predictor = NumpyLSTMPredictor(self.inference_path)
+        self.scaler = joblib.load(self.scaler_path)
+        return True
     
     def predict(self, df: pd.DataFrame) -> float:
-        if self.model is None:
+        return self.predict_batch({"symbol": df})["symbol"]
+    
+    def predict_batch(self, frames: Dict[str, pd.DataFrame]) -> Dict[str, float]:
+        """
+        Predicts the next-bar price change (in percent) for many symbols with one
+        forward pass. Symbols with fewer than `sequence_length` candles get 0.0.
+        """
+        results = {symbol: 0.0 for symbol in frames}
+        results.update(self.predict_windows({
+            symbol: df[['open', 'high', 'low', 'close', 'volume']].tail(self.sequence_length).values
+            for symbol, df in frames.items() if len(df) >= self.sequence_length
+        }))
+        return results
+    
+    def predict_windows(self, windows: Dict[str, np.ndarray]) -> Dict[str, float]:
+        """
+        Same as `predict_batch` for ready-made (sequence_length x OHLCV) input windows.
+        """
+        results = {symbol: 0.0 for symbol in windows}
+        if not windows:
+            return results
+        if self.predictor is None:
             if not self.load_model():
-                return 0.0
-        
-        if len(df) < self.sequence_length:
-            return 0.0
+                return results
         
-        last_sequence = df[['open', 'high', 'low', 'close', 'volume']].tail(self.sequence_length).values
+        symbols = list(windows)
+        sequences = np.stack([windows[symbol] for symbol in symbols])
         
-        scaled_sequence = self.scaler.transform(last_sequence)
-        X = np.array([scaled_sequence])
+        n_features = sequences.shape[2]
+        X = self.scaler.transform(sequences.reshape(-1, n_features)).reshape(sequences.shape)
         
-        prediction = self.model.predict(X, verbose=0)[0][0]
+        predictions = self.predictor.predict(X)[:, 0]
         
-        current_price = df['close'].iloc[-1]
-        dummy_array = np.zeros((1, 5))
-        dummy_array[0, 3] = prediction
-        predicted_price = self.scaler.inverse_transform(dummy_array)[0, 3]
+        current_prices = sequences[:, -1, 3]
+        dummy_array = np.zeros((len(symbols), n_features))
+        dummy_array[:, 3] = predictions
+        predicted_prices = self.scaler.inverse_transform(dummy_array)[:, 3]
         
-        price_change_percent = ((predicted_price - current_price) / current_price) * 100
+        price_change_percent = ((predicted_prices - current_prices) / current_prices) * 100
         
-        return price_change_percent
+        results.update(zip(symbols, price_change_percent.tolist()))
+        return results
     
     def create_pretrained_model(self):
         if not os.path.exists(self.model_path):
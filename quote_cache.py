@@ -0,0 +1,50 @@
+import asyncio
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from config import config
+
+class QuoteCache:
+    """
+    Short-lived cache of market quotes keyed by instrument key, shared by the
+    pricing, stop-loss and order paths. Quotes older than `ttl` seconds are
+    refetched, and all stale keys in a request go to the broker in one batch.
+    """
+
+    def __init__(self, ttl: float = 1.0):
+        self.ttl = ttl
+        self.quotes: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self.lock = asyncio.Lock()
+
+    async def get_quotes(self, instrument_keys: List[str], fetch: Callable[[List[str]], Dict[str, Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the quotes for the given keys. `fetch(instrument_keys)` is called in a
+        worker thread for the stale keys only and returns quotes keyed by instrument key.
+        Keys the broker did not return are left out of the result.
+        """
+        async with self.lock:
+            now = time.monotonic()
+            stale = [
+                key for key in dict.fromkeys(instrument_keys)
+                if key not in self.quotes or now - self.quotes[key][0] > self.ttl
+            ]
+            if stale:
+                fetched = await asyncio.to_thread(fetch, stale)
+                fetched_at = time.monotonic()
+                for key in stale:
+                    if key in fetched:
+                        self.quotes[key] = (fetched_at, fetched[key])
+                    else:
+                        self.quotes.pop(key, None)
+
+            return {key: self.quotes[key][1] for key in instrument_keys if key in self.quotes}
+
+    async def get_quote(self, instrument_key: str, fetch: Callable[[List[str]], Dict[str, Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+        return (await self.get_quotes([instrument_key], fetch)).get(instrument_key)
+
+    def invalidate(self, instrument_key: Optional[str] = None):
+        if instrument_key is None:
+            self.quotes.clear()
+        else:
+            self.quotes.pop(instrument_key, None)
+
+quote_cache = QuoteCache(ttl=config.quote_ttl)
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Optional
+from technical_indicators import IndicatorState
+
+def signal_flags(indicators: Dict[str, Any], ml_prediction: float, rsi_oversold: float, rsi_overbought: float) -> Dict[str, bool]:
+    """
+    Turns indicator values and the LSTM prediction into the engine's buy/sell signal booleans.
+    """
+    return {
+        "rsi_oversold": indicators['rsi'] < rsi_oversold,
+        "rsi_overbought": indicators['rsi'] > rsi_overbought,
+        "ema_bullish": indicators['ema_short'] > indicators['ema_long'],
+        "ema_bearish": indicators['ema_short'] < indicators['ema_long'],
+        "macd_bullish": indicators['macd']['macd'] > indicators['macd']['signal'],
+        "macd_bearish": indicators['macd']['macd'] < indicators['macd']['signal'],
+        "ml_bullish": ml_prediction > 0.5,
+        "ml_bearish": ml_prediction < -0.5
+    }
+
+class SignalContext:
+    """
+    Per-symbol signal state carried between cycles: the incremental indicators, the
+    rolling LSTM input window and the last evaluated signal booleans. Only candles
+    newer than `last_ts` are folded in, so each new bar costs O(1) and a cycle with
+    no new bar needs no indicator or model work at all.
+
+    If a history no longer contains the last folded candle, e.g. after a gap or a
+    refetch that replaced the series, the state is rebuilt from that history.
+    """
+    COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+    def __init__(self, sequence_length: int):
+        self.sequence_length = sequence_length
+        self.reset()
+
+    def reset(self):
+        self.indicators = IndicatorState()
+        self.window = np.zeros((self.sequence_length, len(self.COLUMNS)))
+        self.head = 0
+        self.filled = 0
+        self.last_ts: Optional[pd.Timestamp] = None
+        self.signals: Optional[Dict[str, bool]] = None
+
+    def update(self, df: pd.DataFrame) -> int:
+        """
+        Folds the candles of `df` newer than the last seen one into the state.
+        Returns the number of candles folded in.
+        """
+        start = 0
+        if self.last_ts is not None:
+            start = df.index.searchsorted(self.last_ts, side='right')
+            if start == 0 or df.index[start - 1] != self.last_ts:
+                self.reset()
+                start = 0
+        if start >= len(df):
+            return 0
+
+        columns = [np.asarray(df[column].to_numpy()[start:], dtype=float) for column in self.COLUMNS]
+        for row in zip(*columns):
+            self.indicators.update(row[1], row[2], row[3])
+            self.window[self.head] = row
+            self.head = (self.head + 1) % len(self.window)
+        self.filled = min(self.filled + len(df) - start, len(self.window))
+        self.last_ts = df.index[-1]
+        return len(df) - start
+
+    def lstm_window(self) -> Optional[np.ndarray]:
+        """
+        Returns the last `sequence_length` candles, oldest first, or None until the window is full.
+        """
+        if self.filled < len(self.window):
+            return None
+        return np.roll(self.window, -self.head, axis=0)
@@ -1,6 +1,36 @@
+import math
 import pandas as pd
+from collections import deque
 import numpy as np
-from typing import Dict, Any
+from functools import lru_cache
+from scipy.signal import lfilter
+from typing import Dict, Any, Union
+
+ArrayLike = Union[np.ndarray, pd.DataFrame]
+
+# Older bars carry less than this fraction of the weight of the slowest EMA (span 50),
+# so the fused kernel only reads this many trailing rows.
+TAIL_TOLERANCE = 1e-12
+TAIL_LENGTH = math.ceil(math.log(TAIL_TOLERANCE) / math.log(1 - 2 / 51)) + 1
+
+@lru_cache(maxsize=1)
+def _ema_weights() -> np.ndarray:
+    """
+    Returns a (TAIL_LENGTH x 4) matrix mapping the last `TAIL_LENGTH` closes to the final
+    EMA 20, EMA 50, MACD line and MACD signal. Every one of them is linear in the closes,
+    so the matrix is built once by running the recursions over the identity.
+    """
+    basis = np.eye(TAIL_LENGTH)
+    ema_fast = TechnicalIndicators.ema_panel(basis, 12)
+    ema_slow = TechnicalIndicators.ema_panel(basis, 26)
+    macd_line = ema_fast - ema_slow
+    signal_line = TechnicalIndicators.ema_panel(macd_line, 9)
+    return np.ascontiguousarray(np.stack([
+        TechnicalIndicators.ema_panel(basis, 20)[-1],
+        TechnicalIndicators.ema_panel(basis, 50)[-1],
+        macd_line[-1],
+        signal_line[-1]
+    ], axis=1))
 
 class TechnicalIndicators:
     @staticmethod
@@ -45,7 +75,8 @@ class TechnicalIndicators:
     
     @staticmethod
     def calculate_all_indicators(df: pd.DataFrame) -> Dict[str, Any]:
-        if len(df) < 50:
+        close = df['close'].to_numpy(dtype=float)
+        if len(close) < 50:
             return {
                 "rsi": 50.0,
                 "ema_short": df['close'].iloc[-1],
@@ -53,11 +84,193 @@ class TechnicalIndicators:
                 "macd": {"macd": 0.0, "signal": 0.0, "histogram": 0.0},
                 "atr": 1.0
             }
-        
+
+        return TechnicalIndicators.fused_indicators(
+            close[-TAIL_LENGTH:],
+            df['high'].to_numpy(dtype=float)[-15:],
+            df['low'].to_numpy(dtype=float)[-15:]
+        )
+
+    @staticmethod
+    def fused_indicators(close: np.ndarray, high: np.ndarray, low: np.ndarray) -> Dict[str, Any]:
+        """
+        Computes every indicator of `calculate_all_indicators` in one pass over the tail
+        of the history. The EMAs and MACD come from one product with a fixed weight
+        matrix; RSI and ATR only need the last 15 bars. Results match the per-indicator
+        methods exactly when `close` is the whole history, and to within
+        `TAIL_TOLERANCE` when it is truncated to `TAIL_LENGTH` rows.
+
+        Shorter histories are padded at the front with their first close. The EMAs are
+        seeded with the first close, so a constant prefix leaves every recursion unchanged.
+        """
+        tail = close[-TAIL_LENGTH:]
+        if len(tail) < TAIL_LENGTH:
+            tail = np.pad(tail, (TAIL_LENGTH - len(tail), 0), mode="edge")
+        ema_short, ema_long, macd, signal = (tail @ _ema_weights()).tolist()
+
+        delta = np.diff(close[-15:])
+        gain = delta[delta > 0].sum() / 14
+        loss = -delta[delta < 0].sum() / 14
+        if loss > 0:
+            rsi = 100 - (100 / (1 + gain / loss))
+        else:
+            rsi = 100.0 if gain > 0 else float("nan")
+
+        prev_close = close[-15:-1]
+        high = high[-14:]
+        low = low[-14:]
+        atr = np.maximum(high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close))).mean()
+
+        return {
+            "rsi": rsi,
+            "ema_short": ema_short,
+            "ema_long": ema_long,
+            "macd": {"macd": macd, "signal": signal, "histogram": macd - signal},
+            "atr": float(atr)
+        }
+
+    @staticmethod
+    def ema_panel(data: np.ndarray, period: int) -> np.ndarray:
+        """
+        Column-wise EMA of a (time x symbols) array, matching `ewm(span=period, adjust=False)`.
+        The recursion runs as one linear filter over every column at once.
+        """
+        alpha = 2 / (period + 1)
+        return lfilter([alpha], [1, alpha - 1], data, axis=0, zi=(1 - alpha) * data[:1])[0]
+
+    @staticmethod
+    def calculate_panel_indicators(close: ArrayLike, high: ArrayLike, low: ArrayLike, ema_short: int = 20, ema_long: int = 50,
+                                   rsi_period: int = 14, atr_period: int = 14) -> Dict[str, np.ndarray]:
+        """
+        Computes the latest RSI, EMAs, MACD and ATR for every symbol of a (time x symbols)
+        price panel in one call. Returns one array per indicator, ordered like the panel's
+        columns, with the same values `calculate_all_indicators` gives for each column.
+
+        Rows where a symbol has no bar (NaN close, high or low), including the leading
+        rows of a shorter history, are skipped for that symbol: each column gives the
+        same result as `calculate_all_indicators` on its valid rows alone.
+        """
+        close = np.asarray(close, dtype=float)
+        high = np.asarray(high, dtype=float)
+        low = np.asarray(low, dtype=float)
+        symbols = close.shape[1]
+
+        valid = np.isfinite(close) & np.isfinite(high) & np.isfinite(low)
+        counts = valid.sum(axis=0)
+        if counts.min() < len(close):
+            # Move each column's valid rows to the bottom, in order, and pad the rows above
+            # with its first valid close; the EMAs start from that close either way
+            order = np.argsort(valid, axis=0, kind="stable")
+            close, high, low = (np.take_along_axis(values, order, axis=0) for values in (close, high, low))
+            first = np.minimum(len(close) - counts, len(close) - 1)
+            padding = np.arange(len(close))[:, None] < first
+            close = np.where(padding, close[first, np.arange(symbols)], close)
+
+        if len(close) < 50:
+            return TechnicalIndicators._warmup_panel(close[-1])
+
+        # RSI and ATR use simple rolling means, so only the last window is needed
+        delta = np.diff(close[-rsi_period - 1:], axis=0)
+        gain = np.where(delta > 0, delta, 0.0).mean(axis=0)
+        loss = np.where(delta < 0, -delta, 0.0).mean(axis=0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rsi = 100 - (100 / (1 + gain / loss))
+
+        prev_close = close[-atr_period - 1:-1]
+        true_range = np.maximum.reduce([
+            high[-atr_period:] - low[-atr_period:],
+            np.abs(high[-atr_period:] - prev_close),
+            np.abs(low[-atr_period:] - prev_close)
+        ])
+
+        macd_line = TechnicalIndicators.ema_panel(close, 12) - TechnicalIndicators.ema_panel(close, 26)
+        signal_line = TechnicalIndicators.ema_panel(macd_line, 9)
+
+        result = {
+            "rsi": rsi,
+            "ema_short": TechnicalIndicators.ema_panel(close, ema_short)[-1],
+            "ema_long": TechnicalIndicators.ema_panel(close, ema_long)[-1],
+            "macd": macd_line[-1],
+            "macd_signal": signal_line[-1],
+            "macd_histogram": macd_line[-1] - signal_line[-1],
+            "atr": true_range.mean(axis=0)
+        }
+        warming = counts < 50
+        if warming.any():
+            for name, values in TechnicalIndicators._warmup_panel(close[-1]).items():
+                result[name] = np.where(warming, values, result[name])
+        return result
+
+    @staticmethod
+    def _warmup_panel(last_close: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        The values `calculate_all_indicators` returns for histories shorter than 50 bars.
+        """
+        zeros = np.zeros(len(last_close))
+        return {
+            "rsi": np.full(len(last_close), 50.0),
+            "ema_short": last_close.copy(),
+            "ema_long": last_close.copy(),
+            "macd": zeros, "macd_signal": zeros.copy(), "macd_histogram": zeros.copy(),
+            "atr": np.ones(len(last_close))
+        }
+
+class IndicatorState:
+    """
+    Incremental form of `TechnicalIndicators.calculate_all_indicators` for one symbol.
+    `update` folds in one closed bar in O(1): the EMAs and MACD advance their recursions
+    and RSI/ATR keep the last 14 changes and true ranges. `values()` returns the same
+    dictionary as `calculate_all_indicators` over every bar seen so far.
+    """
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.count = 0
+        self.prev_close = None
+        self.gains = deque(maxlen=period)
+        self.losses = deque(maxlen=period)
+        self.true_ranges = deque(maxlen=period)
+        self.alphas = {span: 2 / (span + 1) for span in (12, 20, 26, 50)}
+        self.emas: Dict[int, float] = {}
+        self.macd_signal = 0.0
+
+    def update(self, high: float, low: float, close: float):
+        if self.prev_close is None:
+            self.emas = {span: close for span in self.alphas}
+            self.true_ranges.append(high - low)
+        else:
+            delta = close - self.prev_close
+            self.gains.append(delta if delta > 0 else 0.0)
+            self.losses.append(-delta if delta < 0 else 0.0)
+            self.true_ranges.append(max(high - low, abs(high - self.prev_close), abs(low - self.prev_close)))
+            for span, alpha in self.alphas.items():
+                self.emas[span] += alpha * (close - self.emas[span])
+            self.macd_signal += 0.2 * (self.emas[12] - self.emas[26] - self.macd_signal)
+        self.prev_close = close
+        self.count += 1
+
+    def values(self) -> Dict[str, Any]:
+        if self.count < 50:
+            return {
+                "rsi": 50.0,
+                "ema_short": self.prev_close,
+                "ema_long": self.prev_close,
+                "macd": {"macd": 0.0, "signal": 0.0, "histogram": 0.0},
+                "atr": 1.0
+            }
+
+        gain = sum(self.gains) / self.period
+        loss = sum(self.losses) / self.period
+        if loss > 0:
+            rsi = 100 - (100 / (1 + gain / loss))
+        else:
+            rsi = 100.0 if gain > 0 else float("nan")
+
+        macd = self.emas[12] - self.emas[26]
         return {
-            "rsi": TechnicalIndicators.calculate_rsi(df['close']),
-            "ema_short": TechnicalIndicators.calculate_ema(df['close'], 20),
-            "ema_long": TechnicalIndicators.calculate_ema(df['close'], 50),
-            "macd": TechnicalIndicators.calculate_macd(df['close']),
-            "atr": TechnicalIndicators.calculate_atr(df['high'], df['low'], df['close'])
+            "rsi": rsi,
+            "ema_short": self.emas[20],
+            "ema_long": self.emas[50],
+            "macd": {"macd": macd, "signal": self.macd_signal, "histogram": macd - self.macd_signal},
+            "atr": sum(self.true_ranges) / self.period
         }
@@ -0,0 +1,79 @@
+import asyncio
+import pytest
+from database import Database
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "trading_bot.db")
+
+def test_bad_row_is_dropped_without_blocking_the_batch(db_path):
+    async def scenario():
+        db = Database(db_path, flush_interval=60, max_attempts=2)
+        await db.init_db()
+        await db.add_trade("X", "BUY", 1, None, {})
+        await db.add_log("INFO", "kept")
+
+        # The log is written on the first flush; the trade is retried, then dropped
+        assert [row["message"] for row in await db.get_recent_logs()] == ["kept"]
+        assert db._pending_count() == 1
+        assert await db.get_trades() == []
+        assert db._pending_count() == 0
+        assert [(kind, row[1]) for kind, row, _ in db.dead_letters] == [("trade", "X")]
+
+        await db.add_trade("Y", "BUY", 1, 100.0, {})
+        assert [row["symbol"] for row in await db.get_trades()] == ["Y"]
+        await db.close()
+
+    asyncio.run(scenario())
+
+def test_reads_survive_a_failing_flush(db_path, monkeypatch):
+    async def scenario():
+        db = Database(db_path, flush_interval=60)
+        await db.init_db()
+
+        async def fail():
+            raise OSError("disk full")
+
+        monkeypatch.setattr(db, "flush", fail)
+        assert await db.get_recent_logs() == []
+        monkeypatch.undo()
+        await db.close()
+
+    asyncio.run(scenario())
+
+def test_close_waits_for_the_writer_and_flushes(db_path):
+    async def scenario():
+        db = Database(db_path, flush_interval=0.01)
+        await db.init_db()
+        await db.add_log("INFO", "last")
+        await db.close()
+        assert db._conn is None and db._writer_task is None
+
+        reopened = Database(db_path)
+        await reopened.init_db()
+        assert [row["message"] for row in await reopened.get_recent_logs()] == ["last"]
+        await reopened.close()
+
+    asyncio.run(scenario())
+
+def test_cancelled_flush_puts_the_batch_back(db_path, monkeypatch):
+    async def scenario():
+        db = Database(db_path, flush_interval=60)
+        await db.init_db()
+        await db.add_log("INFO", "kept")
+
+        async def cancelled(*args):
+            raise asyncio.CancelledError
+
+        monkeypatch.setattr(db, "_write_batch", cancelled)
+        with pytest.raises(asyncio.CancelledError):
+            await db.flush()
+        assert db._pending_count() == 1
+        monkeypatch.undo()
+        await db.close()
+
+        reopened = Database(db_path)
+        assert [row["message"] for row in await reopened.get_recent_logs()] == ["kept"]
+        await reopened.close()
+
+    asyncio.run(scenario())
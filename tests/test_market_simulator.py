@@ -0,0 +1,16 @@
+import logging
+from market_simulator import MarketSimulator, SESSION_MINUTES
+
+def test_default_capacity_keeps_all_seeded_history():
+    simulator = MarketSimulator(days=30, seed=1)
+    assert simulator.size == 30 * SESSION_MINUTES
+    assert simulator.capacity > simulator.size
+
+    simulator.update_prices()
+    assert simulator.size == 30 * SESSION_MINUTES + 1
+
+def test_capacity_below_seed_is_reported(caplog):
+    with caplog.at_level(logging.WARNING):
+        simulator = MarketSimulator(days=2, capacity=500, seed=1)
+    assert simulator.size == 500
+    assert "only the latest 500" in caplog.text
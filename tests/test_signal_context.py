@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+from signal_context import SignalContext, signal_flags
+from technical_indicators import IndicatorState, TechnicalIndicators
+
+def make_candles(periods, start="2024-01-01 09:15", seed=0):
+    rng = np.random.default_rng(seed)
+    close = 1000 * np.cumprod(1 + rng.normal(0, 0.01, periods))
+    spread = np.abs(rng.normal(0, 0.005, periods)) * close
+    index = pd.date_range(start, periods=periods, freq="min", name="timestamp")
+    return pd.DataFrame({"open": close, "high": close + spread, "low": close - spread, "close": close,
+                         "volume": rng.integers(100, 1000, periods).astype(float)}, index=index)
+
+def assert_matches_full_recompute(context, df):
+    expected = TechnicalIndicators.calculate_all_indicators(df)
+    actual = context.indicators.values()
+    for name in ("rsi", "ema_short", "ema_long", "atr"):
+        assert actual[name] == pytest.approx(expected[name], rel=1e-9), name
+    for name in ("macd", "signal", "histogram"):
+        assert actual["macd"][name] == pytest.approx(expected["macd"][name], rel=1e-9, abs=1e-9), name
+    assert signal_flags(actual, 0.0, 30, 70) == signal_flags(expected, 0.0, 30, 70)
+    np.testing.assert_array_equal(context.lstm_window(), df[SignalContext.COLUMNS].to_numpy()[-len(context.window):])
+
+def test_indicator_state_matches_full_recompute_bar_by_bar():
+    df = make_candles(300)
+    state = IndicatorState()
+    for i, row in enumerate(df.itertuples()):
+        state.update(row.high, row.low, row.close)
+        if i + 1 in (30, 49, 50, 51, 120, 300):
+            expected = TechnicalIndicators.calculate_all_indicators(df.iloc[:i + 1])
+            actual = state.values()
+            assert actual["ema_long"] == pytest.approx(expected["ema_long"], rel=1e-9)
+            assert actual["rsi"] == pytest.approx(expected["rsi"], rel=1e-9)
+            assert actual["atr"] == pytest.approx(expected["atr"], rel=1e-9)
+
+def test_context_fed_bar_by_bar_matches_full_recompute():
+    df = make_candles(400)
+    context = SignalContext(sequence_length=60)
+    assert context.update(df.iloc[:100]) == 100
+    for end in range(101, len(df) + 1):
+        assert context.update(df.iloc[:end]) == 1
+    assert context.update(df) == 0
+    assert_matches_full_recompute(context, df)
+
+def test_context_rebuilds_after_refetch_without_last_bar():
+    df = make_candles(300)
+    context = SignalContext(sequence_length=60)
+    context.update(df.iloc[:200])
+
+    # The refetched history starts after the last folded bar, so there is no overlap
+    refetched = make_candles(150, start="2024-01-02 09:15", seed=1)
+    assert context.update(refetched) == len(refetched)
+    assert_matches_full_recompute(context, refetched)
+
+def test_context_rebuilds_when_history_moves_backwards():
+    df = make_candles(300)
+    context = SignalContext(sequence_length=60)
+    context.update(df)
+
+    # A shorter, revised history that ends before the last folded bar
+    revised = make_candles(250, seed=2)
+    assert context.update(revised) == len(revised)
+    assert_matches_full_recompute(context, revised)
+
+def test_context_rebuilds_when_last_bar_is_missing():
+    df = make_candles(300)
+    context = SignalContext(sequence_length=60)
+    context.update(df.iloc[:200])
+
+    # The bar the state ended on dropped out of the history
+    gapped = df.drop(df.index[199])
+    assert context.update(gapped) == len(gapped)
+    assert_matches_full_recompute(context, gapped)
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+from technical_indicators import TechnicalIndicators, TAIL_LENGTH
+
+def make_candles(periods, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 1000 * np.cumprod(1 + rng.normal(0, 0.01, periods))
+    spread = np.abs(rng.normal(0, 0.005, periods)) * close
+    return pd.DataFrame({"open": close, "high": close + spread, "low": close - spread, "close": close})
+
+def pandas_indicators(df):
+    """
+    The per-indicator pandas computations that `calculate_all_indicators` replaces.
+    """
+    macd = TechnicalIndicators.calculate_macd(df["close"])
+    return {
+        "rsi": TechnicalIndicators.calculate_rsi(df["close"]),
+        "ema_short": TechnicalIndicators.calculate_ema(df["close"], 20),
+        "ema_long": TechnicalIndicators.calculate_ema(df["close"], 50),
+        "macd": macd,
+        "atr": TechnicalIndicators.calculate_atr(df["high"], df["low"], df["close"]),
+    }
+
+def assert_indicators_close(actual, expected, rtol=1e-9):
+    for name in ("rsi", "ema_short", "ema_long", "atr"):
+        assert actual[name] == pytest.approx(expected[name], rel=rtol), name
+    for name in ("macd", "signal", "histogram"):
+        assert actual["macd"][name] == pytest.approx(expected["macd"][name], rel=rtol, abs=1e-9), name
+
+@pytest.mark.parametrize("periods", [50, 51, 200, TAIL_LENGTH - 1, TAIL_LENGTH, TAIL_LENGTH + 1, 3000])
+def test_fused_kernel_matches_pandas(periods):
+    df = make_candles(periods, seed=periods)
+    assert_indicators_close(TechnicalIndicators.calculate_all_indicators(df), pandas_indicators(df))
+
+def test_fused_kernel_handles_flat_prices():
+    df = make_candles(100)
+    df.loc[80:, ["high", "low", "close"]] = df["close"].iloc[80]
+    result = TechnicalIndicators.calculate_all_indicators(df)
+    assert np.isnan(result["rsi"]) and np.isnan(pandas_indicators(df)["rsi"])
+
+def test_panel_matches_per_symbol_indicators():
+    lengths = [400, 120, 50, 49, 10, 400]
+    frames = [make_candles(periods, seed=i) for i, periods in enumerate(lengths)]
+    rows = max(lengths)
+    index = pd.RangeIndex(rows)
+    # Shorter histories start later, and one symbol misses a few bars in the middle
+    panels = {
+        column: pd.DataFrame({i: frame[column].set_axis(index[rows - len(frame):]) for i, frame in enumerate(frames)}, index=index)
+        for column in ("close", "high", "low")
+    }
+    for column in panels:
+        panels[column].loc[[200, 201, 350], 5] = np.nan
+
+    panel = TechnicalIndicators.calculate_panel_indicators(panels["close"], panels["high"], panels["low"])
+
+    for i in range(len(frames)):
+        history = pd.DataFrame({column: panels[column][i] for column in panels}).dropna().reset_index(drop=True)
+        expected = TechnicalIndicators.calculate_all_indicators(history)
+        actual = {
+            "rsi": panel["rsi"][i], "ema_short": panel["ema_short"][i], "ema_long": panel["ema_long"][i], "atr": panel["atr"][i],
+            "macd": {"macd": panel["macd"][i], "signal": panel["macd_signal"][i], "histogram": panel["macd_histogram"][i]},
+        }
+        assert_indicators_close(actual, expected)
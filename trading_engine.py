@@ -1,20 +1,25 @@
+import asyncio
 import pandas as pd
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any, Optional
 from datetime import datetime, date
 from config import config
-from technical_indicators import TechnicalIndicators
 from ml_model import lstm_model
 from upstox_api_client import upstox_client_instance
 from database import db
+from candle_cache import candle_cache
+from quote_cache import quote_cache
+from signal_context import SignalContext, signal_flags
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 upstox_client_instance = UpstoxClient()
 
 class Position:
-    def __init__(self, symbol: str, quantity: int, entry_price: float, stop_loss: float, take_profit: float):
+    def __init__(self, symbol: str, quantity: int, entry_price: float, stop_loss: float, take_profit: float, instrument_key: Optional[str] = None):
         self.symbol = symbol
+        self.instrument_key = instrument_key or symbol
         self.quantity = quantity
         self.entry_price = entry_price
         self.stop_loss = stop_loss
@@ -43,48 +48,61 @@ class Position:
 class TradingEngine:
     def __init__(self):
         self.positions: Dict[str, Position] = {}
+        self.contexts: Dict[str, SignalContext] = {}
         self.capital = config.capital
         self.available_capital = config.capital
         self.total_pnl = 0.0
         self.is_running = False
+        # Candle fetches and model inference run on their own bounded pool, so analysis
+        # can't starve (or be starved by) other blocking work on the loop's default executor
+        self.executor = ThreadPoolExecutor(max_workers=config.max_concurrent_analyses, thread_name_prefix="analysis")
 
-    async def analyze_signals(self, symbol: str, instrument_key: str) -> Dict[str, Any]:
-        logging.info(f"Analyzing signals for {symbol} ({instrument_key})")
-        today = date.today()
-        from_date = today.replace(day=today.day - 7).strftime('%Y-%m-%d')
-        to_date = today.strftime('%Y-%m-%d')
+    async def _run_analysis(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
 
+    def _fetch_candles(self, instrument_key: str, interval: str, from_date: str, to_date: str) -> List[list]:
         historical_data = upstox_client_instance.fetch_historical(
-            instrument_key, '1minute', to_date, from_date
+            instrument_key, interval, to_date, from_date
         )
+        if not historical_data:
+            return []
+        return historical_data.get('data', {}).get('candles') or []
 
-        if not historical_data or not historical_data.get('data', {}).get('candles'):
-            logging.warning(f"Insufficient data for {symbol}")
-            return {"action": "HOLD", "reason": "Insufficient data"}
+    def _fetch_quotes(self, instrument_keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        response = upstox_client_instance.get_market_quotes(instrument_keys)
+        if not response or response.get('status') != 'success':
+            return {}
+        return response['data']
 
-        candles = historical_data['data']['candles']
-        df = pd.DataFrame(candles, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume', 'oi'])
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-        df.set_index('timestamp', inplace=True)
+    async def get_quotes(self, instrument_keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns live quotes for the given instrument keys from the shared quote cache,
+        fetching every stale key in one batched request.
+        """
+        return await quote_cache.get_quotes(instrument_keys, self._fetch_quotes)
+
+    async def _load_history(self, symbol: str, instrument_key: str) -> Optional[pd.DataFrame]:
+        df = await candle_cache.get_candles(instrument_key, '1minute', self._fetch_candles, self.executor)
+
+        if df.empty:
+            logging.warning(f"Insufficient data for {symbol}")
+            return None
 
         if len(df) < 60:
             logging.warning(f"Insufficient data for {symbol} (less than 60 candles)")
-            return {"action": "HOLD", "reason": "Insufficient data"}
-        
-        indicators = TechnicalIndicators.calculate_all_indicators(df)
-        ml_prediction = lstm_model.predict(df)
-        
-        signals = {
-            "rsi_oversold": indicators['rsi'] < config.rsi_oversold,
-            "rsi_overbought": indicators['rsi'] > config.rsi_overbought,
-            "ema_bullish": indicators['ema_short'] > indicators['ema_long'],
-            "ema_bearish": indicators['ema_short'] < indicators['ema_long'],
-            "macd_bullish": indicators['macd']['macd'] > indicators['macd']['signal'],
-            "macd_bearish": indicators['macd']['macd'] < indicators['macd']['signal'],
-            "ml_bullish": ml_prediction > 0.5,
-            "ml_bearish": ml_prediction < -0.5
-        }
-        
+            return None
+
+        return df
+
+    def _context(self, symbol: str) -> SignalContext:
+        if symbol not in self.contexts:
+            self.contexts[symbol] = SignalContext(lstm_model.sequence_length)
+        return self.contexts[symbol]
+
+    def _signal_flags(self, indicators: Dict[str, Any], ml_prediction: float) -> Dict[str, bool]:
+        return signal_flags(indicators, ml_prediction, config.rsi_oversold, config.rsi_overbought)
+
+    def _decide(self, symbol: str, signals: Dict[str, bool]) -> Dict[str, Any]:
         buy_signals = sum([signals['rsi_oversold'], signals['ema_bullish'], signals['macd_bullish'], signals['ml_bullish']])
         sell_signals = sum([signals['rsi_overbought'], signals['ema_bearish'], signals['macd_bearish'], signals['ml_bearish']])
         
@@ -96,15 +114,95 @@ class TradingEngine:
         
         logging.info(f"Signal for {symbol}: {action} (Buy: {buy_signals}, Sell: {sell_signals})")
         return {"action": action, "signals": signals}
+
+    async def analyze_signals(self, symbol: str, instrument_key: str) -> Dict[str, Any]:
+        logging.info(f"Analyzing signals for {symbol} ({instrument_key})")
+        df = await self._load_history(symbol, instrument_key)
+        if df is None:
+            return {"action": "HOLD", "reason": "Insufficient data"}
+
+        context = self._context(symbol)
+        if context.update(df) or context.signals is None:
+            window = context.lstm_window()
+            predictions = await self._run_analysis(lstm_model.predict_windows, {symbol: window}) if window is not None else {}
+            context.signals = self._signal_flags(context.indicators.values(), predictions.get(symbol, 0.0))
+
+        # The action also depends on open positions, so it is re-derived every call
+        return self._decide(symbol, context.signals)
+
+    async def analyze_cycle(self, symbol_infos: List[Dict[str, str]], semaphore: asyncio.Semaphore, timeout: float) -> Dict[str, Dict[str, Any]]:
+        """
+        Analyzes a whole cycle of symbols: histories are loaded concurrently (bounded by
+        `semaphore`, each within `timeout` seconds), each symbol's `SignalContext` takes in
+        its new candles, and only symbols with a new bar are re-evaluated, with one batched
+        inference that must also finish within `timeout` seconds. If it doesn't, those
+        symbols hold this cycle and are re-evaluated on the next one.
+        """
+        async def load(symbol_info: Dict[str, str]) -> Optional[pd.DataFrame]:
+            symbol = symbol_info['symbol']
+            async with semaphore:
+                try:
+                    return await asyncio.wait_for(
+                        self._load_history(symbol, symbol_info['instrument_key']),
+                        timeout=timeout
+                    )
+                except asyncio.TimeoutError:
+                    logging.warning(f"Loading history timed out for {symbol}")
+                    await db.add_log("WARNING", f"Analysis timed out for {symbol}")
+                except Exception as e:
+                    logging.error(f"Error loading history for {symbol}: {e}")
+                    await db.add_log("ERROR", f"Error analyzing {symbol}: {str(e)}")
+                return None
+
+        frames = await asyncio.gather(*(load(symbol_info) for symbol_info in symbol_infos))
+        ready = {
+            symbol_info['symbol']: df
+            for symbol_info, df in zip(symbol_infos, frames) if df is not None
+        }
+
+        # Only symbols with a newly closed bar are re-evaluated; the LSTM runs one
+        # batched forward pass over their rolling windows
+        stale = []
+        for symbol, df in ready.items():
+            context = self._context(symbol)
+            if context.update(df) or context.signals is None:
+                stale.append(symbol)
+        windows = {
+            symbol: window for symbol in stale
+            if (window := self.contexts[symbol].lstm_window()) is not None
+        }
+        try:
+            predictions = await asyncio.wait_for(self._run_analysis(lstm_model.predict_windows, windows), timeout=timeout) if windows else {}
+        except asyncio.TimeoutError:
+            logging.warning(f"LSTM inference timed out for {len(windows)} symbols")
+            await db.add_log("WARNING", f"Inference timed out for {', '.join(windows)}")
+            predictions = None
+        for symbol in stale:
+            context = self.contexts[symbol]
+            if predictions is None:
+                context.signals = None
+            else:
+                context.signals = self._signal_flags(context.indicators.values(), predictions.get(symbol, 0.0))
+
+        results = {}
+        for symbol_info in symbol_infos:
+            symbol = symbol_info['symbol']
+            if symbol in ready and self.contexts[symbol].signals is None:
+                results[symbol] = {"action": "HOLD", "reason": "Analysis timed out"}
+            elif symbol in ready:
+                results[symbol] = self._decide(symbol, self.contexts[symbol].signals)
+            else:
+                results[symbol] = {"action": "HOLD", "reason": "Insufficient data"}
+        return results
     
     async def execute_trade(self, symbol: str, instrument_key: str, action: str, signals: Dict[str, Any]) -> Dict[str, Any]:
         logging.info(f"Executing {action} trade for {symbol} ({instrument_key})")
-        live_feed = upstox_client_instance.get_live_feed(instrument_key)
+        quote = await quote_cache.get_quote(instrument_key, self._fetch_quotes)
 
-        if not live_feed:
+        if not quote:
             return {"status": "rejected", "reason": "Could not fetch live feed"}
 
-        current_price = live_feed['data']['last_price']
+        current_price = quote['last_price']
 
         if action == "BUY":
             position_value = self.capital * config.position_size_percent
@@ -123,6 +221,7 @@ class TradingEngine:
 
             if order_response['status'] == 'success':
                 logging.info(f"Successfully placed BUY order for {symbol}")
+                await db.add_trade(symbol, "BUY", quantity, current_price, signals)
                 return {"status": "executed", "details": order_response['data']}
             else:
                 logging.error(f"Failed to place BUY order for {symbol}: {order_response['message']}")
@@ -141,6 +240,7 @@ class TradingEngine:
                 if order_response['status'] == 'success':
                     logging.info(f"Successfully placed SELL order for {symbol}")
                     del self.positions[symbol]
+                    await db.close_trade(symbol, (current_price - position.entry_price) * position.quantity)
                     return {"status": "executed", "details": order_response['data']}
                 else:
                     logging.error(f"Failed to place SELL order for {symbol}: {order_response['message']}")
@@ -152,13 +252,14 @@ class TradingEngine:
         return {"status": "rejected", "reason": "Invalid action"}
     
     async def update_positions(self):
+        quotes = await self.get_quotes([position.instrument_key for position in self.positions.values()])
         for symbol, position in list(self.positions.items()):
-            live_feed = upstox_client_instance.get_live_feed(position.symbol)
+            quote = quotes.get(position.instrument_key)
 
-            if not live_feed:
+            if not quote:
                 continue
 
-            current_price = live_feed['data']['last_price']
+            current_price = quote['last_price']
             position.update_price(current_price)
             
             await db.update_position(
@@ -172,10 +273,10 @@ class TradingEngine:
             )
             
             if current_price <= position.stop_loss:
-                await self.execute_trade(symbol, "SELL", {"reason": "Stop loss hit"})
+                await self.execute_trade(symbol, position.instrument_key, "SELL", {"reason": "Stop loss hit"})
                 continue
             elif current_price >= position.take_profit:
-                await self.execute_trade(symbol, "SELL", {"reason": "Take profit hit"})
+                await self.execute_trade(symbol, position.instrument_key, "SELL", {"reason": "Take profit hit"})
                 continue
     
     def get_portfolio_summary(self) -> Dict[str, Any]:
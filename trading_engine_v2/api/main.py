@@ -1,10 +1,48 @@
-from fastapi import FastAPI, HTTPException
+import os
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, WebSocket
 from typing import List
 from trading_engine_v2.api.schemas import TradingSignal, TradingPlan
+from trading_engine_v2.exposure_ledger import ExposureLedger
+from trading_engine_v2.feature_store import FeatureStore
+from trading_engine_v2.tick_aggregator import TickAggregator
+from trading_engine_v2.tick_bus import TickBus, CONFLATE
 from trading_engine_v2.upstox_client import UpstoxClient
 
-app = FastAPI()
+# Instrument keys to stream, comma separated; the tick feed is off when unset
+TICK_SYMBOLS = [symbol for symbol in os.getenv("UPSTOX_TICK_SYMBOLS", "").split(",") if symbol]
+
 upstox_client = UpstoxClient()
+tick_bus = TickBus()
+feature_store = FeatureStore(TICK_SYMBOLS)
+ledger = ExposureLedger()
+# The full-mode feed reports the day's cumulative volume
+tick_aggregator = TickAggregator(cumulative_volume=True)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Streams the market data feed onto `tick_bus` while the app runs. Ticks mark the
+    exposure ledger's positions and are aggregated into candles for the feature store.
+    """
+    if not TICK_SYMBOLS:
+        yield
+        return
+
+    tick_aggregator.attach(tick_bus, feature_store.add_candle)
+    feed = upstox_client.subscribe_ticks(TICK_SYMBOLS, ledger.on_tick, bus=tick_bus)
+    tasks = [asyncio.create_task(feed.run()), asyncio.create_task(tick_aggregator.run_clock(feature_store.add_candle))]
+    try:
+        yield
+    finally:
+        await feed.stop()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        tick_bus.close()
+
+app = FastAPI(lifespan=lifespan)
 
 @app.get("/health")
 def health():
@@ -15,6 +53,33 @@ def metrics():
     # In a real application, you would expose Prometheus metrics here
     return {"metrics": "prometheus-metrics"}
 
+@app.websocket("/ws/ticks")
+async def stream_ticks(websocket: WebSocket):
+    # Dashboards only need the latest price per symbol, so a slow client gets conflated ticks
+    await websocket.accept()
+    name = f"dashboard:{id(websocket)}"
+    subscription = tick_bus.subscribe(name, maxsize=5000, policy=CONFLATE)
+
+    async def forward():
+        async for tick in subscription:
+            await websocket.send_json(tick)
+
+    async def wait_for_disconnect():
+        # Clients never send, so this only returns once the client goes away
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+
+    tasks = [asyncio.create_task(forward()), asyncio.create_task(wait_for_disconnect())]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            # A send to a closed socket just ends the stream
+            task.exception()
+    finally:
+        for task in tasks:
+            task.cancel()
+        tick_bus.unsubscribe(name)
+
 @app.get("/signals", response_model=List[TradingSignal])
 def get_signals(symbol: str = None, limit: int = 10):
     # This is a placeholder for a function that would return live signals
@@ -48,9 +113,13 @@ def get_plan(symbol: str):
     }
 
 @app.post("/execute")
-def execute_order(order: dict):
+async def execute_order(order: dict):
     # This is a placeholder for the order execution logic
     # In a real application, this would interact with the UpstoxClient
+    # The fill is applied to the exposure ledger so risk limits see the position;
+    # runs on the event loop, like the tick listener that marks it
+    if {"symbol", "side", "size", "price"} <= order.keys():
+        ledger.on_fill(order["symbol"], order["side"], float(order["size"]), float(order["price"]))
     return {"status": "order placed", "order_id": "mock_order_123"}
 
 @app.post("/override")
@@ -1,9 +1,13 @@
+import numpy as np
 import pandas as pd
 from typing import List, Dict, Any
 
 class Backtester:
     """
     An event-driven simulator for backtesting trading strategies.
+    Stateless strategies can instead use the vectorized mode (`run_vectorized`),
+    which produces identical results from a whole-frame signal array, and
+    `run_portfolio` backtests a multi-symbol price panel.
     """
 
     def __init__(self, strategy, capital: float = 100000.0, commission: float = 0.001, slippage: float = 0.001):
@@ -14,10 +18,12 @@ class Backtester:
         self.slippage = slippage
         self.positions: Dict[str, float] = {}
         self.history: List[Dict[str, Any]] = []
+        self.trades: List[Dict[str, Any]] = []
 
     def run(self, data: pd.DataFrame):
         """
-        Runs the backtest on the given historical data.
+        Runs the backtest on the given historical data. Orders fill at the row's `close`
+        and every held symbol is marked at its own column, which the data must have.
         """
         for i, row in data.iterrows():
             signal = self.strategy.generate_signal(row)
@@ -27,7 +33,138 @@ class Backtester:
 
             self._update_portfolio(row)
 
-        return self._calculate_metrics()
+        equity = pd.Series(
+            [point["portfolio_value"] for point in self.history],
+            index=pd.Index([point["timestamp"] for point in self.history], name="timestamp"),
+            name="portfolio_value"
+        )
+        trades = pd.DataFrame(self.trades, columns=["timestamp", "symbol", "side", "size", "price", "commission"])
+        return self._calculate_metrics(equity, trades)
+
+    def run_vectorized(self, data: pd.DataFrame, symbol: str):
+        """
+        Runs a single-symbol backtest with array operations, filling and marking at the
+        `close` column and recording trades and the position under `symbol`.
+        The strategy's `generate_signals(data)`
+        returns one signed order size per row (positive buys, negative sells, zero for none).
+        Only bars with an order are visited to apply the cash and position checks;
+        slippage, commission, positions and equity are computed on whole arrays.
+        """
+        close = data["close"].to_numpy(dtype=float)
+        orders = np.asarray(self.strategy.generate_signals(data), dtype=float)
+
+        buy_price = close * (1 + self.slippage)
+        sell_price = close * (1 - self.slippage)
+
+        fills = np.zeros(len(close))
+        capital = self.capital
+        position = self.positions.get(symbol, 0.0)
+        for i in np.flatnonzero(orders).tolist():
+            size = orders[i]
+            if size > 0:
+                cost = size * buy_price[i]
+                commission_cost = cost * self.commission
+                if capital >= cost + commission_cost:
+                    capital -= (cost + commission_cost)
+                    position += size
+                    fills[i] = size
+            else:
+                size = -size
+                cost = size * sell_price[i]
+                commission_cost = cost * self.commission
+                if position >= size:
+                    capital += (cost - commission_cost)
+                    position -= size
+                    fills[i] = -size
+
+        is_buy = fills > 0
+        fill_price = np.where(is_buy, buy_price, sell_price)
+        costs = np.abs(fills) * fill_price
+        commissions = costs * self.commission
+        cash_flows = np.where(is_buy, -(costs + commissions), costs - commissions)
+
+        cash = np.cumsum(np.concatenate(([self.capital], cash_flows)))[1:]
+        held = np.cumsum(np.concatenate(([self.positions.get(symbol, 0.0)], fills)))[1:]
+        equity = pd.Series(cash + held * close, index=data.index.rename("timestamp"), name="portfolio_value")
+
+        filled = np.flatnonzero(fills)
+        trades = pd.DataFrame({
+            "timestamp": data.index[filled],
+            "symbol": symbol,
+            "side": np.where(is_buy[filled], "BUY", "SELL"),
+            "size": np.abs(fills[filled]),
+            "price": fill_price[filled],
+            "commission": commissions[filled]
+        })
+
+        self.capital = capital
+        self.positions[symbol] = position
+        return self._calculate_metrics(equity, trades)
+
+    def run_portfolio(self, prices: pd.DataFrame):
+        """
+        Runs a multi-symbol backtest over an aligned (time x symbol) close price panel.
+        The strategy's `generate_orders(prices)` returns a matching array of signed order
+        sizes. Positions are held in a dense array indexed like the panel's columns, so
+        marking the whole book on every bar is a single vector operation. Orders within
+        a bar are filled in column order; orders on missing prices are skipped, and
+        positions are marked at their last valid price until the symbol prices again.
+        """
+        symbols = list(prices.columns)
+        panel = prices.to_numpy(dtype=float)
+        orders = np.asarray(self.strategy.generate_orders(prices), dtype=float)
+
+        buy_price = panel * (1 + self.slippage)
+        sell_price = panel * (1 - self.slippage)
+
+        book = np.array([self.positions.get(symbol, 0.0) for symbol in symbols])
+        start_book = book.copy()
+        fills = np.zeros(panel.shape)
+        capital = self.capital
+        for t, j in zip(*np.nonzero(np.nan_to_num(orders) * np.isfinite(panel))):
+            size = orders[t, j]
+            if size > 0:
+                cost = size * buy_price[t, j]
+                commission_cost = cost * self.commission
+                if capital >= cost + commission_cost:
+                    capital -= (cost + commission_cost)
+                    book[j] += size
+                    fills[t, j] = size
+            else:
+                size = -size
+                cost = size * sell_price[t, j]
+                commission_cost = cost * self.commission
+                if book[j] >= size:
+                    capital += (cost - commission_cost)
+                    book[j] -= size
+                    fills[t, j] = -size
+
+        is_buy = fills > 0
+        fill_price = np.where(is_buy, buy_price, sell_price)
+        costs = np.abs(fills) * np.nan_to_num(fill_price)
+        commissions = costs * self.commission
+        cash_flows = np.where(is_buy, -(costs + commissions), costs - commissions).sum(axis=1)
+
+        cash = self.capital + np.cumsum(cash_flows)
+        held = start_book + np.cumsum(fills, axis=0)
+        # Held positions are marked at their last valid price across missing bars
+        last_price = pd.DataFrame(panel).ffill().to_numpy()
+        marks = np.where(held != 0, held * last_price, 0.0)
+        equity = pd.Series(cash + marks.sum(axis=1), index=prices.index.rename("timestamp"), name="portfolio_value")
+
+        rows, cols = np.nonzero(fills)
+        trades = pd.DataFrame({
+            "timestamp": prices.index[rows],
+            "symbol": np.asarray(symbols, dtype=object)[cols],
+            "side": np.where(is_buy[rows, cols], "BUY", "SELL"),
+            "size": np.abs(fills[rows, cols]),
+            "price": fill_price[rows, cols],
+            "commission": commissions[rows, cols]
+        })
+
+        self.capital = capital
+        self.positions.update(zip(symbols, book.tolist()))
+        return self._calculate_metrics(equity, trades)
 
     def _execute_signal(self, signal: Dict[str, Any], current_data: pd.Series):
         """
@@ -50,29 +187,31 @@ class Backtester:
         if side == "BUY" and self.capital >= cost + commission_cost:
             self.capital -= (cost + commission_cost)
             self.positions[symbol] = self.positions.get(symbol, 0) + size
-            self._record_trade(symbol, "BUY", size, price, commission_cost)
+            self._record_trade(current_data.name, symbol, "BUY", size, price, commission_cost)
         elif side == "SELL" and self.positions.get(symbol, 0) >= size:
             self.capital += (cost - commission_cost)
             self.positions[symbol] -= size
-            self._record_trade(symbol, "SELL", size, price, commission_cost)
+            self._record_trade(current_data.name, symbol, "SELL", size, price, commission_cost)
 
     def _update_portfolio(self, current_data: pd.Series):
         """
         Updates the portfolio value based on the current market data.
+        Every position is marked at its own column's price.
         """
         portfolio_value = self.capital
         for symbol, size in self.positions.items():
-            if symbol in current_data:
-                portfolio_value += size * current_data[symbol]
+            if symbol not in current_data:
+                raise ValueError(f"No price for {symbol}: the data has no '{symbol}' column")
+            portfolio_value += size * current_data[symbol]
 
         self.history.append({"timestamp": current_data.name, "portfolio_value": portfolio_value})
 
-    def _record_trade(self, symbol: str, side: str, size: float, price: float, commission: float):
+    def _record_trade(self, timestamp, symbol: str, side: str, size: float, price: float, commission: float):
         """
-        Records the details of a trade.
+        Records the details of a trade, stamped with the bar time.
         """
-        self.history.append({
-            "timestamp": pd.Timestamp.now(),
+        self.trades.append({
+            "timestamp": timestamp,
             "symbol": symbol,
             "side": side,
             "size": size,
@@ -80,22 +219,23 @@ class Backtester:
             "commission": commission
         })
 
-    def _calculate_metrics(self) -> Dict[str, Any]:
+    def _calculate_metrics(self, equity: pd.Series, trades: pd.DataFrame) -> Dict[str, Any]:
         """
-        Calculates and returns the backtest performance metrics.
+        Calculates and returns the backtest performance metrics. `equity_curve` is the
+        portfolio value per bar as a Series indexed by timestamp.
         """
-        if not self.history:
+        if equity.empty:
             return {}
 
-        portfolio_history = pd.DataFrame(self.history)
-        portfolio_history["returns"] = portfolio_history["portfolio_value"].pct_change()
+        returns = equity.pct_change()
 
-        sharpe_ratio = (portfolio_history["returns"].mean() / portfolio_history["returns"].std()) * (252**0.5)
-        max_drawdown = (portfolio_history["portfolio_value"].cummax() - portfolio_history["portfolio_value"]).max()
+        sharpe_ratio = (returns.mean() / returns.std()) * (252**0.5)
+        max_drawdown = (equity.cummax() - equity).max()
 
         return {
             "sharpe_ratio": sharpe_ratio,
             "max_drawdown": max_drawdown,
             "final_capital": self.capital,
-            "equity_curve": self.history
+            "equity_curve": equity,
+            "trades": trades
         }
@@ -0,0 +1,62 @@
+import pandas as pd
+from typing import Dict, Any, Optional
+
+class BarAggregator:
+    """
+    Rolls base timeframe candles up into a higher timeframe.
+    The open bar is updated in place as candles arrive and a completed bar is
+    only emitted when a candle falls into the next bucket. Buckets are aligned
+    to the epoch, which matches pandas' `resample` for intraday frequencies.
+    """
+
+    def __init__(self, timeframe: str):
+        self.timeframe = timeframe
+        self.seconds = int(pd.Timedelta(timeframe).total_seconds())
+        self.bucket: Optional[int] = None
+        self.open = 0.0
+        self.high = 0.0
+        self.low = 0.0
+        self.close = 0.0
+        self.volume = 0.0
+
+    def update(self, candle: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Folds a base candle into the open bar.
+        Returns the completed bar when the candle starts a new bucket, otherwise None.
+        """
+        ts = candle["ts"]
+        bucket = ts - ts % self.seconds
+        completed = None
+
+        if bucket != self.bucket:
+            if self.bucket is not None:
+                completed = self.current()
+            self.bucket = bucket
+            self.open = candle["open"]
+            self.high = candle["high"]
+            self.low = candle["low"]
+            self.volume = candle["volume"]
+        else:
+            if candle["high"] > self.high:
+                self.high = candle["high"]
+            if candle["low"] < self.low:
+                self.low = candle["low"]
+            self.volume += candle["volume"]
+        self.close = candle["close"]
+
+        return completed
+
+    def current(self) -> Optional[Dict[str, Any]]:
+        """
+        Returns the bar that is still forming, or None before the first candle.
+        """
+        if self.bucket is None:
+            return None
+        return {
+            "ts": self.bucket,
+            "open": self.open,
+            "high": self.high,
+            "low": self.low,
+            "close": self.close,
+            "volume": self.volume,
+        }
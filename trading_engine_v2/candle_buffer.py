@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+from typing import List, Dict, Any, Sequence
+
+class CandleBuffer:
+    """
+    A fixed-capacity columnar ring buffer of candles backed by preallocated NumPy arrays.
+    Every row is written twice (at `i` and `i + capacity`) so the most recent rows are
+    always one contiguous slice, which lets readers get zero-copy views without
+    the buffer ever reallocating or copying history on append.
+    """
+
+    def __init__(self, columns: List[str], capacity: int = 1500):
+        self.columns = list(columns)
+        self.column_index = {column: i for i, column in enumerate(self.columns)}
+        self.capacity = capacity
+        self.ts = np.zeros(2 * capacity, dtype=np.int64)
+        self.data = np.full((2 * capacity, len(self.columns)), np.nan)
+        self.head = 0
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def append(self, ts: int, values: Sequence[float]):
+        """
+        Writes a row in place, evicting the oldest row once the buffer is full.
+        `values` must be ordered like `columns`.
+        """
+        i = self.head
+        j = i + self.capacity
+        self.ts[i] = ts
+        self.ts[j] = ts
+        self.data[i] = values
+        self.data[j] = values
+        self.head = i + 1 if i + 1 < self.capacity else 0
+        if self.size < self.capacity:
+            self.size += 1
+
+    def _window(self) -> slice:
+        end = self.head + self.capacity
+        return slice(end - self.size, end)
+
+    def values(self) -> np.ndarray:
+        """
+        Returns a (rows x columns) view of the retained candles, oldest first.
+        """
+        return self.data[self._window()]
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Returns a view of a single column of the retained candles, oldest first.
+        """
+        return self.data[self._window(), self.column_index[name]]
+
+    def timestamps(self) -> np.ndarray:
+        """
+        Returns a view of the candle timestamps (epoch seconds), oldest first.
+        """
+        return self.ts[self._window()]
+
+    def last(self) -> Dict[str, Any]:
+        """
+        Returns the most recent row as a dictionary.
+        """
+        if self.size == 0:
+            return {}
+        i = self.head - 1 + self.capacity
+        row = dict(zip(self.columns, self.data[i].tolist()))
+        row["ts"] = int(self.ts[i])
+        return row
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Returns the retained candles as a DataFrame indexed by timestamp.
+        The values are a view onto the buffer, so they reflect later writes
+        once the ring wraps; call `.copy()` to keep a snapshot.
+        """
+        index = pd.DatetimeIndex(pd.to_datetime(self.timestamps(), unit='s'), name='timestamp')
+        return pd.DataFrame(self.values(), index=index, columns=self.columns, copy=False)
@@ -0,0 +1,89 @@
+from typing import Any, Dict, Optional, Tuple
+
+class ExposureLedger:
+    """
+    Keeps the book's exposure up to date as fills and price marks arrive.
+    Each position's signed value (quantity x last price) is stored, and the gross,
+    net and per-sector totals are adjusted by the change in that value, so every
+    update and every query is O(1) regardless of the number of positions.
+    The running totals only follow the updates they are given, so call `resync` with
+    the broker's positions (e.g. at the start of each cycle) to correct any drift
+    from rejected or partial fills or a restart.
+    """
+
+    def __init__(self, sectors: Optional[Dict[str, str]] = None):
+        self.sectors = sectors or {}
+        self.quantities: Dict[str, float] = {}
+        self.prices: Dict[str, float] = {}
+        self.values: Dict[str, float] = {}
+        self.sector_gross: Dict[str, float] = {}
+        self.gross = 0.0
+        self.net = 0.0
+
+    def sector(self, symbol: str) -> str:
+        return self.sectors.get(symbol, "UNKNOWN")
+
+    def _set_value(self, symbol: str, value: float):
+        old = self.values.get(symbol, 0.0)
+        self.gross += abs(value) - abs(old)
+        self.net += value - old
+        sector = self.sector(symbol)
+        self.sector_gross[sector] = self.sector_gross.get(sector, 0.0) + abs(value) - abs(old)
+        if value == 0.0:
+            self.values.pop(symbol, None)
+        else:
+            self.values[symbol] = value
+
+    def resync(self, positions: Dict[str, Tuple[float, float]]):
+        """
+        Rebuilds the book and every total from `positions`, a mapping of symbol to
+        (signed quantity, last price), dropping anything the ledger held beyond it.
+        """
+        self.quantities.clear()
+        self.prices.clear()
+        self.values.clear()
+        self.sector_gross.clear()
+        self.gross = 0.0
+        self.net = 0.0
+        for symbol, (quantity, price) in positions.items():
+            if quantity == 0.0:
+                continue
+            self.quantities[symbol] = quantity
+            self.prices[symbol] = price
+            self._set_value(symbol, quantity * price)
+
+    def on_fill(self, symbol: str, side: str, quantity: float, price: float):
+        """
+        Applies a fill to the position and re-marks it at the fill price.
+        """
+        signed = quantity if side == "BUY" else -quantity
+        position = self.quantities.get(symbol, 0.0) + signed
+        if position == 0.0:
+            self.quantities.pop(symbol, None)
+            self.prices.pop(symbol, None)
+        else:
+            self.quantities[symbol] = position
+            self.prices[symbol] = price
+        self._set_value(symbol, position * price)
+
+    def on_mark(self, symbol: str, price: float):
+        """
+        Re-marks an open position at the latest price. Symbols without a position are ignored.
+        """
+        position = self.quantities.get(symbol)
+        if position is None:
+            return
+        self.prices[symbol] = price
+        self._set_value(symbol, position * price)
+
+    def on_tick(self, tick: Dict[str, Any]):
+        """
+        Marks a position from a `TickBus` tick, so the ledger can be added as a bus listener.
+        """
+        self.on_mark(tick["symbol"], tick["last"])
+
+    def symbol_exposure(self, symbol: str) -> float:
+        return abs(self.values.get(symbol, 0.0))
+
+    def sector_exposure(self, sector: str) -> float:
+        return self.sector_gross.get(sector, 0.0)
@@ -1,5 +1,10 @@
 import pandas as pd
 from typing import List, Dict, Any
+from trading_engine_v2.bar_aggregator import BarAggregator
+from trading_engine_v2.candle_buffer import CandleBuffer
+from trading_engine_v2.streaming_indicators import StreamingIndicators, FEATURE_COLUMNS
+
+CANDLE_COLUMNS: List[str] = ["open", "high", "low", "close", "volume"] + FEATURE_COLUMNS
 
 class FeatureStore:
     """
@@ -7,90 +12,69 @@ class FeatureStore:
     Designed to update incrementally as new data streams in.
     """
 
-    def __init__(self, symbols: List[str], timeframes: List[str] = ['1min']):
-        self.features: Dict[str, Dict[str, pd.DataFrame]] = {
-            symbol: {tf: pd.DataFrame() for tf in timeframes} for symbol in symbols
-        }
+    def __init__(self, symbols: List[str], timeframes: List[str] = ['1min'], retention: int = 1500):
         self.timeframes = timeframes
-
-    def add_candle(self, candle: Dict[str, Any]):
+        self.retention = retention
+        self.buffers: Dict[str, Dict[str, CandleBuffer]] = {}
+        self.indicators: Dict[str, Dict[str, StreamingIndicators]] = {}
+        self.aggregators: Dict[str, Dict[str, BarAggregator]] = {}
+        for symbol in symbols:
+            self._add_symbol(symbol)
+
+    def _add_symbol(self, symbol: str):
         """
-        Adds a new candle and updates the features for the corresponding symbol.
+        Allocates the candle buffers, indicator state and bar aggregators for a symbol.
         """
-        symbol = candle["symbol"]
-        if symbol not in self.features:
-            self.features[symbol] = {tf: pd.DataFrame() for tf in self.timeframes}
-
-        new_candle_df = pd.DataFrame([candle])
-        new_candle_df['timestamp'] = pd.to_datetime(new_candle_df['ts'], unit='s')
-        new_candle_df.set_index('timestamp', inplace=True)
+        self.buffers[symbol] = {tf: CandleBuffer(CANDLE_COLUMNS, capacity=self.retention) for tf in self.timeframes}
+        self.indicators[symbol] = {tf: StreamingIndicators() for tf in self.timeframes}
+        self.aggregators[symbol] = {tf: BarAggregator(tf) for tf in self.timeframes[1:]}
 
-        base_tf = self.timeframes[0]
-        self.features[symbol][base_tf] = pd.concat([self.features[symbol][base_tf], new_candle_df])
-
-        for tf in self.timeframes:
-            self._resample_and_calculate(symbol, base_tf, tf)
-
-    def _resample_and_calculate(self, symbol: str, base_tf: str, target_tf: str):
+    def add_candle(self, candle: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
-        Resamples the base timeframe data to the target timeframe and calculates features.
+        Adds a new base timeframe candle and updates the features for the corresponding symbol.
+        Higher timeframe bars are aggregated in place and only finalised, with their
+        features updated, when a bucket rolls over. Returns the bars finalised by this candle.
         """
-        base_df = self.features[symbol][base_tf]
-        resampled_df = base_df.resample(target_tf).agg({
-            'open': 'first',
-            'high': 'max',
-            'low': 'min',
-            'close': 'last',
-            'volume': 'sum'
-        }).dropna()
+        symbol = candle["symbol"]
+        if symbol not in self.buffers:
+            self._add_symbol(symbol)
 
-        self.features[symbol][target_tf] = resampled_df
-        self._calculate_features(symbol, target_tf)
+        self._store_bar(symbol, self.timeframes[0], candle)
 
-    def _calculate_features(self, symbol: str, timeframe: str):
+        completed = []
+        for tf, aggregator in self.aggregators[symbol].items():
+            bar = aggregator.update(candle)
+            if bar is not None:
+                self._store_bar(symbol, tf, bar)
+                completed.append({"symbol": symbol, "interval": tf, **bar})
+        return completed
+
+    def _store_bar(self, symbol: str, timeframe: str, bar: Dict[str, Any]):
         """
-        Calculates all the features for a given symbol and timeframe.
+        Updates the streaming indicators with a closed bar and writes it into the buffer.
         """
-        df = self.features[symbol][timeframe]
-        if df.empty:
-            return
-
-        # Simple Moving Average (SMA)
-        df["sma_20"] = df["close"].rolling(window=20).mean()
-
-        # Exponential Moving Average (EMA)
-        df["ema_20"] = df["close"].ewm(span=20, adjust=False).mean()
-
-        # Relative Strength Index (RSI)
-        delta = df["close"].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        df["rsi"] = 100 - (100 / (1 + rs))
-
-        # Average True Range (ATR)
-        high_low = df["high"] - df["low"]
-        high_close = (df["high"] - df["close"].shift()).abs()
-        low_close = (df["low"] - df["close"].shift()).abs()
-        tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-        df["atr"] = tr.rolling(window=14).mean()
-
-        # Volume Weighted Average Price (VWAP)
-        df["vwap"] = (df["volume"] * (df["high"] + df["low"]) / 2).cumsum() / df["volume"].cumsum()
-
-        self.features[symbol][timeframe] = df
+        features = self.indicators[symbol][timeframe].update(bar["high"], bar["low"], bar["close"], bar["volume"])
+        self.buffers[symbol][timeframe].append(bar["ts"], (
+            bar["open"], bar["high"], bar["low"], bar["close"], bar["volume"],
+            features["sma_20"], features["ema_20"], features["rsi"], features["atr"], features["vwap"],
+        ))
 
     def get_features(self, symbol: str, timeframe: str) -> pd.DataFrame:
         """
         Returns the DataFrame with all the features for a given symbol and timeframe.
+        The frame is a zero-copy view onto the candle buffer. Higher timeframes only
+        contain closed bars.
         """
-        return self.features.get(symbol, {}).get(timeframe, pd.DataFrame())
+        buffer = self.buffers.get(symbol, {}).get(timeframe)
+        if buffer is None:
+            return pd.DataFrame()
+        return buffer.to_frame()
 
     def get_latest_features(self, symbol: str, timeframe: str) -> Dict[str, Any]:
         """
         Returns the latest features for a given symbol and timeframe.
         """
-        df = self.get_features(symbol, timeframe)
-        if not df.empty:
-            return df.iloc[-1].to_dict()
-        return {}
+        buffer = self.buffers.get(symbol, {}).get(timeframe)
+        if buffer is None or len(buffer) == 0:
+            return {}
+        return {"symbol": symbol, **buffer.last()}
@@ -0,0 +1,120 @@
+import os
+import logging
+import numpy as np
+import pandas as pd
+from datetime import date, timedelta
+from typing import List, Optional, Tuple
+from urllib.parse import quote, unquote
+
+OHLCV_COLUMNS: List[str] = ["open", "high", "low", "close", "volume"]
+CANDLE_DTYPE = np.dtype([("ts", "<i8"), ("ohlcv", "<f8", (len(OHLCV_COLUMNS),))])
+
+class HistoryStore:
+    """
+    An on-disk store of OHLCV candles per instrument and interval.
+    Each series is one raw `candles.npy` file of (ts, ohlcv) records, epoch seconds
+    and the five OHLCV values, opened with a memory map. Reads only touch the
+    pages in the requested time range and share the OS page cache across processes.
+    Keeping both in one file means a write is published with a single rename.
+    """
+
+    def __init__(self, root: str = "data/history"):
+        self.root = root
+
+    def _path(self, instrument: str, interval: str) -> str:
+        return os.path.join(self.root, interval, quote(instrument, safe=""))
+
+    def instruments(self, interval: str) -> List[str]:
+        """
+        Lists the instruments stored for an interval.
+        """
+        directory = os.path.join(self.root, interval)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(unquote(name) for name in os.listdir(directory))
+
+    def arrays(self, instrument: str, interval: str, start: Optional[pd.Timestamp] = None, end: Optional[pd.Timestamp] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns memory-mapped (timestamps, ohlcv) views for [start, end].
+        """
+        path = os.path.join(self._path(instrument, interval), "candles.npy")
+        if not os.path.exists(path):
+            return np.empty(0, dtype=np.int64), np.empty((0, len(OHLCV_COLUMNS)))
+
+        candles = np.load(path, mmap_mode="r")
+        ts, ohlcv = candles["ts"], candles["ohlcv"]
+        lo = 0 if start is None else np.searchsorted(ts, pd.Timestamp(start).timestamp(), side="left")
+        hi = len(ts) if end is None else np.searchsorted(ts, pd.Timestamp(end).timestamp(), side="right")
+        return ts[lo:hi], ohlcv[lo:hi]
+
+    def load(self, instrument: str, interval: str, start: Optional[pd.Timestamp] = None, end: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        """
+        Returns the candles in [start, end] as a DataFrame indexed by UTC timestamp.
+        The values are a read-only view onto the memory map, not a copy.
+        """
+        ts, ohlcv = self.arrays(instrument, interval, start, end)
+        index = pd.DatetimeIndex(np.asarray(ts).view("datetime64[s]"), name="timestamp")
+        return pd.DataFrame(ohlcv, index=index, columns=OHLCV_COLUMNS, copy=False)
+
+    def write(self, instrument: str, interval: str, candles: pd.DataFrame):
+        """
+        Merges candles into the stored series. `candles` is indexed by timestamp (or has a
+        `timestamp` column) and has OHLCV columns. Rows with an existing timestamp replace
+        the stored row. The file is replaced atomically so open readers are unaffected.
+        """
+        if candles.empty:
+            return
+        if "timestamp" in candles.columns:
+            candles = candles.set_index("timestamp")
+        index = pd.DatetimeIndex(candles.index)
+        if index.tz is not None:
+            index = index.tz_convert("UTC").tz_localize(None)
+        new_ts = index.as_unit("s").asi8
+        new_ohlcv = candles[OHLCV_COLUMNS].to_numpy(dtype=np.float64)
+
+        old_ts, old_ohlcv = self.arrays(instrument, interval)
+        if len(old_ts) and new_ts.min() > old_ts[-1]:
+            ts = np.concatenate([old_ts, new_ts])
+            ohlcv = np.concatenate([old_ohlcv, new_ohlcv])
+        else:
+            ts = np.concatenate([new_ts, old_ts])
+            ohlcv = np.concatenate([new_ohlcv, old_ohlcv])
+        # Stable sort keeps the new row first among duplicates so it wins
+        order = np.argsort(ts, kind="stable")
+        ts, ohlcv = ts[order], ohlcv[order]
+        keep = np.ones(len(ts), dtype=bool)
+        keep[1:] = ts[1:] != ts[:-1]
+        ts, ohlcv = ts[keep], ohlcv[keep]
+
+        candles = np.empty(len(ts), dtype=CANDLE_DTYPE)
+        candles["ts"], candles["ohlcv"] = ts, ohlcv
+
+        path = self._path(instrument, interval)
+        os.makedirs(path, exist_ok=True)
+        tmp = os.path.join(path, f"candles.{os.getpid()}.tmp.npy")
+        np.save(tmp, candles)
+        os.replace(tmp, os.path.join(path, "candles.npy"))
+
+    def import_from_client(self, client, instruments: List[str], interval: str, start: date, end: date, chunk_days: int = 30):
+        """
+        Bulk imports candles from `UpstoxClient.fetch_historical`, fetching each
+        instrument in `chunk_days` windows and writing it once.
+        """
+        for instrument in instruments:
+            rows = []
+            chunk_start = start
+            while chunk_start <= end:
+                chunk_end = min(chunk_start + timedelta(days=chunk_days - 1), end)
+                response = client.fetch_historical(instrument, chunk_start.isoformat(), chunk_end.isoformat(), interval)
+                if response:
+                    rows.extend(response.get("data", {}).get("candles") or [])
+                chunk_start = chunk_end + timedelta(days=1)
+
+            if not rows:
+                logging.warning(f"No historical data returned for {instrument}.")
+                continue
+
+            candles = pd.DataFrame([row[:6] for row in rows], columns=["timestamp"] + OHLCV_COLUMNS)
+            candles["timestamp"] = pd.to_datetime(candles["timestamp"], utc=True)
+            self.write(instrument, interval, candles)
+            logging.info(f"Imported {len(candles)} candles for {instrument} ({interval}).")
@@ -0,0 +1,190 @@
+import argparse
+import asyncio
+import json
+import math
+import time
+import numpy as np
+import pandas as pd
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from trading_engine_v2.feature_store import FeatureStore
+from trading_engine_v2.tick_aggregator import TickAggregator
+from trading_engine_v2.tick_bus import TickBus, DROP_NEWEST
+
+SESSION_START = int(pd.Timestamp("2024-01-15 09:15", tz="Asia/Kolkata").timestamp())
+
+def generate_ticks(symbols: List[str], ticks_per_symbol: int, start_ts: int = SESSION_START, spacing: float = 1.0,
+                   volatility: float = 0.0005, seed: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Generates interleaved ticks for every symbol, one per symbol every `spacing` seconds,
+    following a geometric random walk from a random starting price.
+    """
+    rng = np.random.default_rng(seed)
+    start = rng.uniform(100.0, 5000.0, len(symbols))
+    last = start * np.cumprod(1 + rng.normal(0, volatility, (ticks_per_symbol, len(symbols))), axis=0)
+    spread = np.round(last * 0.0001, 2)
+    volumes = rng.integers(1, 500, last.shape)
+    timestamps = (start_ts + np.arange(ticks_per_symbol) * spacing).astype(np.int64)
+
+    ticks = []
+    for k, ts in enumerate(timestamps.tolist()):
+        prices, spreads, sizes = last[k].round(2).tolist(), spread[k].tolist(), volumes[k].tolist()
+        for j, symbol in enumerate(symbols):
+            ticks.append({"symbol": symbol, "ts": ts, "bid": prices[j] - spreads[j], "ask": prices[j] + spreads[j],
+                          "last": prices[j], "volume": sizes[j]})
+    return ticks
+
+def read_ticks(path: str) -> List[Dict[str, Any]]:
+    """
+    Reads recorded ticks from a JSON lines file.
+    """
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+class EngineSignal:
+    """
+    The engine's long-only rule (as in `parameter_sweep.IndicatorStrategy`) evaluated
+    bar by bar: BUY when flat and RSI is oversold in an EMA uptrend, SELL when long and
+    RSI is overbought or the trend turns down. The long EMA is not a `FeatureStore`
+    feature, so it is advanced here from each bar's close.
+    """
+
+    def __init__(self, rsi_oversold: float = 30, rsi_overbought: float = 70, ema_long: int = 50):
+        self.rsi_oversold = rsi_oversold
+        self.rsi_overbought = rsi_overbought
+        self.alpha = 2 / (ema_long + 1)
+        self.ema_long: Dict[str, float] = {}
+        self.long: set = set()
+
+    def __call__(self, features: Dict[str, Any]) -> Optional[str]:
+        if not features:
+            return None
+        symbol, close = features["symbol"], features["close"]
+        ema_long = self.ema_long.get(symbol, close)
+        ema_long += self.alpha * (close - ema_long)
+        self.ema_long[symbol] = ema_long
+
+        rsi, ema_short = features["rsi"], features["ema_20"]
+        if math.isnan(rsi) or math.isnan(ema_short):
+            return None
+        if symbol not in self.long and rsi < self.rsi_oversold and ema_short > ema_long:
+            self.long.add(symbol)
+            return "BUY"
+        if symbol in self.long and (rsi > self.rsi_overbought or ema_short < ema_long):
+            self.long.discard(symbol)
+            return "SELL"
+        return None
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    if not samples:
+        return {"p50": float("nan"), "p90": float("nan"), "p99": float("nan"), "max": float("nan")}
+    p50, p90, p99 = np.percentile(samples, [50, 90, 99]).tolist()
+    return {"p50": p50, "p90": p90, "p99": p99, "max": max(samples)}
+
+class LoadTest:
+    """
+    Drives the streaming pipeline (TickBus -> TickAggregator -> FeatureStore -> signal)
+    with recorded or generated ticks at `rate` ticks per second, or as fast as possible
+    when `rate` is None, and measures throughput and tick-to-signal latency.
+
+    The pipeline reads a `queue_size` subscription (the `TickBus` default) that drops
+    the newest ticks when full, so a consumer that falls behind shows up in `dropped`.
+    Signals come from `EngineSignal` unless `signal_fn` is given.
+
+    Each published tick is a copy stamped with its publish time in `recv`, as a feed
+    would stamp arrival. Latency is measured from the publish of the tick that closed a
+    bar to the signal evaluated on that bar, so it includes the time the tick waited in
+    the queue.
+    """
+
+    def __init__(self, symbols: List[str], interval: str = "1min", rate: Optional[float] = None,
+                 signal_fn: Optional[Callable[[Dict[str, Any]], Optional[str]]] = None, batch_size: int = 1000,
+                 queue_size: int = 10000):
+        self.symbols = symbols
+        self.interval = interval
+        self.rate = rate
+        self.signal_fn = signal_fn
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+
+    async def _produce(self, bus: TickBus, ticks: List[Dict[str, Any]]):
+        start = time.perf_counter()
+        for i, tick in enumerate(ticks):
+            if self.rate:
+                ahead = start + i / self.rate - time.perf_counter()
+                if ahead > 0.001:
+                    await asyncio.sleep(ahead)
+            elif i % self.batch_size == 0:
+                await asyncio.sleep(0)
+            bus.publish({**tick, "recv": time.perf_counter()})
+        bus.close()
+
+    async def run(self, ticks: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        ticks = list(ticks)
+        bus = TickBus()
+        subscription = bus.subscribe("pipeline", maxsize=self.queue_size, policy=DROP_NEWEST)
+        aggregator = TickAggregator(self.interval)
+        store = FeatureStore(self.symbols)
+        signal_fn = self.signal_fn or EngineSignal()
+        latencies: List[float] = []
+        processed = 0
+        candles = 0
+        signals = 0
+
+        def evaluate(candle: Dict[str, Any]) -> Optional[str]:
+            store.add_candle(candle)
+            return signal_fn(store.get_latest_features(candle["symbol"], self.interval))
+
+        start = time.perf_counter()
+        producer = asyncio.create_task(self._produce(bus, ticks))
+        async for tick in subscription:
+            processed += 1
+            candle = aggregator.add_tick(tick)
+            if candle is None:
+                continue
+            candles += 1
+            if evaluate(candle) is not None:
+                signals += 1
+            latencies.append((time.perf_counter() - tick["recv"]) * 1000)
+        await producer
+
+        for candle in aggregator.flush(math.inf):
+            candles += 1
+            if evaluate(candle) is not None:
+                signals += 1
+        elapsed = time.perf_counter() - start
+
+        return {
+            "symbols": len(self.symbols),
+            "ticks": len(ticks),
+            "processed": processed,
+            "candles": candles,
+            "signals": signals,
+            "dropped": subscription.dropped,
+            "elapsed": elapsed,
+            "ticks_per_second": len(ticks) / elapsed if elapsed else float("inf"),
+            "latency_ms": percentiles(latencies),
+        }
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the streaming tick pipeline.")
+    parser.add_argument("--symbols", type=int, default=500, help="Number of synthetic symbols")
+    parser.add_argument("--ticks-per-symbol", type=int, default=600)
+    parser.add_argument("--rate", type=float, default=0, help="Ticks per second; 0 replays as fast as possible")
+    parser.add_argument("--interval", default="1min")
+    parser.add_argument("--queue-size", type=int, default=10000, help="Pipeline subscription bound; newer ticks are dropped when full")
+    parser.add_argument("--replay", help="JSON lines file of recorded ticks to replay instead of synthetic ones")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.replay:
+        ticks = read_ticks(args.replay)
+        symbols = list(dict.fromkeys(tick["symbol"] for tick in ticks))
+    else:
+        symbols = [f"SYM{i:05d}" for i in range(args.symbols)]
+        ticks = generate_ticks(symbols, args.ticks_per_symbol, seed=args.seed)
+
+    report = asyncio.run(LoadTest(symbols, args.interval, args.rate or None, queue_size=args.queue_size).run(ticks))
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
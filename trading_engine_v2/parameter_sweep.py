@@ -0,0 +1,200 @@
+import itertools
+import os
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import List, Dict, Any, Optional, Tuple
+from trading_engine_v2.backtester import Backtester
+
+class IndicatorStrategy:
+    """
+    A vectorized long-only strategy driven by the same knobs as `config.TradingConfig`:
+    enter when RSI is oversold in an EMA uptrend, exit when RSI is overbought, the
+    trend turns, or the close falls through an ATR stop set at entry.
+    """
+
+    def __init__(self, rsi_oversold: float = 30, rsi_overbought: float = 70, ema_short: int = 20, ema_long: int = 50,
+                 stop_loss_atr_multiplier: float = 2.0, size: float = 10):
+        self.rsi_oversold = rsi_oversold
+        self.rsi_overbought = rsi_overbought
+        self.ema_short = ema_short
+        self.ema_long = ema_long
+        self.stop_loss_atr_multiplier = stop_loss_atr_multiplier
+        self.size = size
+
+    def generate_signals(self, data: pd.DataFrame) -> np.ndarray:
+        close = data["close"]
+        delta = close.diff()
+        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
+        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+        rsi = (100 - (100 / (1 + gain / loss))).to_numpy()
+
+        ema_short = close.ewm(span=self.ema_short, adjust=False).mean().to_numpy()
+        ema_long = close.ewm(span=self.ema_long, adjust=False).mean().to_numpy()
+
+        prev_close = close.shift()
+        true_range = pd.concat([data["high"] - data["low"], (data["high"] - prev_close).abs(), (data["low"] - prev_close).abs()], axis=1).max(axis=1)
+        atr = true_range.rolling(window=14).mean().to_numpy()
+
+        close = close.to_numpy()
+        entries = np.flatnonzero((rsi < self.rsi_oversold) & (ema_short > ema_long))
+        exits = (rsi > self.rsi_overbought) | (ema_short < ema_long)
+
+        orders = np.zeros(len(close))
+        i = entries[0] if len(entries) else len(close)
+        while i < len(close):
+            orders[i] = self.size
+            stop = close[i] - self.stop_loss_atr_multiplier * atr[i]
+            after = slice(i + 1, len(close))
+            exit_at = np.flatnonzero(exits[after] | (close[after] < stop))
+            if not len(exit_at):
+                break
+            j = i + 1 + exit_at[0]
+            orders[j] = -self.size
+            next_entry = np.searchsorted(entries, j, side="right")
+            i = entries[next_entry] if next_entry < len(entries) else len(close)
+        return orders
+
+class SharedFrame:
+    """
+    Places the float columns and index of a DataFrame in one shared memory block so
+    worker processes can map the market data instead of receiving a pickled copy.
+    """
+
+    def __init__(self, data: pd.DataFrame):
+        self.columns = list(data.columns)
+        self.rows = len(data)
+        values = data.to_numpy(dtype=np.float64)
+        index = data.index.asi8 if isinstance(data.index, pd.DatetimeIndex) else data.index.to_numpy(dtype=np.int64)
+        self.shm = shared_memory.SharedMemory(create=True, size=max(values.nbytes + index.nbytes, 1))
+        block = np.ndarray((self.rows, len(self.columns) + 1), dtype=np.float64, buffer=self.shm.buf)
+        block[:, :-1] = values
+        block[:, -1] = index.view(np.float64)
+        unit = data.index.unit if isinstance(data.index, pd.DatetimeIndex) else None
+        self.descriptor = (self.shm.name, self.rows, self.columns, unit)
+
+    def close(self):
+        self.shm.close()
+        self.shm.unlink()
+
+def attach_frame(descriptor: Tuple) -> Tuple[shared_memory.SharedMemory, pd.DataFrame]:
+    """
+    Maps a `SharedFrame` into the current process as a zero-copy DataFrame.
+    """
+    name, rows, columns, unit = descriptor
+    shm = shared_memory.SharedMemory(name=name)
+    block = np.ndarray((rows, len(columns) + 1), dtype=np.float64, buffer=shm.buf)
+    index = block[:, -1].view(np.int64)
+    index = pd.DatetimeIndex(index.view(f"datetime64[{unit}]"), name="timestamp") if unit else pd.Index(index)
+    return shm, pd.DataFrame(block[:, :-1], index=index, columns=columns, copy=False)
+
+# Per-process state populated by the pool initializer
+_worker: Dict[str, Any] = {}
+
+def _init_worker(descriptor: Tuple, symbol: str, strategy_cls: type, backtest_kwargs: Dict[str, Any]):
+    _worker["descriptor"] = descriptor
+    _worker["symbol"] = symbol
+    _worker["strategy_cls"] = strategy_cls
+    _worker["backtest_kwargs"] = backtest_kwargs
+
+def _run_task(task: Tuple[Dict[str, Any], int, int]) -> Dict[str, Any]:
+    # Pool workers have no shutdown hook, so each task maps the data and unmaps it when done
+    params, start, stop = task
+    shm, data = attach_frame(_worker["descriptor"])
+    try:
+        return _backtest(params, data.iloc[start:stop])
+    finally:
+        # Every view onto the block must be gone before it can be closed
+        del data
+        shm.close()
+
+def _backtest(params: Dict[str, Any], data: pd.DataFrame) -> Dict[str, Any]:
+    backtester = Backtester(_worker["strategy_cls"](**params), **_worker["backtest_kwargs"])
+    results = backtester.run_vectorized(data, _worker["symbol"])
+    trades = results.get("trades", pd.DataFrame())
+    notional = (trades["size"] * trades["price"]).sum() if not trades.empty else 0.0
+    return {
+        **params,
+        "sharpe_ratio": results.get("sharpe_ratio", np.nan),
+        "max_drawdown": results.get("max_drawdown", np.nan),
+        "turnover": notional / backtester.initial_capital,
+        "trades": len(trades),
+        "final_value": results["equity_curve"].iloc[-1] if results else np.nan,
+    }
+
+class ParameterSweep:
+    """
+    Runs vectorized backtests over a parameter grid across a process pool.
+    The market data (numeric columns only) is shared with the workers through shared
+    memory, so each task only carries its parameters and the row range to test.
+    `processes=1` runs the tasks in the current process. Trades are recorded under `symbol`.
+    """
+
+    def __init__(self, data: pd.DataFrame, param_grid: Dict[str, List[Any]], strategy_cls: type = IndicatorStrategy,
+                 capital: float = 100000.0, commission: float = 0.001, slippage: float = 0.001, processes: Optional[int] = None,
+                 symbol: str = "SWEEP"):
+        self.data = data
+        self.symbol = symbol
+        self.param_grid = param_grid
+        self.strategy_cls = strategy_cls
+        self.backtest_kwargs = {"capital": capital, "commission": commission, "slippage": slippage}
+        self.processes = processes
+
+    def combinations(self) -> List[Dict[str, Any]]:
+        keys = list(self.param_grid)
+        return [dict(zip(keys, values)) for values in itertools.product(*(self.param_grid[key] for key in keys))]
+
+    def _map(self, tasks: List[Tuple[Dict[str, Any], int, int]]) -> List[Dict[str, Any]]:
+        shared = SharedFrame(self.data)
+        try:
+            if self.processes == 1:
+                _init_worker(shared.descriptor, self.symbol, self.strategy_cls, self.backtest_kwargs)
+                try:
+                    return [_run_task(task) for task in tasks]
+                finally:
+                    _worker.clear()
+            with ProcessPoolExecutor(max_workers=self.processes, initializer=_init_worker,
+                                     initargs=(shared.descriptor, self.symbol, self.strategy_cls, self.backtest_kwargs)) as executor:
+                chunksize = max(1, len(tasks) // ((self.processes or os.cpu_count() or 1) * 4))
+                return list(executor.map(_run_task, tasks, chunksize=chunksize))
+        finally:
+            shared.close()
+
+    @staticmethod
+    def _rank(results: List[Dict[str, Any]]) -> pd.DataFrame:
+        table = pd.DataFrame(results)
+        return table.sort_values("sharpe_ratio", ascending=False, na_position="last").reset_index(drop=True)
+
+    def run(self) -> pd.DataFrame:
+        """
+        Backtests every combination over the full data and returns them ranked by Sharpe ratio.
+        """
+        tasks = [(params, 0, len(self.data)) for params in self.combinations()]
+        return self._rank(self._map(tasks))
+
+    def walk_forward(self, train_size: int, test_size: int) -> pd.DataFrame:
+        """
+        Splits the data into rolling train/test folds, picks the best combination on each
+        training window and reports its out-of-sample metrics on the following test window.
+        """
+        combinations = self.combinations()
+        folds = [
+            (start, start + train_size, start + train_size + test_size)
+            for start in range(0, len(self.data) - train_size - test_size + 1, test_size)
+        ]
+        tasks = [(params, start, split) for start, split, _ in folds for params in combinations]
+        train_results = self._map(tasks)
+
+        best = []
+        for k in range(len(folds)):
+            fold_results = train_results[k * len(combinations):(k + 1) * len(combinations)]
+            scores = [result["sharpe_ratio"] for result in fold_results]
+            best.append(combinations[int(np.nanargmax(scores)) if not np.all(np.isnan(scores)) else 0])
+
+        test_results = self._map([(params, split, stop) for params, (_, split, stop) in zip(best, folds)])
+        for result, (start, split, stop) in zip(test_results, folds):
+            result["train_start"] = self.data.index[start]
+            result["test_start"] = self.data.index[split]
+            result["test_end"] = self.data.index[stop - 1]
+        return pd.DataFrame(test_results)
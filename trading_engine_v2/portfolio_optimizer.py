@@ -1,30 +1,106 @@
 import numpy as np
 import pandas as pd
+from scipy.optimize import minimize
+from typing import Dict, List, Mapping, Optional
 
 class PortfolioOptimizer:
     """
     Optimizes the portfolio for the best risk-adjusted return.
+    The mean and covariance of the returns are kept as running estimates that are
+    updated one observation at a time, and the covariance is shrunk towards a scaled
+    identity before solving. Solved weights are cached until the estimates change.
     """
 
-    def __init__(self, returns: pd.DataFrame):
-        self.returns = returns
+    def __init__(self, returns: pd.DataFrame, max_weight: float = 1.0, target_volatility: Optional[float] = None,
+                 risk_free_rate: float = 0.0, shrinkage: float = 0.1):
+        self.symbols: List[str] = list(returns.columns)
+        self.index: Dict[str, int] = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.max_weight = max_weight
+        self.target_volatility = target_volatility
+        self.risk_free_rate = risk_free_rate
+        self.shrinkage = shrinkage
+
+        values = returns.dropna().to_numpy(dtype=float)
+        self.count = len(values)
+        self.mean = values.mean(axis=0) if self.count else np.zeros(len(self.symbols))
+        centered = values - self.mean
+        self._scatter = centered.T @ centered
+        self._weights: Optional[np.ndarray] = None
+
+    def update(self, returns: Mapping[str, float]):
+        """
+        Folds one period of returns (symbol -> return) into the running mean and
+        covariance estimates and invalidates the cached weights.
+        """
+        x = np.array([returns[symbol] for symbol in self.symbols], dtype=float)
+        if not np.all(np.isfinite(x)):
+            return
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self._scatter += np.outer(delta, x - self.mean)
+        self._weights = None
+
+    def covariance(self) -> np.ndarray:
+        """
+        Returns the shrinkage estimate of the covariance matrix.
+        """
+        n = len(self.symbols)
+        if self.count < 2:
+            return np.eye(n)
+        sample = self._scatter / (self.count - 1)
+        target = np.trace(sample) / n * np.eye(n)
+        return (1 - self.shrinkage) * sample + self.shrinkage * target
 
     def mean_variance_optimization(self) -> np.ndarray:
         """
-        Performs mean-variance optimization to find the optimal portfolio weights.
-        (This is a placeholder for the actual implementation)
+        Finds the long-only weights that maximize the Sharpe ratio with each weight
+        capped at `max_weight`. Falls back to the minimum variance portfolio when no
+        asset has an expected return above the risk-free rate. With a `target_volatility`,
+        the weights are scaled down so the portfolio does not exceed it; the rest is cash.
         """
-        num_assets = self.returns.shape[1]
+        n = len(self.symbols)
+        if n == 0:
+            return np.zeros(0)
 
-        # Placeholder for the optimization logic
-        # In a real implementation, you would use a library like scipy.optimize
-        # to find the optimal weights that maximize the Sharpe ratio.
+        cov = self.covariance()
+        excess = self.mean - self.risk_free_rate
+        invested = min(1.0, self.max_weight * n)
 
-        # For now, we'll just return equal weights
-        return np.ones(num_assets) / num_assets
+        if np.any(excess > 0):
+            def objective(w):
+                return -(w @ excess) / np.sqrt(w @ cov @ w)
+        else:
+            def objective(w):
+                return w @ cov @ w
+
+        result = minimize(
+            objective,
+            np.full(n, invested / n),
+            method="SLSQP",
+            bounds=[(0.0, self.max_weight)] * n,
+            constraints=[{"type": "eq", "fun": lambda w: w.sum() - invested}]
+        )
+        weights = np.clip(result.x if result.success else np.full(n, invested / n), 0.0, self.max_weight)
+
+        if self.target_volatility is not None:
+            volatility = np.sqrt(weights @ cov @ weights)
+            if volatility > self.target_volatility:
+                weights *= self.target_volatility / volatility
+
+        return weights
 
     def get_optimal_weights(self) -> np.ndarray:
         """
-        Returns the optimal portfolio weights.
+        Returns the optimal portfolio weights, solving only if the estimates changed.
+        """
+        if self._weights is None:
+            self._weights = self.mean_variance_optimization()
+        return self._weights
+
+    def get_weight(self, symbol: str) -> float:
+        """
+        Returns the optimal weight of a symbol, or 0.0 if it is not in the portfolio.
         """
-        return self.mean_variance_optimization()
+        i = self.index.get(symbol)
+        return 0.0 if i is None else float(self.get_optimal_weights()[i])
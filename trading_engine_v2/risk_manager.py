@@ -1,17 +1,39 @@
-from typing import Dict, Any
+from dataclasses import dataclass, field
+from typing import Dict, Any, List
+from trading_engine_v2.exposure_ledger import ExposureLedger
 from trading_engine_v2.portfolio_optimizer import PortfolioOptimizer
 
+@dataclass
+class PendingExposure:
+    """
+    Exposure of the orders approved earlier in a batch: the added gross exposure in
+    total and per sector, and the signed value per symbol.
+    """
+    gross: float = 0.0
+    sectors: Dict[str, float] = field(default_factory=dict)
+    symbols: Dict[str, float] = field(default_factory=dict)
+
 class RiskManager:
     """
     Manages risk for the trading bot, including position sizing,
     stop-loss handling, and exposure limits.
+
+    Exposure limits are checked against `ledger`, which the caller must keep current:
+    apply every fill with `ledger.on_fill`, mark prices with `ledger.on_tick` (for
+    example as a `TickBus` listener) and `ledger.resync` it with the broker's positions
+    before each cycle. An unfed ledger is flat, so only the limits of the current
+    batch apply.
     """
 
-    def __init__(self, capital: float, risk_per_trade: float = 0.01, max_exposure: float = 0.2, portfolio_optimizer: PortfolioOptimizer = None):
+    def __init__(self, capital: float, risk_per_trade: float = 0.01, max_exposure: float = 0.2, portfolio_optimizer: PortfolioOptimizer = None,
+                 ledger: ExposureLedger = None, max_symbol_exposure: float = None, max_sector_exposure: float = None):
         self.capital = capital
         self.risk_per_trade = risk_per_trade
         self.max_exposure = max_exposure
         self.portfolio_optimizer = portfolio_optimizer
+        self.ledger = ledger or ExposureLedger()
+        self.max_symbol_exposure = max_symbol_exposure
+        self.max_sector_exposure = max_sector_exposure
 
     def size_position(self, entry_price: float, stop_loss_price: float, symbol: str) -> float:
         """
@@ -25,11 +47,7 @@ class RiskManager:
         position_size = risk_amount / risk_per_share
 
         if self.portfolio_optimizer:
-            optimal_weights = self.portfolio_optimizer.get_optimal_weights()
-            # This is a simplified example of how the optimal weights could be used.
-            # In a real implementation, you would need to map the symbol to the correct
-            # index in the optimal_weights array.
-            position_size *= optimal_weights[0]
+            position_size *= self.portfolio_optimizer.get_weight(symbol)
 
         return position_size
 
@@ -44,6 +62,21 @@ class RiskManager:
         Consumes a trading signal and returns an order specification with risk management applied,
         or vetoes the signal.
         """
+        return self._vet_signal(signal, PendingExposure())
+
+    def manage_signals(self, signals: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Vets a whole cycle's signals in one pass. Orders approved earlier in the batch
+        count towards the limits of the later ones, as if they had already been filled.
+        """
+        pending = PendingExposure()
+        return [self._vet_signal(signal, pending) for signal in signals]
+
+    def _vet_signal(self, signal: Dict[str, Any], pending: PendingExposure) -> Dict[str, Any]:
+        """
+        Sizes a signal and checks it against the exposure ledger plus the orders already
+        approved in this batch (`pending`, updated on approval).
+        """
         entry_price = signal.get("price")
         stop_loss_price = signal.get("stop")
         symbol = signal.get("symbol")
@@ -53,12 +86,30 @@ class RiskManager:
 
         position_size = self.size_position(entry_price, stop_loss_price, symbol)
         position_value = position_size * entry_price
+        signed_value = position_value if signal["side"] == "BUY" else -position_value
 
-        # Assuming a function to get current total exposure
-        current_exposure = self._get_current_exposure()
-        if not self.check_exposure(position_value, current_exposure):
+        # Only the change in the symbol's absolute exposure counts against the limits,
+        # so orders that reduce a position are never vetoed for exposure.
+        symbol_value = self.ledger.values.get(symbol, 0.0) + pending.symbols.get(symbol, 0.0)
+        added = abs(symbol_value + signed_value) - abs(symbol_value)
+        current_exposure = self._get_current_exposure() + pending.gross
+        if not self.check_exposure(added, current_exposure):
             return {"action": "veto", "reason": "Exceeds maximum exposure"}
 
+        if self.max_symbol_exposure is not None and added > 0:
+            if abs(symbol_value + signed_value) / self.capital > self.max_symbol_exposure:
+                return {"action": "veto", "reason": "Exceeds maximum symbol exposure"}
+
+        sector = self.ledger.sector(symbol)
+        if self.max_sector_exposure is not None and added > 0:
+            sector_exposure = self.ledger.sector_exposure(sector) + pending.sectors.get(sector, 0.0)
+            if (sector_exposure + added) / self.capital > self.max_sector_exposure:
+                return {"action": "veto", "reason": "Exceeds maximum sector exposure"}
+
+        pending.symbols[symbol] = pending.symbols.get(symbol, 0.0) + signed_value
+        pending.gross += added
+        pending.sectors[sector] = pending.sectors.get(sector, 0.0) + added
+
         order_spec = {
             "symbol": signal["symbol"],
             "side": signal["side"],
@@ -72,7 +123,6 @@ class RiskManager:
 
     def _get_current_exposure(self) -> float:
         """
-        A placeholder for a function that would return the current total exposure.
-        In a real implementation, this would fetch data from a portfolio manager.
+        Returns the current gross exposure from the exposure ledger.
         """
-        return 0.0
+        return self.ledger.gross
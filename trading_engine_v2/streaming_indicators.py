@@ -0,0 +1,120 @@
+import math
+from typing import Dict, List, Any
+
+FEATURE_COLUMNS: List[str] = ["sma_20", "ema_20", "rsi", "atr", "vwap"]
+
+
+class RollingWindow:
+    """
+    A fixed-size ring buffer that keeps a running sum of the last `size` values.
+    Pushing a value is O(1); the sum is re-synchronised once per lap of the ring
+    so floating point drift cannot accumulate over a long session.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.values: List[float] = [0.0] * size
+        self.index = 0
+        self.count = 0
+        self.total = 0.0
+
+    def push(self, value: float):
+        """
+        Adds a value, evicting the oldest one once the window is full.
+        """
+        self.total += value - self.values[self.index]
+        self.values[self.index] = value
+        self.index += 1
+        if self.index == self.size:
+            self.index = 0
+            self.total = math.fsum(self.values)
+        if self.count < self.size:
+            self.count += 1
+
+    def is_full(self) -> bool:
+        return self.count == self.size
+
+    def mean(self) -> float:
+        """
+        Returns the mean of the window, or NaN until the window is full
+        (matching pandas' `rolling(window).mean()`).
+        """
+        if not self.is_full():
+            return math.nan
+        return self.total / self.size
+
+
+class StreamingIndicators:
+    """
+    Incrementally maintained SMA, EMA, RSI, ATR and VWAP for a single symbol and timeframe.
+    Each call to `update` consumes one closed candle in constant time and memory and
+    produces the same values as the batch pandas formulas applied to the full history.
+    """
+
+    def __init__(self):
+        self.sma = RollingWindow(20)
+        self.ema_alpha = 2.0 / (20 + 1)
+        self.ema = math.nan
+        self.gains = RollingWindow(14)
+        self.losses = RollingWindow(14)
+        self.true_ranges = RollingWindow(14)
+        self.prev_close = math.nan
+        self.cum_pv = 0.0
+        self.cum_volume = 0.0
+        self.latest: Dict[str, float] = {}
+
+    def update(self, high: float, low: float, close: float, volume: float) -> Dict[str, float]:
+        """
+        Consumes a new candle and returns the updated feature values.
+        """
+        # Simple Moving Average (SMA)
+        self.sma.push(close)
+
+        # Exponential Moving Average (EMA), equivalent to ewm(adjust=False)
+        if math.isnan(self.ema):
+            self.ema = close
+        else:
+            self.ema += self.ema_alpha * (close - self.ema)
+
+        # Relative Strength Index (RSI) over rolling mean gains/losses.
+        # The first candle has no delta and counts as a zero gain and loss.
+        delta = 0.0 if math.isnan(self.prev_close) else close - self.prev_close
+        self.gains.push(delta if delta > 0 else 0.0)
+        self.losses.push(-delta if delta < 0 else 0.0)
+
+        # Average True Range (ATR)
+        high_low = high - low
+        if math.isnan(self.prev_close):
+            true_range = high_low
+        else:
+            true_range = max(high_low, abs(high - self.prev_close), abs(low - self.prev_close))
+        self.true_ranges.push(true_range)
+
+        # Volume Weighted Average Price (VWAP)
+        self.cum_pv += volume * (high + low) / 2
+        self.cum_volume += volume
+
+        self.prev_close = close
+        self.latest = {
+            "sma_20": self.sma.mean(),
+            "ema_20": self.ema,
+            "rsi": self._rsi(),
+            "atr": self.true_ranges.mean(),
+            "vwap": self.cum_pv / self.cum_volume if self.cum_volume else math.nan,
+        }
+        return self.latest
+
+    def _rsi(self) -> float:
+        gain = self.gains.mean()
+        loss = self.losses.mean()
+        if math.isnan(gain) or math.isnan(loss):
+            return math.nan
+        if loss == 0:
+            return 100.0 if gain > 0 else math.nan
+        return 100 - (100 / (1 + gain / loss))
+
+    def get_latest(self) -> Dict[str, Any]:
+        """
+        Returns the most recent feature values.
+        """
+        return dict(self.latest)
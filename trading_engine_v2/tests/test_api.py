@@ -0,0 +1,25 @@
+import time
+from fastapi.testclient import TestClient
+from trading_engine_v2.api.main import app, ledger, tick_bus
+
+def test_tick_stream_forwards_ticks_and_unsubscribes_on_disconnect():
+    tick = {"symbol": "NSE_EQ|INE009A01021", "ts": 1700000000, "bid": 99.9, "ask": 100.1, "last": 100.0, "volume": 10}
+    with TestClient(app) as client:
+        with client.websocket_connect("/ws/ticks") as websocket:
+            while not tick_bus.subscriptions:
+                time.sleep(0.01)
+            client.portal.call(tick_bus.publish, tick)
+            assert websocket.receive_json() == tick
+
+            websocket.close()
+            deadline = time.monotonic() + 2
+            while tick_bus.subscriptions and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert tick_bus.subscriptions == {}
+
+def test_execute_records_fill_on_ledger():
+    with TestClient(app) as client:
+        response = client.post("/execute", json={"symbol": "NSE:INFY", "side": "BUY", "size": 10, "price": 100.0})
+        assert response.status_code == 200
+    assert ledger.values["NSE:INFY"] == 1000.0
+    ledger.on_fill("NSE:INFY", "SELL", 10, 100.0)
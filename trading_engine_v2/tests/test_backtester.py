@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+import pytest
+from trading_engine_v2.backtester import Backtester
+
+class CrossoverStrategy:
+    """
+    Replays the precomputed `order` column: a positive value buys that many shares,
+    a negative one sells them. The `data` fixture fills it with moving-average crossovers.
+    """
+
+    def generate_signal(self, row):
+        if row["order"] > 0:
+            return {"symbol": "NSE:INFY", "side": "BUY", "size": row["order"]}
+        if row["order"] < 0:
+            return {"symbol": "NSE:INFY", "side": "SELL", "size": -row["order"]}
+        return None
+
+    def generate_signals(self, data):
+        return data["order"].to_numpy()
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(42)
+    n = 2000
+    close = 1500 * np.cumprod(1 + rng.normal(0, 0.003, n))
+    df = pd.DataFrame({"close": close}, index=pd.date_range("2024-01-01 09:15", periods=n, freq="min"))
+    # The event-driven run marks the position at its own column
+    df["NSE:INFY"] = close
+    # Buy 10 when the close crosses above its 20-bar average, sell 10 when it crosses below
+    above = (df["close"] > df["close"].rolling(20).mean()).astype(int)
+    df["order"] = above.diff().fillna(0) * 10
+    # A few oversized buys exercise the capital check
+    df.iloc[100, df.columns.get_loc("order")] = 1000
+    return df
+
+def test_vectorized_matches_event_driven(data):
+    event = Backtester(CrossoverStrategy()).run(data)
+    vectorized = Backtester(CrossoverStrategy()).run_vectorized(data, symbol="NSE:INFY")
+
+    assert event["final_capital"] == vectorized["final_capital"]
+    assert event["sharpe_ratio"] == vectorized["sharpe_ratio"]
+    assert event["max_drawdown"] == vectorized["max_drawdown"]
+    pd.testing.assert_series_equal(event["equity_curve"], vectorized["equity_curve"], check_freq=False)
+    pd.testing.assert_frame_equal(event["trades"], vectorized["trades"])
+    assert len(event["trades"]) > 0
+
+def test_trades_are_stamped_with_bar_time(data):
+    results = Backtester(CrossoverStrategy()).run_vectorized(data, symbol="NSE:INFY")
+    assert results["trades"]["timestamp"].isin(data.index).all()
+
+class PanelStrategy:
+    def __init__(self, orders):
+        self.orders = orders
+
+    def generate_orders(self, prices):
+        return self.orders
+
+def test_portfolio_single_symbol_matches_vectorized(data):
+    prices = data[["close"]].rename(columns={"close": "NSE:INFY"})
+    portfolio = Backtester(PanelStrategy(data[["order"]].to_numpy())).run_portfolio(prices)
+    vectorized = Backtester(CrossoverStrategy()).run_vectorized(data, symbol="NSE:INFY")
+
+    assert portfolio["final_capital"] == pytest.approx(vectorized["final_capital"])
+    np.testing.assert_allclose(portfolio["equity_curve"].to_numpy(), vectorized["equity_curve"].to_numpy())
+    pd.testing.assert_frame_equal(portfolio["trades"], vectorized["trades"])
+
+def test_portfolio_marks_every_symbol():
+    index = pd.date_range("2024-01-01 09:15", periods=3, freq="min")
+    prices = pd.DataFrame({"A": [10.0, 11.0, 12.0], "B": [20.0, 19.0, 18.0], "C": [np.nan, 5.0, 6.0]}, index=index)
+    orders = np.array([[1, 2, 1], [0, 0, 4], [-1, 0, 0]], dtype=float)
+    backtester = Backtester(PanelStrategy(orders), capital=1000.0, commission=0.0, slippage=0.0)
+    results = backtester.run_portfolio(prices)
+
+    # The order on C's missing price is skipped
+    # Bar 1 marks A +1, B -2; bar 2 realises A at 12 and marks B -4, C +4
+    assert results["equity_curve"].tolist() == [1000.0, 999.0, 1002.0]
+    assert results["trades"]["symbol"].tolist() == ["A", "B", "C", "A"]
+    assert results["trades"]["timestamp"].tolist() == [index[0], index[0], index[1], index[2]]
+    assert backtester.positions == {"A": 0.0, "B": 2.0, "C": 4.0}
+
+def test_portfolio_marks_missing_bars_at_last_price():
+    index = pd.date_range("2024-01-01 09:15", periods=4, freq="min")
+    prices = pd.DataFrame({"A": [10.0, np.nan, np.nan, 13.0], "B": [20.0, 21.0, 22.0, 23.0]}, index=index)
+    orders = np.array([[1, 0], [0, 0], [0, 1], [0, 0]], dtype=float)
+    backtester = Backtester(PanelStrategy(orders), capital=1000.0, commission=0.0, slippage=0.0)
+    results = backtester.run_portfolio(prices)
+
+    # A is held through its gap at 10, then marked at 13
+    assert results["equity_curve"].tolist() == [1000.0, 1000.0, 1000.0, 1004.0]
+    assert np.isfinite(results["sharpe_ratio"])
+    assert results["max_drawdown"] == 0.0
+
+def test_event_driven_requires_a_price_for_every_position():
+    index = pd.date_range("2024-01-01 09:15", periods=2, freq="min")
+    data = pd.DataFrame({"NSE:INFY": [10.0, 11.0], "order": [0.0, 0.0]}, index=index)
+    backtester = Backtester(CrossoverStrategy())
+    backtester.positions["NSE:TCS"] = 1
+
+    with pytest.raises(ValueError, match="NSE:TCS"):
+        backtester.run(data)
+
+def test_event_driven_does_not_mark_at_another_symbols_close():
+    index = pd.date_range("2024-01-01 09:15", periods=2, freq="min")
+    data = pd.DataFrame({"close": [10.0, 11.0], "order": [0.0, 0.0]}, index=index)
+    backtester = Backtester(CrossoverStrategy())
+    backtester.positions["NSE:INFY"] = 1
+
+    with pytest.raises(ValueError, match="NSE:INFY"):
+        backtester.run(data)
@@ -0,0 +1,18 @@
+from trading_engine_v2.bar_aggregator import BarAggregator
+
+def candle(ts, open_, high, low, close, volume=100):
+    return {"ts": ts, "open": open_, "high": high, "low": low, "close": close, "volume": volume}
+
+def test_updates_open_bar_in_place():
+    aggregator = BarAggregator("5min")
+    assert aggregator.update(candle(600, 10, 12, 9, 11)) is None
+    assert aggregator.update(candle(660, 11, 15, 10, 14)) is None
+    assert aggregator.current() == {"ts": 600, "open": 10, "high": 15, "low": 9, "close": 14, "volume": 200}
+
+def test_emits_on_rollover():
+    aggregator = BarAggregator("5min")
+    aggregator.update(candle(600, 10, 12, 9, 11))
+    aggregator.update(candle(840, 11, 13, 8, 12))
+    completed = aggregator.update(candle(900, 12, 12, 12, 12))
+    assert completed == {"ts": 600, "open": 10, "high": 13, "low": 8, "close": 12, "volume": 200}
+    assert aggregator.current()["ts"] == 900
@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+from trading_engine_v2.candle_buffer import CandleBuffer
+
+@pytest.fixture
+def buffer():
+    return CandleBuffer(["open", "close"], capacity=4)
+
+def test_append_and_last(buffer):
+    buffer.append(100, (1.0, 2.0))
+    assert len(buffer) == 1
+    assert buffer.last() == {"open": 1.0, "close": 2.0, "ts": 100}
+
+def test_ring_keeps_latest_rows_in_order(buffer):
+    for i in range(10):
+        buffer.append(i, (float(i), float(i) + 0.5))
+    assert len(buffer) == 4
+    assert buffer.timestamps().tolist() == [6, 7, 8, 9]
+    assert buffer.column("open").tolist() == [6.0, 7.0, 8.0, 9.0]
+
+def test_views_are_zero_copy(buffer):
+    data = buffer.data
+    for i in range(7):
+        buffer.append(i, (float(i), float(i)))
+    assert buffer.data is data
+    assert np.shares_memory(buffer.values(), data)
+    assert np.shares_memory(buffer.column("close"), data)
+    frame = buffer.to_frame()
+    assert frame["close"].tolist() == [3.0, 4.0, 5.0, 6.0]
+    assert np.shares_memory(frame.to_numpy(), data)
@@ -0,0 +1,70 @@
+import pytest
+from trading_engine_v2.exposure_ledger import ExposureLedger
+from trading_engine_v2.risk_manager import RiskManager
+
+@pytest.fixture
+def ledger():
+    return ExposureLedger(sectors={"NSE:INFY": "IT", "NSE:TCS": "IT", "NSE:HDFC": "BANK"})
+
+def test_fills_and_marks(ledger):
+    ledger.on_fill("NSE:INFY", "BUY", 10, 100.0)
+    ledger.on_fill("NSE:HDFC", "SELL", 5, 200.0)
+    assert ledger.gross == 2000.0
+    assert ledger.net == 0.0
+
+    ledger.on_mark("NSE:INFY", 110.0)
+    assert ledger.gross == 2100.0
+    assert ledger.symbol_exposure("NSE:INFY") == 1100.0
+    assert ledger.sector_exposure("IT") == 1100.0
+    assert ledger.sector_exposure("BANK") == 1000.0
+
+    ledger.on_fill("NSE:INFY", "SELL", 10, 120.0)
+    assert ledger.gross == 1000.0
+    assert ledger.net == -1000.0
+    assert "NSE:INFY" not in ledger.values
+
+def test_mark_without_position_is_ignored(ledger):
+    ledger.on_mark("NSE:TCS", 3000.0)
+    assert ledger.gross == 0.0
+
+def test_manage_signal_checks_ledger(ledger):
+    risk_manager = RiskManager(capital=100000.0, ledger=ledger)
+    ledger.on_fill("NSE:TCS", "BUY", 50, 200.0)
+    signal = {"symbol": "NSE:INFY", "side": "BUY", "price": 100, "stop": 90}
+    assert risk_manager.manage_signal(signal)["action"] == "place_order"
+
+    ledger.on_mark("NSE:TCS", 220.0)
+    assert risk_manager.manage_signal(signal)["action"] == "veto"
+
+    # Selling down an existing long reduces exposure and is allowed
+    exit_signal = {"symbol": "NSE:TCS", "side": "SELL", "price": 220, "stop": 230}
+    assert risk_manager.manage_signal(exit_signal)["action"] == "place_order"
+
+def test_manage_signals_counts_earlier_approvals(ledger):
+    risk_manager = RiskManager(capital=100000.0, ledger=ledger, max_sector_exposure=0.15)
+    signals = [
+        {"symbol": "NSE:INFY", "side": "BUY", "price": 100, "stop": 90},
+        {"symbol": "NSE:TCS", "side": "BUY", "price": 100, "stop": 90},
+        {"symbol": "NSE:HDFC", "side": "BUY", "price": 100, "stop": 90},
+        {"symbol": "NSE:HDFC", "side": "BUY", "price": 100, "stop": 90},
+    ]
+    actions = [result["action"] for result in risk_manager.manage_signals(signals)]
+    assert actions == ["place_order", "veto", "place_order", "veto"]
+    assert ledger.gross == 0.0
+
+def test_resync_matches_positions_after_a_rejected_order(ledger):
+    ledger.on_fill("NSE:INFY", "BUY", 10, 100.0)
+    ledger.on_fill("NSE:HDFC", "SELL", 5, 200.0)
+    # Applied optimistically, then rejected by the broker
+    ledger.on_fill("NSE:TCS", "BUY", 3, 3000.0)
+    ledger.on_mark("NSE:INFY", 105.0)
+
+    ledger.resync({"NSE:INFY": (10, 105.0), "NSE:HDFC": (-5, 200.0)})
+    expected = ExposureLedger(ledger.sectors)
+    expected.on_fill("NSE:INFY", "BUY", 10, 105.0)
+    expected.on_fill("NSE:HDFC", "SELL", 5, 200.0)
+    assert ledger.values == expected.values
+    assert (ledger.gross, ledger.net) == (expected.gross, expected.net) == (2050.0, 50.0)
+    assert ledger.sector_exposure("IT") == 1050.0
+    assert ledger.sector_exposure("BANK") == 1000.0
+    assert "NSE:TCS" not in ledger.quantities
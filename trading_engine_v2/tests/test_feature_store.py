@@ -1,4 +1,5 @@
 import pytest
+import numpy as np
 import pandas as pd
 from trading_engine_v2.feature_store import FeatureStore
 
@@ -27,3 +28,57 @@ def test_calculate_features(feature_store):
     assert "rsi" in features.columns
     assert "atr" in features.columns
     assert "vwap" in features.columns
+
+def test_latest_features_match_pandas():
+    store = FeatureStore(symbols=["NSE:INFY"])
+    rows = []
+    for i in range(60):
+        close = 1500.0 + 10 * np.sin(i / 5)
+        candle = {"symbol": "NSE:INFY", "ts": 1700000000 + 60 * i, "open": close - 1, "close": close, "high": close + 2, "low": close - 3, "volume": 1000 + i}
+        store.add_candle(candle)
+        rows.append(candle)
+
+    df = pd.DataFrame(rows)
+    latest = store.get_latest_features("NSE:INFY", "1min")
+    assert latest["close"] == df["close"].iloc[-1]
+    assert latest["sma_20"] == pytest.approx(df["close"].rolling(window=20).mean().iloc[-1])
+    assert latest["ema_20"] == pytest.approx(df["close"].ewm(span=20, adjust=False).mean().iloc[-1])
+    assert latest["vwap"] == pytest.approx(((df["volume"] * (df["high"] + df["low"]) / 2).sum() / df["volume"].sum()))
+
+def test_retention_horizon():
+    store = FeatureStore(symbols=["NSE:INFY"], retention=50)
+    for i in range(120):
+        candle = {"symbol": "NSE:INFY", "ts": 1700000000 + 60 * i, "open": 1500.0, "close": 1500.0 + i, "high": 1510.0 + i, "low": 1490.0, "volume": 1000}
+        store.add_candle(candle)
+    features = store.get_features("NSE:INFY", "1min")
+    assert len(features) == 50
+    assert features.iloc[-1]["close"] == 1619.0
+    assert store.get_latest_features("NSE:INFY", "1min")["ts"] == 1700000000 + 60 * 119
+
+def test_higher_timeframes_match_resample():
+    store = FeatureStore(symbols=["NSE:INFY"], timeframes=["1min", "5min", "15min"])
+    rows = []
+    for i in range(300):
+        close = 1500.0 + 10 * np.sin(i / 7) + i * 0.1
+        candle = {"symbol": "NSE:INFY", "ts": 1700000100 + 60 * i, "open": close - 1, "close": close, "high": close + 2 + i % 3, "low": close - 3, "volume": 1000 + i}
+        store.add_candle(candle)
+        rows.append(candle)
+
+    base_df = pd.DataFrame(rows)
+    base_df.index = pd.to_datetime(base_df["ts"], unit="s")
+    for tf in ["5min", "15min"]:
+        # Only closed bars are stored, so the still-forming last bucket is excluded
+        expected = base_df.resample(tf).agg({"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"}).dropna().iloc[:-1]
+        features = store.get_features("NSE:INFY", tf)
+        assert list(features.index) == list(expected.index)
+        for column in ["open", "high", "low", "close", "volume"]:
+            np.testing.assert_allclose(features[column].values, expected[column].values)
+        np.testing.assert_allclose(features["sma_20"].values, expected["close"].rolling(window=20).mean().values, equal_nan=True)
+
+def test_add_candle_returns_completed_bars():
+    store = FeatureStore(symbols=["NSE:INFY"], timeframes=["1min", "5min"])
+    base = 1700000100
+    for i in range(5):
+        assert store.add_candle({"symbol": "NSE:INFY", "ts": base + 60 * i, "open": 1.0, "close": 2.0, "high": 3.0, "low": 0.5, "volume": 10}) == []
+    completed = store.add_candle({"symbol": "NSE:INFY", "ts": base + 300, "open": 1.0, "close": 2.0, "high": 3.0, "low": 0.5, "volume": 10})
+    assert completed == [{"symbol": "NSE:INFY", "interval": "5min", "ts": base, "open": 1.0, "high": 3.0, "low": 0.5, "close": 2.0, "volume": 50}]
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+from datetime import date
+from trading_engine_v2.history_store import HistoryStore
+
+def make_candles(start, periods, base=100.0):
+    index = pd.date_range(start, periods=periods, freq="min", name="timestamp")
+    close = base + np.arange(periods, dtype=float)
+    return pd.DataFrame({"open": close, "high": close + 1, "low": close - 1, "close": close, "volume": 1000.0}, index=index)
+
+@pytest.fixture
+def store(tmp_path):
+    return HistoryStore(str(tmp_path))
+
+def test_write_and_load_range(store):
+    store.write("NSE_EQ|INE009A01021", "1minute", make_candles("2024-01-01 03:45", 100))
+    assert store.instruments("1minute") == ["NSE_EQ|INE009A01021"]
+
+    df = store.load("NSE_EQ|INE009A01021", "1minute", start="2024-01-01 04:00", end="2024-01-01 04:09")
+    assert len(df) == 10
+    assert df.index[0] == pd.Timestamp("2024-01-01 04:00")
+    assert df["close"].iloc[0] == 115.0
+
+def test_load_is_memory_mapped(store):
+    store.write("INFY", "1minute", make_candles("2024-01-01", 50))
+    ts, ohlcv = store.arrays("INFY", "1minute")
+    assert isinstance(ohlcv, np.memmap)
+
+    values = store.load("INFY", "1minute").to_numpy()
+    while not isinstance(values, np.memmap) and isinstance(values.base, np.ndarray):
+        values = values.base
+    assert isinstance(values, np.memmap)
+
+def test_write_merges_and_replaces(store):
+    store.write("INFY", "1minute", make_candles("2024-01-01", 10))
+    store.write("INFY", "1minute", make_candles("2024-01-01 00:05", 10, base=500.0))
+    df = store.load("INFY", "1minute")
+    assert len(df) == 15
+    assert df.index.is_monotonic_increasing
+    assert df["close"].iloc[4] == 104.0
+    assert df["close"].iloc[5] == 500.0
+
+def test_import_from_client(store):
+    class FakeClient:
+        def __init__(self):
+            self.calls = []
+
+        def fetch_historical(self, symbol, start_ts, end_ts, timeframe):
+            self.calls.append((start_ts, end_ts))
+            day = pd.Timestamp(start_ts, tz="Asia/Kolkata") + pd.Timedelta(hours=9, minutes=15)
+            return {"data": {"candles": [[(day + pd.Timedelta(minutes=i)).isoformat(), 1, 2, 0.5, 1.5, 10, 0] for i in range(3)]}}
+
+    client = FakeClient()
+    store.import_from_client(client, ["INFY"], "1minute", date(2024, 1, 1), date(2024, 1, 10), chunk_days=5)
+    assert client.calls == [("2024-01-01", "2024-01-05"), ("2024-01-06", "2024-01-10")]
+    df = store.load("INFY", "1minute")
+    assert len(df) == 6
+    assert df.index[0] == pd.Timestamp("2024-01-01 03:45")
+
+def test_write_publishes_one_file(store, tmp_path):
+    store.write("INFY", "1minute", make_candles("2024-01-01", 10))
+    ts, ohlcv = store.arrays("INFY", "1minute")
+    store.write("INFY", "1minute", make_candles("2024-01-01 00:10", 5))
+
+    # An open reader keeps a consistent snapshot, and the new series is one file
+    assert len(ts) == len(ohlcv) == 10
+    new_ts, new_ohlcv = store.arrays("INFY", "1minute")
+    assert len(new_ts) == len(new_ohlcv) == 15
+    assert sorted(p.name for p in (tmp_path / "1minute" / "INFY").iterdir()) == ["candles.npy"]
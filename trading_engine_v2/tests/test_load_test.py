@@ -0,0 +1,47 @@
+import asyncio
+import pytest
+from trading_engine_v2.load_test import EngineSignal, LoadTest, generate_ticks
+
+@pytest.fixture
+def symbols():
+    return [f"SYM{i:05d}" for i in range(20)]
+
+def test_generate_ticks_interleaves_symbols(symbols):
+    ticks = generate_ticks(symbols, 5, seed=1)
+    assert len(ticks) == 100
+    assert [tick["symbol"] for tick in ticks[:20]] == symbols
+    assert all(tick["bid"] <= tick["last"] <= tick["ask"] for tick in ticks)
+
+def test_load_test_reports_throughput_and_latency(symbols):
+    ticks = generate_ticks(symbols, 150, seed=1)
+    report = asyncio.run(LoadTest(symbols, signal_fn=lambda features: "BUY").run(ticks))
+    assert report["ticks"] == report["processed"] == 3000
+    assert report["dropped"] == 0
+    assert all("recv" not in tick for tick in ticks)
+    # 150 one-second ticks span three one-minute bars per symbol
+    assert report["candles"] == 60
+    assert report["signals"] == 60
+    assert report["ticks_per_second"] > 0
+    latency = report["latency_ms"]
+    assert 0 <= latency["p50"] <= latency["p90"] <= latency["p99"] <= latency["max"]
+
+def test_load_test_paces_to_rate(symbols):
+    ticks = generate_ticks(symbols, 10, seed=1)
+    report = asyncio.run(LoadTest(symbols, rate=2000).run(ticks))
+    assert report["elapsed"] >= 0.09
+
+def test_load_test_drops_newest_when_queue_is_full(symbols):
+    ticks = generate_ticks(symbols, 150, seed=1)
+    report = asyncio.run(LoadTest(symbols, batch_size=1000, queue_size=100).run(ticks))
+    assert report["dropped"] > 0
+    assert report["processed"] + report["dropped"] == report["ticks"]
+
+def test_engine_signal_enters_and_exits_once():
+    signal = EngineSignal()
+    features = {"symbol": "INFY", "close": 100.0, "ema_20": 100.0, "rsi": 50.0}
+    assert signal(features) is None
+    # Oversold in an uptrend buys once; the repeat is held
+    assert signal({**features, "close": 101.0, "ema_20": 101.0, "rsi": 25.0}) == "BUY"
+    assert signal({**features, "close": 101.0, "ema_20": 101.0, "rsi": 25.0}) is None
+    assert signal({**features, "close": 102.0, "ema_20": 101.0, "rsi": 75.0}) == "SELL"
+    assert signal({**features, "close": 102.0, "ema_20": 101.0, "rsi": 75.0}) is None
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+from trading_engine_v2.parameter_sweep import ParameterSweep, SharedFrame, attach_frame
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(3)
+    n = 3000
+    close = 1500 * np.cumprod(1 + rng.normal(0, 0.004, n))
+    high = close * (1 + rng.uniform(0, 0.002, n))
+    low = close * (1 - rng.uniform(0, 0.002, n))
+    return pd.DataFrame({"high": high, "low": low, "close": close}, index=pd.date_range("2024-01-01 09:15", periods=n, freq="min"))
+
+@pytest.fixture
+def grid():
+    return {"rsi_oversold": [25, 35], "ema_short": [10, 20], "stop_loss_atr_multiplier": [1.5, 3.0]}
+
+def test_shared_frame_round_trip(data):
+    shared = SharedFrame(data)
+    try:
+        shm, frame = attach_frame(shared.descriptor)
+        pd.testing.assert_frame_equal(frame, data, check_freq=False, check_names=False)
+        shm.close()
+    finally:
+        shared.close()
+
+def test_sweep_is_ranked_and_matches_serial(data, grid):
+    parallel = ParameterSweep(data, grid, processes=2).run()
+    serial = ParameterSweep(data, grid, processes=1).run()
+
+    assert len(parallel) == 8
+    assert parallel["sharpe_ratio"].is_monotonic_decreasing
+    assert {"max_drawdown", "turnover", "trades"} <= set(parallel.columns)
+    pd.testing.assert_frame_equal(parallel, serial)
+
+def test_walk_forward(data, grid):
+    folds = ParameterSweep(data, grid, processes=2).walk_forward(train_size=1500, test_size=500)
+    assert len(folds) == 3
+    assert (folds["test_start"] > folds["train_start"]).all()
+
+def test_tasks_close_their_shared_memory(data, grid, monkeypatch):
+    from trading_engine_v2 import parameter_sweep
+    attached = []
+
+    def attach(descriptor):
+        shm, frame = attach_frame(descriptor)
+        attached.append(shm)
+        return shm, frame
+
+    monkeypatch.setattr(parameter_sweep, "attach_frame", attach)
+    ParameterSweep(data, grid, processes=1).run()
+    assert len(attached) == 8
+    assert all(shm.buf is None for shm in attached)
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import pytest
+from trading_engine_v2.portfolio_optimizer import PortfolioOptimizer
+from trading_engine_v2.risk_manager import RiskManager
+
+@pytest.fixture
+def returns():
+    rng = np.random.default_rng(7)
+    return pd.DataFrame({
+        "NSE:INFY": rng.normal(0.002, 0.01, 250),
+        "NSE:TCS": rng.normal(0.001, 0.02, 250),
+        "NSE:HDFC": rng.normal(-0.001, 0.015, 250),
+    })
+
+def test_weights_are_long_only_and_capped(returns):
+    optimizer = PortfolioOptimizer(returns, max_weight=0.6)
+    weights = optimizer.get_optimal_weights()
+    assert weights.sum() == pytest.approx(1.0)
+    assert np.all(weights >= 0) and np.all(weights <= 0.6 + 1e-9)
+    assert optimizer.get_weight("NSE:INFY") == max(weights)
+    assert optimizer.get_weight("NSE:UNKNOWN") == 0.0
+
+def test_target_volatility_scales_down(returns):
+    optimizer = PortfolioOptimizer(returns, target_volatility=0.005)
+    weights = optimizer.get_optimal_weights()
+    assert np.sqrt(weights @ optimizer.covariance() @ weights) == pytest.approx(0.005)
+    assert weights.sum() < 1.0
+
+def test_incremental_updates_match_batch_estimates(returns):
+    optimizer = PortfolioOptimizer(returns.iloc[:100], shrinkage=0.0)
+    for _, row in returns.iloc[100:].iterrows():
+        optimizer.update(row.to_dict())
+    np.testing.assert_allclose(optimizer.mean, returns.mean().to_numpy())
+    np.testing.assert_allclose(optimizer.covariance(), returns.cov().to_numpy())
+
+def test_weights_are_cached_until_update(returns):
+    optimizer = PortfolioOptimizer(returns)
+    weights = optimizer.get_optimal_weights()
+    assert optimizer.get_optimal_weights() is weights
+    optimizer.update(returns.iloc[0].to_dict())
+    assert optimizer.get_optimal_weights() is not weights
+
+def test_risk_manager_uses_symbol_weight(returns):
+    optimizer = PortfolioOptimizer(returns, max_weight=0.6)
+    risk_manager = RiskManager(capital=100000.0, portfolio_optimizer=optimizer)
+    size = risk_manager.size_position(entry_price=100, stop_loss_price=90, symbol="NSE:TCS")
+    assert size == pytest.approx(100 * optimizer.get_weight("NSE:TCS"))
@@ -1,4 +1,5 @@
 import pytest
+from trading_engine_v2.exposure_ledger import ExposureLedger
 from trading_engine_v2.risk_manager import RiskManager
 
 @pytest.fixture
@@ -19,3 +20,14 @@ def test_manage_signal(risk_manager):
     assert result["action"] == "place_order"
     assert "order_spec" in result
     assert result["order_spec"]["size"] == 100
+
+def test_manage_signals_keeps_symbol_and_sector_exposure_apart():
+    # A symbol named like a sector must not share the sector's pending exposure
+    ledger = ExposureLedger({"AUTO": "BANKS", "HDFC": "BANKS"})
+    risk_manager = RiskManager(capital=100000.0, max_exposure=1.0, max_symbol_exposure=0.15, ledger=ledger)
+    results = risk_manager.manage_signals([
+        {"symbol": "AUTO", "side": "BUY", "price": 100, "stop": 90},
+        {"symbol": "sector:BANKS", "side": "BUY", "price": 100, "stop": 90},
+        {"symbol": "HDFC", "side": "BUY", "price": 100, "stop": 90},
+    ])
+    assert [result["action"] for result in results] == ["place_order"] * 3
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+from trading_engine_v2.streaming_indicators import RollingWindow, StreamingIndicators, FEATURE_COLUMNS
+
+def pandas_features(df: pd.DataFrame) -> pd.DataFrame:
+    # Reference batch implementation the streaming engine must reproduce
+    out = pd.DataFrame(index=df.index)
+    out["sma_20"] = df["close"].rolling(window=20).mean()
+    out["ema_20"] = df["close"].ewm(span=20, adjust=False).mean()
+    delta = df["close"].diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+    out["rsi"] = 100 - (100 / (1 + gain / loss))
+    high_low = df["high"] - df["low"]
+    high_close = (df["high"] - df["close"].shift()).abs()
+    low_close = (df["low"] - df["close"].shift()).abs()
+    tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
+    out["atr"] = tr.rolling(window=14).mean()
+    out["vwap"] = (df["volume"] * (df["high"] + df["low"]) / 2).cumsum() / df["volume"].cumsum()
+    return out
+
+@pytest.fixture
+def price_series():
+    rng = np.random.default_rng(7)
+    n = 1000
+    close = 1500 * np.cumprod(1 + rng.normal(0, 0.002, n))
+    open_ = np.concatenate([[close[0]], close[:-1]])
+    high = np.maximum(open_, close) * (1 + rng.uniform(0, 0.002, n))
+    low = np.minimum(open_, close) * (1 - rng.uniform(0, 0.002, n))
+    volume = rng.integers(100, 10000, n).astype(float)
+    return pd.DataFrame({"open": open_, "high": high, "low": low, "close": close, "volume": volume})
+
+def test_rolling_window_mean():
+    window = RollingWindow(3)
+    window.push(1.0)
+    window.push(2.0)
+    assert np.isnan(window.mean())
+    window.push(3.0)
+    assert window.mean() == 2.0
+    window.push(10.0)
+    assert window.mean() == 5.0
+
+def test_parity_with_pandas(price_series):
+    indicators = StreamingIndicators()
+    rows = [
+        indicators.update(row.high, row.low, row.close, row.volume)
+        for row in price_series.itertuples()
+    ]
+    streamed = pd.DataFrame(rows, columns=FEATURE_COLUMNS)
+    expected = pandas_features(price_series)
+
+    for column in FEATURE_COLUMNS:
+        np.testing.assert_allclose(streamed[column].values, expected[column].values, rtol=1e-9, equal_nan=True)
+
+def test_rsi_all_gains_is_100():
+    indicators = StreamingIndicators()
+    for i in range(20):
+        features = indicators.update(101.0 + i, 99.0 + i, 100.0 + i, 1000)
+    assert features["rsi"] == 100.0
@@ -0,0 +1,69 @@
+import pandas as pd
+import pytest
+from trading_engine_v2.api.schemas import Candle
+from trading_engine_v2.feature_store import FeatureStore
+from trading_engine_v2.tick_aggregator import TickAggregator
+from trading_engine_v2.tick_bus import TickBus
+
+def ist(clock: str) -> int:
+    return int(pd.Timestamp(f"2024-01-15 {clock}", tz="Asia/Kolkata").timestamp())
+
+def make_tick(ts, last, volume=10, symbol="NSE:INFY"):
+    return {"symbol": symbol, "ts": ts, "bid": last, "ask": last, "last": last, "volume": volume}
+
+@pytest.fixture
+def aggregator():
+    return TickAggregator("1min")
+
+def test_builds_bars_on_rollover(aggregator):
+    prices = [100.0, 102.0, 99.0, 101.0]
+    for i, price in enumerate(prices):
+        assert aggregator.add_tick(make_tick(ist("09:15:00") + 10 * i, price)) is None
+
+    candle = aggregator.add_tick(make_tick(ist("09:16:05"), 105.0))
+    assert candle == {
+        "symbol": "NSE:INFY", "interval": "1min", "open": 100.0, "high": 102.0,
+        "low": 99.0, "close": 101.0, "volume": 40, "ts": ist("09:15:00"),
+    }
+    Candle(**candle)
+
+def test_ignores_ticks_outside_session(aggregator):
+    assert aggregator.add_tick(make_tick(ist("09:10:00"), 100.0)) is None
+    assert aggregator.add_tick(make_tick(ist("15:30:00"), 100.0)) is None
+    assert aggregator.state == {}
+    assert aggregator.ignored == 2
+
+def test_time_based_close_without_ticks(aggregator):
+    aggregator.add_tick(make_tick(ist("09:20:30"), 100.0))
+    assert aggregator.flush(ist("09:20:59")) == []
+    closed = aggregator.flush(ist("09:21:00"))
+    assert [candle["ts"] for candle in closed] == [ist("09:20:00")]
+    # A late tick for the emitted bar is dropped rather than re-opening it
+    assert aggregator.add_tick(make_tick(ist("09:20:45"), 101.0)) is None
+    assert aggregator.flush(ist("09:22:00")) == []
+    assert aggregator.add_tick(make_tick(ist("09:21:10"), 102.0)) is None
+    assert aggregator.flush(ist("09:22:00"))[0]["open"] == 102.0
+
+def test_bars_align_to_session_and_close_at_session_end():
+    aggregator = TickAggregator("30min")
+    aggregator.add_tick(make_tick(ist("09:50:00"), 100.0))
+    assert aggregator.state["NSE:INFY"][0] == ist("09:45:00")
+    aggregator.add_tick(make_tick(ist("15:20:00"), 100.0))
+    assert aggregator.state["NSE:INFY"][1] == ist("15:30:00")
+
+def test_cumulative_volume():
+    aggregator = TickAggregator("1min", cumulative_volume=True)
+    aggregator.add_tick(make_tick(ist("09:15:01"), 100.0, volume=1000))
+    aggregator.add_tick(make_tick(ist("09:15:30"), 100.0, volume=1200))
+    aggregator.add_tick(make_tick(ist("09:16:00"), 100.0, volume=1500))
+    candle = aggregator.flush(ist("09:17:00"))[0]
+    assert candle["volume"] == 300
+
+def test_attach_feeds_feature_store(aggregator):
+    bus = TickBus()
+    store = FeatureStore(symbols=["NSE:INFY"])
+    aggregator.attach(bus, store.add_candle)
+    for minute in range(3):
+        bus.publish(make_tick(ist("09:15:00") + 60 * minute, 100.0 + minute))
+    features = store.get_features("NSE:INFY", "1min")
+    assert list(features["close"]) == [100.0, 101.0]
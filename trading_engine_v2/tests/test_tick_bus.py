@@ -0,0 +1,57 @@
+import asyncio
+import pytest
+from trading_engine_v2.tick_bus import TickBus, CONFLATE, DROP_NEWEST, DROP_OLDEST
+
+def make_tick(symbol, ts, last=100.0):
+    return {"symbol": symbol, "ts": ts, "bid": last - 0.05, "ask": last + 0.05, "last": last, "volume": 10}
+
+@pytest.fixture
+def bus():
+    return TickBus()
+
+def test_listeners_and_subscriptions_receive_every_tick(bus):
+    seen = []
+    bus.add_listener(seen.append)
+    subscription = bus.subscribe("features")
+    for ts in range(3):
+        bus.publish(make_tick("NSE:INFY", ts))
+    assert [tick["ts"] for tick in seen] == [0, 1, 2]
+    assert [subscription.get_nowait()["ts"] for _ in range(3)] == [0, 1, 2]
+
+def test_overflow_policies(bus):
+    oldest = bus.subscribe("oldest", maxsize=2, policy=DROP_OLDEST)
+    newest = bus.subscribe("newest", maxsize=2, policy=DROP_NEWEST)
+    for ts in range(4):
+        bus.publish(make_tick("NSE:INFY", ts))
+    assert [oldest.get_nowait()["ts"] for _ in range(2)] == [2, 3]
+    assert [newest.get_nowait()["ts"] for _ in range(2)] == [0, 1]
+    assert oldest.dropped == newest.dropped == 2
+
+def test_conflate_keeps_latest_per_symbol(bus):
+    subscription = bus.subscribe("dashboard", policy=CONFLATE)
+    bus.publish(make_tick("NSE:INFY", 0, 100.0))
+    bus.publish(make_tick("NSE:TCS", 0, 200.0))
+    bus.publish(make_tick("NSE:INFY", 1, 101.0))
+    assert len(subscription) == 2
+    assert subscription.get_nowait()["last"] == 101.0
+    assert subscription.get_nowait()["symbol"] == "NSE:TCS"
+    assert subscription.get_nowait() is None
+    assert subscription.dropped == 1
+
+def test_consume_until_closed(bus):
+    async def run():
+        subscription = bus.subscribe("marks")
+        received = []
+
+        async def handler(tick):
+            received.append(tick["ts"])
+
+        consumer = asyncio.create_task(subscription.consume(handler))
+        for ts in range(5):
+            bus.publish(make_tick("NSE:INFY", ts))
+            await asyncio.sleep(0)
+        bus.close()
+        await asyncio.wait_for(consumer, timeout=1)
+        return received
+
+    assert asyncio.run(run()) == [0, 1, 2, 3, 4]
@@ -0,0 +1,98 @@
+import asyncio
+import json
+import threading
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from trading_engine_v2.tick_bus import TickBus
+from trading_engine_v2.tick_feed import ReplayServer, TickFeed, decode_message
+
+@pytest.fixture
+def recorded_ticks():
+    return [
+        {"symbol": symbol, "ts": 1700000000 + i, "bid": 99.95 + i, "ask": 100.05 + i, "last": 100.0 + i, "volume": 10 * i}
+        for i in range(250) for symbol in ("NSE:INFY", "NSE:TCS")
+    ]
+
+def test_fast_decode_matches_validated_decode(recorded_ticks):
+    message = json.dumps(recorded_ticks[:10])
+    assert decode_message(message) == decode_message(message, validate=True)
+
+def test_feed_streams_replayed_ticks_onto_bus(recorded_ticks):
+    async def run():
+        server = ReplayServer(recorded_ticks, batch_size=32)
+        url = await server.start()
+        bus = TickBus()
+        seen = []
+        bus.add_listener(seen.append)
+        feed = TickFeed(url, ["NSE:INFY"], bus, reconnect=False)
+        try:
+            await asyncio.wait_for(feed.run(), timeout=5)
+        finally:
+            await server.close()
+        return feed, seen
+
+    feed, seen = asyncio.run(run())
+    expected = [tick for tick in recorded_ticks if tick["symbol"] == "NSE:INFY"]
+    assert feed.received == len(expected)
+    assert seen == expected
+
+def test_replay_rate_is_respected(recorded_ticks):
+    async def run():
+        server = ReplayServer(recorded_ticks[:100], rate=1000, batch_size=10)
+        url = await server.start()
+        feed = TickFeed(url, [], TickBus(), reconnect=False)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        try:
+            await asyncio.wait_for(feed.run(), timeout=5)
+        finally:
+            await server.close()
+        return feed.received, loop.time() - start
+
+    received, elapsed = asyncio.run(run())
+    assert received == 100
+    assert elapsed >= 0.09
+
+class ExpiredUrlHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(403)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+def test_feed_reauthorizes_after_rejected_handshake(recorded_ticks):
+    expired = ThreadingHTTPServer(("127.0.0.1", 0), ExpiredUrlHandler)
+    threading.Thread(target=expired.serve_forever, daemon=True).start()
+
+    async def run():
+        server = ReplayServer(recorded_ticks[:20])
+        urls = [f"ws://127.0.0.1:{expired.server_address[1]}", await server.start()]
+        authorized = []
+
+        def authorize():
+            authorized.append(urls[min(len(authorized), 1)])
+            return authorized[-1]
+
+        bus = TickBus()
+        feed = TickFeed(None, [], bus, reconnect_delay=0.01, authorize=authorize)
+
+        def stop_when_replayed(tick):
+            if feed.received >= 20:
+                asyncio.ensure_future(feed.stop())
+
+        bus.add_listener(stop_when_replayed)
+        try:
+            await asyncio.wait_for(feed.run(), timeout=5)
+        finally:
+            await server.close()
+        return feed.received, authorized
+
+    try:
+        received, authorized = asyncio.run(run())
+    finally:
+        expired.shutdown()
+        expired.server_close()
+    assert received == 20
+    assert len(authorized) >= 2
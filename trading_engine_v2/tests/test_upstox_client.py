@@ -1,6 +1,15 @@
+import asyncio
+import json
+import threading
+import time
 import pytest
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
 from unittest.mock import patch, Mock
-from trading_engine_v2.upstox_client import UpstoxClient
+from urllib.parse import parse_qs, urlparse
+from trading_engine_v2.upstox_client import UpstoxClient, AsyncUpstoxClient, TokenBucket
 
 @pytest.fixture
 def client():
@@ -35,3 +44,125 @@ def test_place_order(client):
 def test_get_order_status(client):
     result = client.get_order_status("mock_order_123")
     assert result["status"] == "completed"
+
+class MockUpstoxHandler(BaseHTTPRequestHandler):
+    """
+    Serves canned JSON responses. Paths listed in `failures` answer with the
+    queued status codes first.
+    """
+    failures: Dict[str, List[int]] = {}
+    requests: List[str] = []
+
+    def do_GET(self):
+        self._respond()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._respond()
+
+    def _respond(self):
+        path = urlparse(self.path).path
+        MockUpstoxHandler.requests.append(self.path)
+        queued = MockUpstoxHandler.failures.get(path)
+        status = queued.pop(0) if queued else 200
+        body = json.dumps({"status": "success", "path": path, "query": parse_qs(urlparse(self.path).query)}).encode()
+        self.send_response(status)
+        if status == 429:
+            self.send_header("Retry-After", "0")
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def mock_server():
+    MockUpstoxHandler.failures = {}
+    MockUpstoxHandler.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockUpstoxHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+def test_async_request_retries_rate_limit(mock_server):
+    MockUpstoxHandler.failures = {"/market-quote": [429, 503]}
+
+    async def run():
+        async with AsyncUpstoxClient(base_url=mock_server, access_token="token", backoff=0.01) as client:
+            return await client.get_live_feed("NSE_EQ|INE848E01016")
+
+    result = asyncio.run(run())
+    assert result["path"] == "/market-quote"
+    assert len(MockUpstoxHandler.requests) == 3
+
+def test_async_request_gives_up_after_max_retries(mock_server):
+    MockUpstoxHandler.failures = {"/instrument/master": [500] * 10}
+
+    async def run():
+        async with AsyncUpstoxClient(base_url=mock_server, access_token="token", max_retries=2, backoff=0.01) as client:
+            return await client.get_instrument_master()
+
+    assert asyncio.run(run()) is None
+    assert len(MockUpstoxHandler.requests) == 3
+
+def test_async_order_is_not_resent_after_server_error(mock_server):
+    MockUpstoxHandler.failures = {"/order/place": [503, 200]}
+
+    async def run():
+        async with AsyncUpstoxClient(base_url=mock_server, access_token="token", backoff=0.01) as client:
+            return await client.place_order({"symbol": "NSE_EQ|INE009A01021", "side": "BUY", "quantity": 1})
+
+    assert asyncio.run(run()) is None
+    assert len(MockUpstoxHandler.requests) == 1
+
+def test_async_order_retries_rate_limit(mock_server):
+    MockUpstoxHandler.failures = {"/order/place": [429]}
+
+    async def run():
+        async with AsyncUpstoxClient(base_url=mock_server, access_token="token", backoff=0.01) as client:
+            return await client.place_order({"symbol": "NSE_EQ|INE009A01021", "side": "BUY", "quantity": 1})
+
+    assert asyncio.run(run())["path"] == "/order/place"
+    assert len(MockUpstoxHandler.requests) == 2
+
+def test_retry_delay_parses_http_date():
+    async def run():
+        async with AsyncUpstoxClient(base_url="http://127.0.0.1:1", access_token="token", backoff=0.01) as client:
+            future = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=5), usegmt=True)
+            return (client._retry_delay(0, future), client._retry_delay(0, "Wed, 21 Oct 2015 07:28:00 GMT"),
+                    client._retry_delay(0, "soon"))
+
+    in_future, in_past, garbage = asyncio.run(run())
+    assert 3.5 <= in_future <= 5.1
+    assert 0 <= in_past <= 0.01
+    assert 0 <= garbage <= 0.01
+
+def test_async_fan_out_is_rate_limited(mock_server):
+    symbols = [f"NSE_EQ|{i}" for i in range(10)]
+
+    async def run():
+        limits = {"historical": (50, 5), "default": (50, 5)}
+        async with AsyncUpstoxClient(base_url=mock_server, access_token="token", rate_limits=limits) as client:
+            start = time.monotonic()
+            results = await client.fetch_historical_many(symbols, "2023-01-01", "2023-01-02", "1minute")
+            return results, time.monotonic() - start
+
+    results, elapsed = asyncio.run(run())
+    assert list(results) == symbols
+    assert all(results[symbol]["query"]["instrument_key"] == [symbol] for symbol in symbols)
+    # A burst of 5 then 5 more at 50/s takes at least ~0.1s
+    assert elapsed >= 0.09
+
+def test_token_bucket_refills():
+    async def run():
+        bucket = TokenBucket(rate=100, capacity=2)
+        start = time.monotonic()
+        for _ in range(4):
+            await bucket.acquire()
+        return time.monotonic() - start
+
+    assert asyncio.run(run()) >= 0.019
@@ -0,0 +1,145 @@
+import asyncio
+import inspect
+import logging
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+CONFLATE = "conflate"
+
+class Subscription:
+    """
+    A bounded tick queue owned by one consumer. When the queue is full, `drop_oldest`
+    discards the oldest tick and `drop_newest` the incoming one; `conflate` keeps only
+    the latest tick per symbol, so a slow consumer always sees current prices.
+    """
+
+    def __init__(self, name: str, maxsize: int = 10000, policy: str = DROP_OLDEST):
+        if policy not in (DROP_OLDEST, DROP_NEWEST, CONFLATE):
+            raise ValueError(f"Unknown overflow policy: {policy}")
+        self.name = name
+        self.maxsize = maxsize
+        self.policy = policy
+        self.dropped = 0
+        self._queue: deque = deque()
+        self._latest: Dict[str, Dict[str, Any]] = {}
+        self._ready = asyncio.Event()
+        self._closed = False
+
+    def __len__(self) -> int:
+        return len(self._latest) if self.policy == CONFLATE else len(self._queue)
+
+    def put(self, tick: Dict[str, Any]):
+        if self.policy == CONFLATE:
+            symbol = tick["symbol"]
+            if symbol in self._latest:
+                self.dropped += 1
+            elif len(self._latest) >= self.maxsize:
+                self.dropped += 1
+                return
+            self._latest[symbol] = tick
+        elif len(self._queue) >= self.maxsize:
+            self.dropped += 1
+            if self.policy == DROP_NEWEST:
+                return
+            self._queue.popleft()
+            self._queue.append(tick)
+        else:
+            self._queue.append(tick)
+        self._ready.set()
+
+    def get_nowait(self) -> Optional[Dict[str, Any]]:
+        if self.policy == CONFLATE:
+            if not self._latest:
+                return None
+            return self._latest.pop(next(iter(self._latest)))
+        return self._queue.popleft() if self._queue else None
+
+    async def get(self) -> Optional[Dict[str, Any]]:
+        """
+        Waits for the next tick. Returns None once the subscription is closed and drained.
+        """
+        while True:
+            tick = self.get_nowait()
+            if tick is not None:
+                return tick
+            if self._closed:
+                return None
+            self._ready.clear()
+            await self._ready.wait()
+
+    def close(self):
+        self._closed = True
+        self._ready.set()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Dict[str, Any]:
+        tick = await self.get()
+        if tick is None:
+            raise StopAsyncIteration
+        return tick
+
+    async def consume(self, handler: Callable[[Dict[str, Any]], Any]):
+        """
+        Feeds every tick to `handler` (a function or coroutine function) until closed.
+        """
+        is_async = inspect.iscoroutinefunction(handler)
+        async for tick in self:
+            try:
+                if is_async:
+                    await handler(tick)
+                else:
+                    handler(tick)
+            except Exception as e:
+                logging.error(f"Tick consumer {self.name} failed: {e}")
+
+class TickBus:
+    """
+    An in-process publish/subscribe bus for ticks. Listeners are cheap synchronous
+    callbacks run inline on publish; subscriptions give slower or async consumers
+    their own bounded queue so they never hold up the feed or each other.
+    """
+
+    def __init__(self):
+        self.listeners: List[Callable[[Dict[str, Any]], Any]] = []
+        self.subscriptions: Dict[str, Subscription] = {}
+        self.published = 0
+
+    def add_listener(self, callback: Callable[[Dict[str, Any]], Any]):
+        self.listeners.append(callback)
+
+    def subscribe(self, name: str, maxsize: int = 10000, policy: str = DROP_OLDEST) -> Subscription:
+        subscription = Subscription(name, maxsize, policy)
+        self.subscriptions[name] = subscription
+        return subscription
+
+    def unsubscribe(self, name: str):
+        subscription = self.subscriptions.pop(name, None)
+        if subscription is not None:
+            subscription.close()
+
+    def publish(self, tick: Dict[str, Any]):
+        self.published += 1
+        for callback in self.listeners:
+            try:
+                callback(tick)
+            except Exception as e:
+                logging.error(f"Tick listener failed: {e}")
+        for subscription in self.subscriptions.values():
+            subscription.put(tick)
+
+    def close(self):
+        for subscription in self.subscriptions.values():
+            subscription.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "published": self.published,
+            "subscriptions": {
+                name: {"pending": len(sub), "dropped": sub.dropped, "policy": sub.policy}
+                for name, sub in self.subscriptions.items()
+            }
+        }
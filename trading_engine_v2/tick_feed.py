@@ -0,0 +1,183 @@
+import asyncio
+import json
+import random
+import time
+import logging
+import websockets
+from typing import Any, Callable, Dict, List, Optional, Union
+from trading_engine_v2.api.schemas import Tick
+from trading_engine_v2.tick_bus import TickBus
+
+def decode_tick(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Converts a raw tick into the `api.schemas.Tick` shape as a plain dict.
+    This is the hot path, so it only coerces the field types and skips pydantic.
+    """
+    return {
+        "symbol": str(data["symbol"]),
+        "ts": int(data["ts"]),
+        "bid": float(data["bid"]),
+        "ask": float(data["ask"]),
+        "last": float(data["last"]),
+        "volume": int(data["volume"]),
+    }
+
+def decode_message(message: Union[str, bytes], validate: bool = False) -> List[Dict[str, Any]]:
+    """
+    Decodes a feed message holding one tick or a list of ticks. With `validate`,
+    every tick goes through the `Tick` model instead of the fast path.
+    """
+    payload = json.loads(message)
+    items = payload if isinstance(payload, list) else [payload]
+    if validate:
+        return [Tick(**item).model_dump() for item in items]
+    return [decode_tick(item) for item in items]
+
+def decode_upstox_message(message: bytes) -> List[Dict[str, Any]]:
+    """
+    Decodes a binary `FeedResponse` frame of the Upstox market data feed into ticks,
+    keyed by instrument key. Full-mode market feeds carry the day's cumulative traded
+    volume, so aggregate them with `TickAggregator(cumulative_volume=True)`; index
+    and LTP-only feeds have no volume and report 0. Needs the upstox-python-sdk.
+    """
+    from upstox_client.feeder.proto import MarketDataFeed_pb2
+
+    response = MarketDataFeed_pb2.FeedResponse()
+    response.ParseFromString(message)
+    ticks = []
+    for key, feed in response.feeds.items():
+        kind = feed.WhichOneof("FeedUnion")
+        if kind == "ltpc":
+            ltpc, quotes, volume = feed.ltpc, [], 0
+        elif kind == "ff":
+            full = feed.ff.WhichOneof("FullFeedUnion")
+            if full == "marketFF":
+                market = feed.ff.marketFF
+                ltpc, quotes, volume = market.ltpc, market.marketLevel.bidAskQuote, market.vtt
+            elif full == "indexFF":
+                ltpc, quotes, volume = feed.ff.indexFF.ltpc, [], 0
+            else:
+                continue
+        else:
+            continue
+        best = quotes[0] if quotes else None
+        ticks.append({
+            "symbol": key,
+            "ts": int(ltpc.ltt // 1000),
+            "bid": float(best.bp) if best is not None else float(ltpc.ltp),
+            "ask": float(best.ap) if best is not None else float(ltpc.ltp),
+            "last": float(ltpc.ltp),
+            "volume": int(volume),
+        })
+    return ticks
+
+class TickFeed:
+    """
+    Consumes a WebSocket market data feed and publishes the decoded ticks on a `TickBus`.
+    Reconnects with jittered exponential backoff until `stop()` is called, unless
+    `reconnect` is False. Upstox's binary feed is read with `decode_upstox_message`.
+
+    Feeds whose URLs expire, like Upstox's authorized redirect URI, pass `authorize`:
+    it is called before every connection attempt to get a fresh URL, so a rejected
+    handshake is retried against a new one.
+    """
+
+    def __init__(self, url: Optional[str], symbols: List[str], bus: TickBus, decoder: Callable[[Union[str, bytes]], List[Dict[str, Any]]] = decode_message,
+                 reconnect: bool = True, reconnect_delay: float = 1.0, max_reconnect_delay: float = 30.0,
+                 authorize: Optional[Callable[[], Optional[str]]] = None, binary_subscribe: bool = False):
+        self.url = url
+        self.symbols = symbols
+        self.bus = bus
+        self.decoder = decoder
+        self.authorize = authorize
+        self.binary_subscribe = binary_subscribe
+        self.reconnect = reconnect
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.received = 0
+        self._stopped = False
+        self._websocket = None
+
+    def subscribe_message(self) -> Union[str, bytes]:
+        message = json.dumps({"method": "sub", "data": {"mode": "full", "instrumentKeys": self.symbols}})
+        return message.encode() if self.binary_subscribe else message
+
+    async def run(self):
+        delay = self.reconnect_delay
+        while not self._stopped:
+            try:
+                if self.authorize is not None:
+                    self.url = await asyncio.to_thread(self.authorize)
+                if not self.url:
+                    raise OSError("no feed URL")
+                async with websockets.connect(self.url) as websocket:
+                    self._websocket = websocket
+                    delay = self.reconnect_delay
+                    await websocket.send(self.subscribe_message())
+                    async for message in websocket:
+                        try:
+                            ticks = self.decoder(message)
+                        except (ValueError, KeyError, TypeError) as e:
+                            logging.warning(f"Dropping undecodable feed message: {e}")
+                            continue
+                        self.received += len(ticks)
+                        for tick in ticks:
+                            self.bus.publish(tick)
+            except (OSError, websockets.ConnectionClosed, websockets.InvalidHandshake) as e:
+                logging.warning(f"Tick feed connection lost: {e}")
+            finally:
+                self._websocket = None
+
+            if self._stopped or not self.reconnect:
+                break
+            wait = random.uniform(0, delay)
+            logging.info(f"Reconnecting to tick feed in {wait:.2f} seconds.")
+            await asyncio.sleep(wait)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    async def stop(self):
+        self._stopped = True
+        if self._websocket is not None:
+            await self._websocket.close()
+
+class ReplayServer:
+    """
+    A local WebSocket server that streams recorded ticks in the feed's message format,
+    for tests and offline runs. Each client receives the ticks for the symbols it
+    subscribes to, `batch_size` per message, at up to `rate` ticks per second
+    (None streams as fast as possible), and is then disconnected.
+    """
+
+    def __init__(self, ticks: List[Dict[str, Any]], rate: Optional[float] = None, batch_size: int = 100):
+        self.ticks = ticks
+        self.rate = rate
+        self.batch_size = batch_size
+        self.server = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        self.server = await websockets.serve(self._handler, host, port)
+        return self.url
+
+    @property
+    def url(self) -> str:
+        host, port = list(self.server.sockets)[0].getsockname()[:2]
+        return f"ws://{host}:{port}"
+
+    async def _handler(self, websocket, path: str = None):
+        request = json.loads(await websocket.recv())
+        symbols = set(request.get("data", {}).get("instrumentKeys") or [])
+        ticks = [tick for tick in self.ticks if not symbols or tick["symbol"] in symbols]
+
+        start = time.perf_counter()
+        for i in range(0, len(ticks), self.batch_size):
+            if self.rate:
+                ahead = i / self.rate - (time.perf_counter() - start)
+                if ahead > 0:
+                    await asyncio.sleep(ahead)
+            await websocket.send(json.dumps(ticks[i:i + self.batch_size]))
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
@@ -1,7 +1,10 @@
+import argparse
+import numpy as np
 import pandas as pd
 import lightgbm as lgb
 from sklearn.model_selection import train_test_split
 from trading_engine_v2.model_interface import ModelInterface
+from trading_engine_v2.history_store import HistoryStore
 
 class LightGBMModel(ModelInterface):
     """
@@ -49,17 +52,32 @@ class LightGBMModel(ModelInterface):
             raise ValueError("Model has not been trained yet.")
         return self.model.predict(data, num_iteration=self.model.best_iteration)
 
-def main():
+def build_dataset(candles: pd.DataFrame) -> pd.DataFrame:
+    """
+    Builds features and a next-bar direction target from OHLCV candles.
+    """
+    data = pd.DataFrame(index=candles.index)
+    data["return_1"] = candles["close"].pct_change()
+    data["return_5"] = candles["close"].pct_change(5)
+    data["range"] = (candles["high"] - candles["low"]) / candles["close"]
+    data["volume_change"] = candles["volume"].pct_change()
+    data["target"] = (candles["close"].shift(-1) > candles["close"]).astype(int)
+    return data.iloc[:-1].replace([np.inf, -np.inf], np.nan).dropna()
+
+def main(instrument: str = None, interval: str = "1minute", store_path: str = "data/history"):
     """
     The main function for the training script.
+    Trains on the local history store when an instrument is given.
     """
-    # This is a placeholder for data loading
-    # In a real application, you would load your data from a database or file
-    data = pd.DataFrame({
-        "feature1": [1, 2, 3, 4, 5],
-        "feature2": [5, 4, 3, 2, 1],
-        "target": [0, 1, 0, 1, 0]
-    })
+    if instrument:
+        data = build_dataset(HistoryStore(store_path).load(instrument, interval))
+    else:
+        # This is a placeholder for data loading
+        data = pd.DataFrame({
+            "feature1": [1, 2, 3, 4, 5],
+            "feature2": [5, 4, 3, 2, 1],
+            "target": [0, 1, 0, 1, 0]
+        })
 
     model = LightGBMModel()
     model.train(data)
@@ -68,4 +86,9 @@ def main():
     model.model.save_model("trading_engine_v2/lgbm_model.txt")
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Train the LightGBM signal model.")
+    parser.add_argument("--instrument", help="Instrument key to load from the history store")
+    parser.add_argument("--interval", default="1minute")
+    parser.add_argument("--store", default="data/history", help="History store root directory")
+    args = parser.parse_args()
+    main(args.instrument, args.interval, args.store)
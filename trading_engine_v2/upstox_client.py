@@ -1,9 +1,16 @@
 import os
 import time
+import random
+import asyncio
 import logging
+import httpx
 import requests
-from typing import Callable, List, Dict, Any
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Callable, List, Dict, Any, Optional, Tuple, Union
 from dotenv import load_dotenv
+from trading_engine_v2.tick_bus import TickBus
+from trading_engine_v2.tick_feed import TickFeed, decode_upstox_message
 
 load_dotenv()
 
@@ -16,7 +23,8 @@ class UpstoxClient:
     fetching data and placing orders.
     """
 
-    def __init__(self):
+    def __init__(self, max_retries: int = 3):
+        self.max_retries = max_retries
         self.api_key = os.getenv("UPSTOX_API_KEY")
         self.api_secret = os.getenv("UPSTOX_API_SECRET")
         self.access_token = os.getenv("UPSTOX_ACCESS_TOKEN")
@@ -32,13 +40,13 @@ class UpstoxClient:
         A helper method to handle API requests with rate limiting and error handling.
         """
         url = f"{self.base_url}{endpoint}"
-        while True:
+        for attempt in range(self.max_retries + 1):
             try:
                 response = self.session.request(method, url, params=params, json=data)
                 response.raise_for_status()
                 return response.json()
             except requests.exceptions.HTTPError as e:
-                if e.response.status_code == 429:
+                if e.response.status_code == 429 and attempt < self.max_retries:
                     retry_after = int(e.response.headers.get("Retry-After", 1))
                     logging.warning(f"Rate limit exceeded. Retrying in {retry_after} seconds.")
                     time.sleep(retry_after)
@@ -69,14 +77,31 @@ class UpstoxClient:
         }
         return self._request("GET", "/historical-candle", params=params)
 
-    def subscribe_ticks(self, symbols: List[str], on_tick_cb: Callable):
+    def authorize_feed(self) -> Optional[str]:
         """
-        Subscribes to live ticks using a WebSocket connection.
-        (This is a placeholder for the WebSocket implementation)
+        Returns a freshly authorized WebSocket URL for the market data feed, or None.
+        """
+        response = self._request("GET", "/feed/market-data-feed/authorize")
+        url = (response or {}).get("data", {}).get("authorized_redirect_uri")
+        if not url:
+            logging.error("Could not authorize the market data feed.")
+        return url
+
+    def subscribe_ticks(self, symbols: List[str], on_tick_cb: Callable, bus: TickBus = None, url: str = None,
+                        decoder: Callable[[Union[str, bytes]], List[Dict[str, Any]]] = decode_upstox_message) -> TickFeed:
+        """
+        Creates a WebSocket tick feed for the given symbols. `on_tick_cb` is registered as
+        a listener on the feed's bus (a new one unless `bus` is given) and called for every
+        tick. Without a `url` the feed connects to Upstox, re-authorizing on every
+        reconnect, and decodes its binary frames with `decoder`. Start streaming with
+        `await feed.run()`.
         """
         logging.info(f"Subscribing to ticks for {symbols}.")
-        # WebSocket implementation would go here
-        pass
+        bus = bus or TickBus()
+        bus.add_listener(on_tick_cb)
+        if url is None:
+            return TickFeed(None, symbols, bus, decoder=decoder, authorize=self.authorize_feed, binary_subscribe=True)
+        return TickFeed(url, symbols, bus, decoder=decoder)
 
     def poll_ticks(self, symbols: List[str], on_tick_cb: Callable):
         """
@@ -113,3 +138,188 @@ class UpstoxClient:
             "type": "full"
         }
         return self._request("GET", "/market-quote", params=params)
+
+class TokenBucket:
+    """
+    A client-side rate limiter. Holds up to `capacity` tokens, refilled at `rate`
+    tokens per second; `acquire` waits without blocking the event loop until one is free.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+# Requests per second (rate, burst) for each class of endpoint
+RATE_LIMITS: Dict[str, Tuple[float, float]] = {
+    "order": (10, 10),
+    "market": (25, 25),
+    "historical": (25, 25),
+    "default": (25, 25),
+}
+
+ENDPOINT_CLASSES: List[Tuple[str, str]] = [
+    ("/order", "order"),
+    ("/market-quote", "market"),
+    ("/historical-candle", "historical"),
+]
+
+# Methods that are safe to resend after the server may have received them
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+# Errors raised before the request was sent, so retrying cannot duplicate it
+CONNECT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+class AsyncUpstoxClient:
+    """
+    An asyncio client for the Upstox API.
+    Keeps a pool of keep-alive connections, throttles each endpoint class with its
+    own token bucket and retries rate-limited, server and transport errors a bounded
+    number of times with jittered exponential backoff. Requests that are not idempotent,
+    such as order placement, are only retried on 429 or when the connection could not be
+    made, so an order is never sent twice. Use it as an async context manager, or call
+    `close()` when done.
+    """
+
+    def __init__(self, base_url: str = "https://api.upstox.com/v2", access_token: Optional[str] = None,
+                 max_connections: int = 20, max_retries: int = 3, backoff: float = 0.5, timeout: float = 10.0,
+                 rate_limits: Optional[Dict[str, Tuple[float, float]]] = None):
+        self.base_url = base_url
+        self.access_token = access_token or os.getenv("UPSTOX_ACCESS_TOKEN")
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.buckets = {name: TokenBucket(rate, burst) for name, (rate, burst) in (rate_limits or RATE_LIMITS).items()}
+        self.client = httpx.AsyncClient(
+            base_url=base_url,
+            headers={"Authorization": f"Bearer {self.access_token}", "Accept": "application/json"},
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            timeout=timeout
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        await self.client.aclose()
+
+    def _bucket(self, endpoint: str) -> TokenBucket:
+        for prefix, name in ENDPOINT_CLASSES:
+            if endpoint.startswith(prefix) and name in self.buckets:
+                return self.buckets[name]
+        return self.buckets["default"]
+
+    def _retry_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """
+        Returns the delay before the next attempt: the server's `Retry-After`, given in
+        seconds or as an HTTP date, if it has one, otherwise full-jitter backoff.
+        """
+        if retry_after is not None:
+            try:
+                seconds = float(retry_after)
+            except ValueError:
+                try:
+                    seconds = (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds()
+                except (TypeError, ValueError):
+                    seconds = None
+            if seconds is not None:
+                return max(seconds, 0.0) + random.uniform(0, self.backoff)
+        return random.uniform(0, self.backoff * 2 ** attempt)
+
+    async def _request(self, method: str, endpoint: str, params: Dict[str, Any] = None, data: Dict[str, Any] = None):
+        """
+        Sends a request through the endpoint's rate limiter, retrying 429s, 5xx responses
+        and transport errors up to `max_retries` times. Non-idempotent requests are only
+        retried on 429s and connection errors. Returns the decoded JSON or None.
+        """
+        bucket = self._bucket(endpoint)
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        for attempt in range(self.max_retries + 1):
+            await bucket.acquire()
+            try:
+                response = await self.client.request(method, endpoint, params=params, json=data)
+            except httpx.TransportError as e:
+                if attempt == self.max_retries or not (idempotent or isinstance(e, CONNECT_ERRORS)):
+                    logging.error(f"Request error: {e}")
+                    return None
+                delay = self._retry_delay(attempt)
+                logging.warning(f"Request error: {e}. Retrying in {delay:.2f} seconds.")
+                await asyncio.sleep(delay)
+                continue
+
+            if response.status_code == 429 or (idempotent and response.status_code >= 500):
+                if attempt == self.max_retries:
+                    logging.error(f"HTTP error {response.status_code} for {endpoint} after {attempt + 1} attempts.")
+                    return None
+                delay = self._retry_delay(attempt, response.headers.get("Retry-After"))
+                logging.warning(f"HTTP {response.status_code} for {endpoint}. Retrying in {delay:.2f} seconds.")
+                await asyncio.sleep(delay)
+                continue
+
+            if response.is_error:
+                logging.error(f"HTTP error {response.status_code} for {endpoint}: {response.text}")
+                return None
+            return response.json()
+
+    async def get_instrument_master(self) -> List[Dict[str, Any]]:
+        """
+        Fetches the instrument master from Upstox.
+        """
+        return await self._request("GET", "/instrument/master")
+
+    async def fetch_historical(self, symbol: str, start_ts: str, end_ts: str, timeframe: str) -> Dict[str, Any]:
+        """
+        Fetches historical OHLC/candle data for a given symbol.
+        """
+        params = {
+            "instrument_key": symbol,
+            "interval": timeframe,
+            "from_date": start_ts,
+            "to_date": end_ts
+        }
+        return await self._request("GET", "/historical-candle", params=params)
+
+    async def fetch_historical_many(self, symbols: List[str], start_ts: str, end_ts: str, timeframe: str) -> Dict[str, Any]:
+        """
+        Fetches historical data for many symbols concurrently, within the rate limit.
+        """
+        results = await asyncio.gather(*(self.fetch_historical(symbol, start_ts, end_ts, timeframe) for symbol in symbols))
+        return dict(zip(symbols, results))
+
+    async def place_order(self, order_spec: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Places an order with the given specifications.
+        """
+        logging.info(f"Placing order: {order_spec}")
+        return await self._request("POST", "/order/place", data=order_spec)
+
+    async def get_order_status(self, order_id: str) -> Dict[str, Any]:
+        """
+        Gets the status of an order.
+        """
+        return await self._request("GET", "/order/details", params={"order_id": order_id})
+
+    async def get_live_feed(self, instrument_key: str) -> Dict[str, Any]:
+        """
+        Fetches the live feed for a given instrument.
+        """
+        params = {
+            "instrument_key": instrument_key,
+            "type": "full"
+        }
+        return await self._request("GET", "/market-quote", params=params)
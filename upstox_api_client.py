@@ -8,6 +8,9 @@ from datetime import datetime
 load_dotenv()
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Maximum number of instrument keys the market quote API accepts per request
+QUOTE_BATCH_SIZE = 500
+
 class UpstoxClient:
     def __init__(self):
         self.api_key = os.getenv("UPSTOX_API_KEY")
@@ -59,6 +62,30 @@ class UpstoxClient:
             logging.error(f"Upstox API exception while fetching historical data: {e}")
             return {"status": "error", "message": str(e)}
 
+    def get_market_quotes(self, instrument_keys):
+        logging.info(f"Fetching market quotes for {len(instrument_keys)} instruments.")
+        if not self.api_client:
+            return {"status": "error", "message": "API client not configured."}
+        quotes = {}
+        try:
+            quote_api = upstox_client.MarketQuoteApi(self.api_client)
+            for start in range(0, len(instrument_keys), QUOTE_BATCH_SIZE):
+                chunk = instrument_keys[start:start + QUOTE_BATCH_SIZE]
+                response = quote_api.get_full_market_quote(",".join(chunk), api_version="v2")
+                # The response is keyed by trading symbol; re-key it by instrument key
+                for quote in (response.to_dict().get("data") or {}).values():
+                    quotes[quote["instrument_token"]] = quote
+            return {"status": "success", "data": quotes}
+        except ApiException as e:
+            logging.error(f"Upstox API exception while fetching market quotes: {e}")
+            return {"status": "error", "message": str(e)}
+
+    def get_live_feed(self, instrument_key):
+        response = self.get_market_quotes([instrument_key])
+        if response["status"] != "success" or instrument_key not in response["data"]:
+            return None
+        return {"status": "success", "data": response["data"][instrument_key]}
+
     def place_order(self, order_details):
         logging.info(f"Placing order: {order_details}")
         if not self.api_client: